@@ -7,7 +7,7 @@ from fastapi import APIRouter, Query
 import sys
 sys.path.append('/opt/syntx-workflow-api-get-prompts/api-core')
 
-from utils.log_loader import load_field_flow
+from utils.metrics_snapshot import get_metrics_snapshot, to_py
 from utils.algorithms import (
     calculate_moving_average,
     detect_outliers,
@@ -15,25 +15,15 @@ from utils.algorithms import (
     predict_next_value,
     calculate_velocity
 )
-from collections import defaultdict
-from datetime import datetime, timedelta
+import numpy as np
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
 @router.get("/trends")
-async def get_trends():
+def get_trends():
     """📈 Quality Trends with Predictions"""
-    entries = load_field_flow()
-    
-    scores = []
-    timestamps = []
-    for e in entries:
-        qs = e.get('quality_score')
-        if qs and isinstance(qs, dict):
-            score = qs.get('total_score')
-            if score is not None:
-                scores.append(score)
-                timestamps.append(e.get('timestamp'))
+    snap = get_metrics_snapshot()
+    scores = snap["score"][~np.isnan(snap["score"])]
     
     if len(scores) < 5:
         return {"status": "INSUFFICIENT_DATA"}
@@ -55,10 +45,10 @@ async def get_trends():
     
     return {
         "status": "TRENDS_AKTIV",
-        "current_avg": round(sum(scores[-10:]) / 10, 2) if len(scores) >= 10 else round(sum(scores) / len(scores), 2),
+        "current_avg": round(float(scores[-10:].mean()), 2),
         "trend": trend,
         "velocity": round(velocity, 2),
-        "predicted_next": round(prediction, 2),
+        "predicted_next": round(float(prediction), 2),
         "moving_average": [round(v, 2) for v in ma[-20:]],
         "outliers": {
             "count": len(outlier_indices),
@@ -68,43 +58,37 @@ async def get_trends():
     }
 
 @router.get("/performance")
-async def get_performance():
+def get_performance():
     """⚡ Processing Performance Analysis"""
-    entries = load_field_flow()
+    snap = get_metrics_snapshot()
     
-    durations = []
-    by_wrapper = defaultdict(list)
+    # duration_ms 0/fehlend zählt nicht (NaN > 0 ist False)
+    has_duration = snap["duration_ms"] > 0
+    durations = snap["duration_ms"][has_duration]
     
-    for e in entries:
-        duration = e.get('duration_ms')
-        wrapper = e.get('wrapper', 'unknown')
-        if duration:
-            durations.append(duration)
-            by_wrapper[wrapper].append(duration)
-    
-    if not durations:
+    if not len(durations):
         return {"status": "NO_DATA"}
     
-    avg_duration = sum(durations) / len(durations)
+    avg_duration = float(durations.mean())
     
     # Detect slow jobs (outliers)
     outliers = detect_outliers(durations, threshold=2.5)
     
     wrapper_performance = {}
-    for wrapper, durs in by_wrapper.items():
+    for wrapper, agg in snap.group_by("wrapper", snap["duration_ms"], mask=has_duration).items():
         wrapper_performance[wrapper] = {
-            "avg_ms": round(sum(durs) / len(durs), 2),
-            "min_ms": min(durs),
-            "max_ms": max(durs),
-            "count": len(durs)
+            "avg_ms": round(agg["mean"], 2),
+            "min_ms": agg["min"],
+            "max_ms": agg["max"],
+            "count": agg["count"]
         }
     
     return {
         "status": "PERFORMANCE_AKTIV",
         "gesamt": {
             "avg_duration_ms": round(avg_duration, 2),
-            "min_ms": min(durations),
-            "max_ms": max(durations),
+            "min_ms": to_py(durations.min()),
+            "max_ms": to_py(durations.max()),
             "total_jobs": len(durations)
         },
         "by_wrapper": wrapper_performance,
@@ -115,31 +99,20 @@ async def get_performance():
     }
 
 @router.get("/correlation/topic-score")
-async def get_topic_score_correlation():
+def get_topic_score_correlation():
     """🔗 Topic vs Score Correlation"""
-    entries = load_field_flow()
-    
-    by_topic = defaultdict(list)
-    
-    for e in entries:
-        topic = e.get('topic', 'unknown')
-        qs = e.get('quality_score')
-        if qs and isinstance(qs, dict):
-            score = qs.get('total_score')
-            if score is not None:
-                by_topic[topic].append(score)
+    snap = get_metrics_snapshot()
+    scored = ~np.isnan(snap["score"])
+    overall_avg = float(snap["score"][scored].mean()) if scored.any() else 0.0
     
     correlations = {}
-    overall_avg = sum([s for scores in by_topic.values() for s in scores]) / sum([len(scores) for scores in by_topic.values()])
-    
-    for topic, scores in by_topic.items():
-        if len(scores) >= 3:
-            topic_avg = sum(scores) / len(scores)
-            deviation = topic_avg - overall_avg
+    for topic, agg in snap.group_by("topic", snap["score"], mask=scored).items():
+        if agg["count"] >= 3:
+            deviation = agg["mean"] - overall_avg
             
             correlations[topic] = {
-                "avg_score": round(topic_avg, 2),
-                "count": len(scores),
+                "avg_score": round(agg["mean"], 2),
+                "count": agg["count"],
                 "deviation_from_mean": round(deviation, 2),
                 "correlation": "POSITIVE" if deviation > 5 else "NEGATIVE" if deviation < -5 else "NEUTRAL"
             }
@@ -154,39 +127,31 @@ async def get_topic_score_correlation():
     }
 
 @router.get("/outliers")
-async def get_outliers():
+def get_outliers():
     """🎯 Detect Statistical Outliers"""
-    entries = load_field_flow()
-    
-    scores = []
-    job_ids = []
-    
-    for e in entries:
-        qs = e.get('quality_score')
-        if qs and isinstance(qs, dict):
-            score = qs.get('total_score')
-            if score is not None:
-                scores.append(score)
-                job_ids.append(e.get('job_id'))
+    snap = get_metrics_snapshot()
+    scored = ~np.isnan(snap["score"])
+    scores = snap["score"][scored]
+    job_ids = snap["job_id"][scored]
     
     if len(scores) < 10:
         return {"status": "INSUFFICIENT_DATA"}
     
     outlier_indices = detect_outliers(scores, threshold=2.0)
     
-    outlier_jobs = []
-    for idx in outlier_indices:
-        if idx < len(job_ids):
-            outlier_jobs.append({
-                "job_id": job_ids[idx],
-                "score": scores[idx],
-                "index": idx
-            })
+    outlier_jobs = [
+        {
+            "job_id": str(job_ids[idx]),
+            "score": to_py(scores[idx]),
+            "index": idx
+        }
+        for idx in outlier_indices
+    ]
     
     return {
         "status": "OUTLIERS_DETECTED",
         "total_jobs": len(scores),
         "outliers_found": len(outlier_jobs),
         "outliers": outlier_jobs[-20:],  # Last 20
-        "mean_score": round(sum(scores) / len(scores), 2)
+        "mean_score": round(float(scores.mean()), 2)
     }
@@ -13,7 +13,7 @@ from collections import Counter
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
 @router.get("/dashboard")
-async def get_dashboard():
+def get_dashboard():
     """📊 Dashboard Summary"""
     entries = load_field_flow(limit=100)
     generations = load_evolution()
@@ -7,44 +7,32 @@ from fastapi import APIRouter, Query
 import sys
 sys.path.append('/opt/syntx-workflow-api-get-prompts/api-core')
 
-from utils.log_loader import load_field_flow
-from collections import defaultdict
-from datetime import datetime, timedelta
+from utils.metrics_snapshot import get_metrics_snapshot
+import numpy as np
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
 @router.get("/performance/by-topic")
-async def get_performance_by_topic():
+def get_performance_by_topic():
     """📊 Performance breakdown by topic"""
-    entries = load_field_flow()
+    snap = get_metrics_snapshot()
     
-    by_topic = defaultdict(lambda: {"durations": [], "scores": [], "count": 0})
-    
-    for e in entries:
-        topic = e.get('topic', 'unknown')
-        duration = e.get('duration_ms')
-        
-        qs = e.get('quality_score')
-        score = None
-        if qs and isinstance(qs, dict):
-            score = qs.get('total_score')
-        
-        by_topic[topic]["count"] += 1
-        if duration:
-            by_topic[topic]["durations"].append(duration)
-        if score is not None:
-            by_topic[topic]["scores"].append(score)
+    # duration_ms 0/fehlend zählt nicht (NaN > 0 ist False)
+    durations = np.where(snap["duration_ms"] > 0, snap["duration_ms"], np.nan)
+    by_duration = snap.group_by("topic", durations)
+    by_score = snap.group_by("topic", snap["score"])
     
     results = {}
-    for topic, data in by_topic.items():
-        durs = data["durations"]
-        scores = data["scores"]
+    for topic, dur in by_duration.items():
+        score = by_score[topic]
+        avg_duration = dur["mean"]
+        avg_score = score["mean"]
         
         results[topic] = {
-            "total_jobs": data["count"],
-            "avg_duration_ms": round(sum(durs) / len(durs), 2) if durs else 0,
-            "avg_score": round(sum(scores) / len(scores), 2) if scores else 0,
-            "efficiency_ratio": round((sum(scores) / len(scores)) / (sum(durs) / len(durs)) * 1000, 4) if durs and scores else 0
+            "total_jobs": dur["rows"],
+            "avg_duration_ms": round(avg_duration, 2),
+            "avg_score": round(avg_score, 2),
+            "efficiency_ratio": round(avg_score / avg_duration * 1000, 4) if dur["count"] and score["count"] else 0
         }
     
     # Sort by efficiency
@@ -56,47 +44,31 @@ async def get_performance_by_topic():
     }
 
 @router.get("/performance/hourly")
-async def get_performance_hourly():
+def get_performance_hourly():
     """⏰ Performance by hour of day"""
-    entries = load_field_flow()
+    snap = get_metrics_snapshot()
     
-    by_hour = defaultdict(lambda: {"durations": [], "scores": [], "count": 0})
+    known = snap["hour"] >= 0
+    hours = snap["hour"][known].astype(np.int64)
+    durations = snap["duration_ms"][known]
+    scores = snap["score"][known]
     
-    for e in entries:
-        timestamp = e.get('timestamp')
-        if not timestamp:
-            continue
-        
-        try:
-            dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-            hour = dt.hour
-        except:
-            continue
-        
-        duration = e.get('duration_ms')
-        qs = e.get('quality_score')
-        score = None
-        if qs and isinstance(qs, dict):
-            score = qs.get('total_score')
-        
-        by_hour[hour]["count"] += 1
-        if duration:
-            by_hour[hour]["durations"].append(duration)
-        if score is not None:
-            by_hour[hour]["scores"].append(score)
+    jobs = np.bincount(hours, minlength=24)
+    has_duration = durations > 0
+    dur_n = np.bincount(hours[has_duration], minlength=24)
+    dur_sum = np.bincount(hours[has_duration], weights=durations[has_duration], minlength=24)
+    scored = ~np.isnan(scores)
+    score_n = np.bincount(hours[scored], minlength=24)
+    score_sum = np.bincount(hours[scored], weights=scores[scored], minlength=24)
     
     hourly_data = []
     for hour in range(24):
-        if hour in by_hour:
-            data = by_hour[hour]
-            durs = data["durations"]
-            scores = data["scores"]
-            
+        if jobs[hour]:
             hourly_data.append({
                 "hour": hour,
-                "jobs": data["count"],
-                "avg_duration_ms": round(sum(durs) / len(durs), 2) if durs else 0,
-                "avg_score": round(sum(scores) / len(scores), 2) if scores else 0
+                "jobs": int(jobs[hour]),
+                "avg_duration_ms": round(float(dur_sum[hour] / dur_n[hour]), 2) if dur_n[hour] else 0,
+                "avg_score": round(float(score_sum[hour] / score_n[hour]), 2) if score_n[hour] else 0
             })
     
     return {
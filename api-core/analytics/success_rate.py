@@ -6,14 +6,23 @@ from fastapi import APIRouter
 import sys
 sys.path.append('/opt/syntx-workflow-api-get-prompts/api-core')
 
-from utils.log_loader import load_field_flow
+from utils.log_loader import load_field_flow, load_calibration_stats
 from collections import Counter
 
+try:
+    from queue_system.monitoring.calibration_stats import histogram_count
+except ImportError:
+    histogram_count = None
+
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
 @router.get("/success-rate")
-async def get_success_rate():
+def get_success_rate():
     """Overall Success Rate"""
+    stats = load_calibration_stats()
+    if stats is not None:
+        return _success_rate_from_stats(stats)
+    
     entries = load_field_flow()
     
     scores = [e.get('quality_score', {}).get('total_score', 0) for e in entries if e.get('quality_score')]
@@ -39,9 +48,52 @@ async def get_success_rate():
         }
     }
 
+def _success_rate_from_stats(stats) -> dict:
+    """Success Rate aus dem Score-Histogramm (queue/.stats.db) statt aus allen Files"""
+    hist = stats.histogram()
+    total = sum(hist.values())
+    if not total:
+        return {"status": "NO_DATA", "success_rate": 0}
+    
+    perfect = histogram_count(hist, 100, 101)
+    good = histogram_count(hist, 80, 100)
+    medium = histogram_count(hist, 50, 80)
+    low = histogram_count(hist, 0, 50)
+    
+    return {
+        "status": "SUCCESS_RATE_AKTIV",
+        "gesamt_jobs": total,
+        "success_rate": round(perfect / total * 100, 2),
+        "verteilung": {
+            "perfekt_100": {"count": perfect, "prozent": round(perfect / total * 100, 2)},
+            "gut_80_99": {"count": good, "prozent": round(good / total * 100, 2)},
+            "mittel_50_79": {"count": medium, "prozent": round(medium / total * 100, 2)},
+            "niedrig_0_49": {"count": low, "prozent": round(low / total * 100, 2)}
+        }
+    }
+
+def _rates_from_stats(stats, dim: str) -> dict:
+    """total_jobs / success_rate / avg_score pro Wrapper bzw. Topic aus den Aggregaten"""
+    return {
+        key: {
+            "total_jobs": agg["scored"],
+            "success_rate": agg["success_rate"],
+            "avg_score": agg["avg_score"]
+        }
+        for key, agg in stats.get(dim).items()
+        if agg["scored"]
+    }
+
 @router.get("/success-rate/by-wrapper")
-async def get_success_rate_by_wrapper():
+def get_success_rate_by_wrapper():
     """Success Rate per Wrapper"""
+    stats = load_calibration_stats()
+    if stats is not None:
+        return {
+            "status": "SUCCESS_RATE_BY_WRAPPER_AKTIV",
+            "wrappers": _rates_from_stats(stats, "wrapper")
+        }
+    
     entries = load_field_flow()
     
     by_wrapper = {}
@@ -76,8 +128,16 @@ async def get_success_rate_by_wrapper():
     }
 
 @router.get("/success-rate/by-topic")
-async def get_success_rate_by_topic():
+def get_success_rate_by_topic():
     """Success Rate per Topic"""
+    stats = load_calibration_stats()
+    if stats is not None:
+        results = _rates_from_stats(stats, "topic")
+        return {
+            "status": "SUCCESS_RATE_BY_TOPIC_AKTIV",
+            "topics": dict(sorted(results.items(), key=lambda x: x[1]['success_rate'], reverse=True))
+        }
+    
     entries = load_field_flow()
     
     by_topic = {}
@@ -6,52 +6,34 @@ from fastapi import APIRouter
 import sys
 sys.path.append('/opt/syntx-workflow-api-get-prompts/api-core')
 
-from utils.log_loader import load_field_flow
-from collections import Counter
+from utils.metrics_snapshot import get_metrics_snapshot
+import numpy as np
 
 router = APIRouter(prefix="/compare", tags=["compare"])
 
 @router.get("/wrappers")
-async def compare_all_wrappers():
+def compare_all_wrappers():
     """Compare all wrappers"""
-    entries = load_field_flow()
+    snap = get_metrics_snapshot()
     
-    by_wrapper = {}
-    for e in entries:
-        wrapper = e.get('wrapper', 'unknown')
-        if wrapper not in by_wrapper:
-            by_wrapper[wrapper] = {
-                "scores": [],
-                "topics": [],
-                "durations": []
-            }
-        
-        # Handle None quality_score
-        qs = e.get('quality_score')
-        if qs and isinstance(qs, dict):
-            score = qs.get('total_score')
-            if score is not None:
-                by_wrapper[wrapper]["scores"].append(score)
-        
-        topic = e.get('topic')
-        if topic:
-            by_wrapper[wrapper]["topics"].append(topic)
-        
-        duration = e.get('duration_ms')
-        if duration:
-            by_wrapper[wrapper]["durations"].append(duration)
+    scores = snap.group_by("wrapper", snap["score"])
+    durations = snap.group_by("wrapper", np.where(snap["duration_ms"] > 0, snap["duration_ms"], np.nan))
+    perfect = snap.value_counts("wrapper", mask=snap["score"] == 100)
+    # Leere Topics zählen nicht
+    empty_topic = [i for i, label in enumerate(snap.vocab["topic"]) if not label]
+    top_topics = snap.top_per_group("wrapper", "topic", k=5, mask=~np.isin(snap["topic"], empty_topic))
     
     comparison = {}
-    for wrapper, data in by_wrapper.items():
-        scores = data["scores"]
-        durations = data["durations"]
+    for wrapper, score in scores.items():
+        scored = score["count"]
+        duration = durations[wrapper]
         
         comparison[wrapper] = {
-            "total_jobs": len(scores) if scores else 0,
-            "avg_score": round(sum(scores) / len(scores), 2) if scores else 0,
-            "success_rate": round(len([s for s in scores if s == 100]) / len(scores) * 100, 2) if scores else 0,
-            "avg_duration_ms": round(sum(durations) / len(durations), 2) if durations else 0,
-            "top_topics": dict(Counter(data["topics"]).most_common(5))
+            "total_jobs": scored,
+            "avg_score": round(score["mean"], 2),
+            "success_rate": round(perfect.get(wrapper, 0) / scored * 100, 2) if scored else 0,
+            "avg_duration_ms": round(duration["mean"], 2),
+            "top_topics": top_topics.get(wrapper, {})
         }
     
     return {
@@ -60,52 +42,35 @@ async def compare_all_wrappers():
     }
 
 @router.get("/wrappers/{wrapper1}/{wrapper2}")
-async def compare_two_wrappers(wrapper1: str, wrapper2: str):
+def compare_two_wrappers(wrapper1: str, wrapper2: str):
     """Compare two wrappers"""
-    entries = load_field_flow()
+    snap = get_metrics_snapshot()
     
-    w1_data = {"scores": [], "durations": []}
-    w2_data = {"scores": [], "durations": []}
+    scored = ~np.isnan(snap["score"])
+    first = snap.codes_matching("wrapper", wrapper1) & scored
+    second = snap.codes_matching("wrapper", wrapper2) & scored & ~first
     
-    for e in entries:
-        wrapper = e.get('wrapper', '').lower()
-        
-        # Handle None quality_score
-        qs = e.get('quality_score')
-        score = None
-        if qs and isinstance(qs, dict):
-            score = qs.get('total_score')
-        
-        duration = e.get('duration_ms')
-        
-        if wrapper == wrapper1.lower() and score is not None:
-            w1_data["scores"].append(score)
-            if duration:
-                w1_data["durations"].append(duration)
-        elif wrapper == wrapper2.lower() and score is not None:
-            w2_data["scores"].append(score)
-            if duration:
-                w2_data["durations"].append(duration)
-    
-    if not w1_data["scores"] or not w2_data["scores"]:
+    if not first.any() or not second.any():
         return {"status": "INSUFFICIENT_DATA"}
     
-    w1_avg = sum(w1_data["scores"]) / len(w1_data["scores"])
-    w2_avg = sum(w2_data["scores"]) / len(w2_data["scores"])
+    def summarize(mask):
+        durations = snap["duration_ms"][mask]
+        durations = durations[durations > 0]
+        return {
+            "avg_score": float(snap["score"][mask].mean()),
+            "total_jobs": int(mask.sum()),
+            "avg_duration_ms": round(float(durations.mean()), 2) if len(durations) else 0
+        }
+    
+    w1, w2 = summarize(first), summarize(second)
+    w1_avg, w2_avg = w1["avg_score"], w2["avg_score"]
+    w1["avg_score"], w2["avg_score"] = round(w1_avg, 2), round(w2_avg, 2)
     
     return {
         "status": "WRAPPER_COMPARISON_AKTIV",
         "comparison": {
-            wrapper1: {
-                "avg_score": round(w1_avg, 2),
-                "total_jobs": len(w1_data["scores"]),
-                "avg_duration_ms": round(sum(w1_data["durations"]) / len(w1_data["durations"]), 2) if w1_data["durations"] else 0
-            },
-            wrapper2: {
-                "avg_score": round(w2_avg, 2),
-                "total_jobs": len(w2_data["scores"]),
-                "avg_duration_ms": round(sum(w2_data["durations"]) / len(w2_data["durations"]), 2) if w2_data["durations"] else 0
-            },
+            wrapper1: w1,
+            wrapper2: w2,
             "winner": wrapper1 if w1_avg > w2_avg else wrapper2,
             "difference": round(abs(w1_avg - w2_avg), 2)
         }
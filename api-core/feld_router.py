@@ -5,7 +5,7 @@ from collections import Counter
 router = APIRouter(prefix="/feld", tags=["feld"])
 
 @router.get("/topics")
-async def feld_topics():
+def feld_topics():
     """Returns a count of topics in the field flow."""
     entries = load_field_flow()
     topics = [e.get('topic', 'unknown') for e in entries]
@@ -16,7 +16,7 @@ async def feld_topics():
     }
 
 @router.get("/prompts")
-async def feld_prompts():
+def feld_prompts():
     """Placeholder for field prompt analysis."""
     entries = load_field_flow()
     prompt_ids = [e.get('prompt_id') for e in entries if e.get('prompt_id')]
@@ -15,8 +15,23 @@ from .format_loader import (
     FORMATS_DIR
 )
 
+# Definition-Embedding Cache des Scorers (optional - nur wenn syntex im PYTHONPATH)
+try:
+    from syntex_injector.syntex.analysis.definition_cache import invalidate_definition_embeddings
+except ImportError:
+    invalidate_definition_embeddings = None
+
 router = APIRouter(prefix="/formats", tags=["formats"])
 
+
+def _invalidate_embeddings(name: Optional[str] = None) -> None:
+    """Definition-Embeddings eines Formats verwerfen (werden beim nächsten Scoring neu berechnet)"""
+    if invalidate_definition_embeddings is not None:
+        try:
+            invalidate_definition_embeddings(name)
+        except Exception:
+            pass
+
 # ============================================================================
 # PYDANTIC MODELS
 # ============================================================================
@@ -78,7 +93,7 @@ class FormatUpdate(BaseModel):
 # ============================================================================
 
 @router.get("/")
-async def get_all_formats():
+def get_all_formats():
     """
     🌊 Liste aller verfügbaren Formate
     """
@@ -99,7 +114,7 @@ async def get_all_formats():
     }
 
 @router.get("/{name}")
-async def get_format(name: str, language: str = Query("de")):
+def get_format(name: str, language: str = Query("de")):
     """
     📄 Ein Format vollständig laden
     """
@@ -116,7 +131,7 @@ async def get_format(name: str, language: str = Query("de")):
         raise HTTPException(status_code=404, detail=str(e))
 
 @router.get("/{name}/fields")
-async def get_format_fields(name: str, language: str = Query("de")):
+def get_format_fields(name: str, language: str = Query("de")):
     """
     🔧 Nur die Feld-Definitionen eines Formats (für Scorer)
     """
@@ -137,7 +152,7 @@ async def get_format_fields(name: str, language: str = Query("de")):
         raise HTTPException(status_code=404, detail=str(e))
 
 @router.get("/{name}/summary")
-async def get_format_summary_endpoint(name: str):
+def get_format_summary_endpoint(name: str):
     """
     📊 Kurze Zusammenfassung eines Formats
     """
@@ -155,7 +170,7 @@ async def get_format_summary_endpoint(name: str):
 # ============================================================================
 
 @router.post("/")
-async def create_format(format_data: FormatCreate):
+def create_format(format_data: FormatCreate):
     """
     🌟 Neues Format erstellen
     """
@@ -215,6 +230,7 @@ async def create_format(format_data: FormatCreate):
     
     # Clear cache
     clear_cache()
+    _invalidate_embeddings(format_data.name)
     
     return {
         "status": "FORMAT_CREATED",
@@ -231,7 +247,7 @@ async def create_format(format_data: FormatCreate):
 # ============================================================================
 
 @router.put("/{name}")
-async def update_format(name: str, format_data: FormatUpdate):
+def update_format(name: str, format_data: FormatUpdate):
     """
     🔄 Format aktualisieren
     """
@@ -284,6 +300,7 @@ async def update_format(name: str, format_data: FormatUpdate):
     
     # Clear cache
     clear_cache()
+    _invalidate_embeddings(name)
     
     return {
         "status": "FORMAT_UPDATED",
@@ -300,7 +317,7 @@ async def update_format(name: str, format_data: FormatUpdate):
 # ============================================================================
 
 @router.delete("/{name}")
-async def delete_format(name: str):
+def delete_format(name: str):
     """
     💀 Format löschen
     """
@@ -317,6 +334,7 @@ async def delete_format(name: str):
     
     # Clear cache
     clear_cache()
+    _invalidate_embeddings(name)
     
     return {
         "status": "FORMAT_DELETED",
@@ -332,7 +350,7 @@ async def delete_format(name: str):
 # ============================================================================
 
 @router.post("/validate")
-async def validate_format_endpoint(format_data: dict):
+def validate_format_endpoint(format_data: dict):
     """
     ✅ Format validieren ohne zu speichern
     """
@@ -352,11 +370,12 @@ async def validate_format_endpoint(format_data: dict):
     }
 
 @router.post("/clear-cache")
-async def clear_format_cache():
+def clear_format_cache():
     """
     🧹 Format-Cache leeren
     """
     clear_cache()
+    _invalidate_embeddings()
     return {
         "status": "CACHE_CLEARED",
         "message": "Format-Cache wurde geleert!"
@@ -42,6 +42,7 @@ class StromParameter(BaseModel):
     felder_styles: Dict[str, float] = Field(default={})
     strom_anzahl: int = Field(default=1, ge=1, le=50)
     sprache: str = Field(default="de")
+    cache: Optional[bool] = Field(default=None)  # None = SYNTX_GPT_CACHE, False = Bypass
 
 
 class StromErgebnis(BaseModel):
@@ -54,6 +55,7 @@ class StromErgebnis(BaseModel):
     qualitaet: Optional[float] = None
     kosten: Optional[float] = None
     dauer_ms: Optional[int] = None
+    aus_cache: bool = False
 
 
 class KalibrierungOpenAI(BaseModel):
@@ -109,7 +111,7 @@ def kalibrierung_neu_laden():
 # ═══════════════════════════════════════════════════════════════════
 
 @router.post("/strom/dispatch")
-async def strom_dispatch(params: StromParameter = Body(...)):
+def strom_dispatch(params: StromParameter = Body(...)):
     """
     ⚡ STROM ERZEUGEN
     
@@ -126,11 +128,14 @@ async def strom_dispatch(params: StromParameter = Body(...)):
         style = max(params.felder_styles.items(), key=lambda x: x[1])[0]
         
         for i in range(params.strom_anzahl):
+            # cache_variant=i → Strom i wiederverwendbar, Ströme untereinander verschieden
             result = generate_prompt(
                 prompt=topic,
                 style=style,
                 temperature=0.7,
-                max_tokens=500
+                max_tokens=500,
+                use_cache=params.cache,
+                cache_variant=i
             )
             
             strom = StromErgebnis(
@@ -141,7 +146,8 @@ async def strom_dispatch(params: StromParameter = Body(...)):
                 strom_text=result.get('prompt_generated'),
                 qualitaet=result.get('quality_score', {}).get('total_score') if result.get('quality_score') else None,
                 kosten=result.get('cost', {}).get('total_cost') if result.get('cost') else None,
-                dauer_ms=result.get('duration_ms')
+                dauer_ms=result.get('duration_ms'),
+                aus_cache=result.get('cached', False)
             )
             resultate.append(strom)
         
@@ -154,6 +160,7 @@ async def strom_dispatch(params: StromParameter = Body(...)):
             "erfolg": successful,
             "fehlgeschlagen": params.strom_anzahl - successful,
             "kosten_usd": round(total_cost, 4),
+            "aus_cache": sum(1 for r in resultate if r.aus_cache),
             "stroeme": [r.dict() for r in resultate]
         }
     except Exception as e:
@@ -161,7 +168,7 @@ async def strom_dispatch(params: StromParameter = Body(...)):
 
 
 @router.get("/strom/status")
-async def strom_status():
+def strom_status():
     """📊 STROM-SYSTEM STATUS"""
     try:
         topics = get_config('generator', 'topics')
@@ -187,7 +194,7 @@ async def strom_status():
 # ═══════════════════════════════════════════════════════════════════
 
 @router.get("/felder/verfuegbar")
-async def felder_verfuegbar():
+def felder_verfuegbar():
     """
     🌊 VERFÜGBARE FELDER
     
@@ -213,7 +220,7 @@ async def felder_verfuegbar():
 # ═══════════════════════════════════════════════════════════════════
 
 @router.delete("/kalibrierung/cron/{pattern}")
-async def kalibrierung_cron_loeschen(pattern: str):
+def kalibrierung_cron_loeschen(pattern: str):
     """⏰ ZEIT-SCHLEIFE LÖSCHEN"""
     try:
         result = subprocess.run(['crontab', '-l'], capture_output=True, text=True)
@@ -245,7 +252,7 @@ async def kalibrierung_cron_loeschen(pattern: str):
 # ═══════════════════════════════════════════════════════════════════
 
 @router.get("/resonanz/parameter")
-async def resonanz_parameter():
+def resonanz_parameter():
     """
     🌊 RESONANZ-PARAMETER
     
@@ -274,7 +281,7 @@ from .topic_weights_handler import (
 )
 
 @router.get("/topic-weights")
-async def get_topic_weights():
+def get_topic_weights():
     """
     🌊 GET TOPIC WEIGHTS
     Hole alle gespeicherten Topic-Gewichtungen
@@ -294,7 +301,7 @@ async def get_topic_weights():
         }
 
 @router.put("/topic-weights")
-async def update_topic_weights(request: dict):
+def update_topic_weights(request: dict):
     """
     🌊 UPDATE TOPIC WEIGHTS
     Speichere Topic-Gewichtungen
@@ -340,7 +347,7 @@ async def update_topic_weights(request: dict):
         }
 
 @router.get("/topic-weights/{topic_name}")
-async def get_single_topic_weight(topic_name: str):
+def get_single_topic_weight(topic_name: str):
     """
     🌊 GET SINGLE TOPIC WEIGHT
     Hole Gewichtung für ein einzelnes Topic
@@ -359,7 +366,7 @@ async def get_single_topic_weight(topic_name: str):
         }
 
 @router.put("/topic-weights/{topic_name}")
-async def update_single_topic_weight(topic_name: str, request: dict):
+def update_single_topic_weight(topic_name: str, request: dict):
     """
     🌊 UPDATE SINGLE TOPIC WEIGHT
     Update Gewichtung für ein einzelnes Topic
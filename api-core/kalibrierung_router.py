@@ -3,55 +3,49 @@ from pathlib import Path
 import json
 from datetime import datetime
 
+# Byte-Offset Index des Calibration-Logs (optional - nur wenn syntex im PYTHONPATH)
+try:
+    from syntex_injector.syntex.core.calibration_index import get_calibration_index
+except ImportError:
+    get_calibration_index = None
+
 router = APIRouter(prefix="/kalibrierung", tags=["kalibrierung"])
 
+CALIBRATIONS_FILE = Path("/opt/syntx-config/generator-data/syntex_calibrations.jsonl")
+
+
+def _read_all_entries(calibrations_file: Path):
+    """Fallback ohne Index: komplettes Log lesen"""
+    entries = []
+    with open(calibrations_file, 'r') as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line.strip()))
+            except:
+                continue
+    return entries
+
 @router.get("/cron/logs")
-async def get_cron_logs(limit: int = Query(100, le=500)):
+def get_cron_logs(limit: int = Query(100, le=500)):
     """Get real calibration logs from syntex_calibrations.jsonl"""
     try:
-        calibrations_file = Path("/opt/syntx-config/generator-data/syntex_calibrations.jsonl")
+        calibrations_file = CALIBRATIONS_FILE
         
         if not calibrations_file.exists():
             return {"erfolg": False, "fehler": "Calibrations file not found"}
         
+        # Index: nur die letzten `limit` Zeilen per Seek lesen
+        if get_calibration_index is not None:
+            entries = get_calibration_index(calibrations_file).tail_entries(limit)
+        else:
+            entries = _read_all_entries(calibrations_file)
+        
         logs = []
-        with open(calibrations_file, 'r') as f:
-            for line in f:
-                try:
-                    data = json.loads(line.strip())
-                    
-                    # Extract cron info with VOLLTEXT stages
-                    log = {
-                        "cron_id": f"calibration-{data['timestamp'][:19]}",
-                        "timestamp": data['timestamp'],
-                        "cron_data": {
-                            "name": f"{data['system']} Calibration",
-                            "modell": "mistral-uncensored",
-                            "anzahl": 1,
-                            "felder": _extract_fields(data)
-                        },
-                        # 🔥 VOLLTEXT STAGES with GPT USER PROMPT!
-                        "stages": {
-                            "gpt_system_prompt": data.get('system', ''),
-                            "gpt_user_prompt": data.get('gpt_user_prompt', ''),  # 🔥 NEU!
-                            "gpt_output_meta_prompt": data.get('meta_prompt', ''),
-                            "mistral_input": data.get('meta_prompt', ''),
-                            "mistral_output": data.get('response', ''),
-                            "parsed_fields": data.get('parsed_fields', {})
-                        },
-                        "result": {
-                            "status": "completed" if data['success'] else "failed",
-                            "generated": 1 if data['success'] else 0,
-                            "failed": 0 if data['success'] else 1,
-                            "avg_quality": data.get('quality_score', {}).get('total_score', 0),
-                            "drift": _calculate_drift(data),
-                            "cost": data.get('cost', 0.01),
-                            "duration_ms": data.get('duration_ms', 0)
-                        }
-                    }
-                    logs.append(log)
-                except:
-                    continue
+        for data in entries:
+            try:
+                logs.append(_to_cron_log(data))
+            except:
+                continue
         
         # Sort by timestamp (newest first)
         logs.sort(key=lambda x: x['timestamp'], reverse=True)
@@ -65,30 +59,55 @@ async def get_cron_logs(limit: int = Query(100, le=500)):
     except Exception as e:
         return {"erfolg": False, "fehler": str(e)}
 
+def _to_cron_log(data: dict) -> dict:
+    """Calibration-Eintrag → Cron-Log mit VOLLTEXT stages"""
+    return {
+        "cron_id": f"calibration-{data['timestamp'][:19]}",
+        "timestamp": data['timestamp'],
+        "cron_data": {
+            "name": f"{data['system']} Calibration",
+            "modell": "mistral-uncensored",
+            "anzahl": 1,
+            "felder": _extract_fields(data)
+        },
+        # 🔥 VOLLTEXT STAGES with GPT USER PROMPT!
+        "stages": {
+            "gpt_system_prompt": data.get('system', ''),
+            "gpt_user_prompt": data.get('gpt_user_prompt', ''),  # 🔥 NEU!
+            "gpt_output_meta_prompt": data.get('meta_prompt', ''),
+            "mistral_input": data.get('meta_prompt', ''),
+            "mistral_output": data.get('response', ''),
+            "parsed_fields": data.get('parsed_fields', {})
+        },
+        "result": {
+            "status": "completed" if data['success'] else "failed",
+            "generated": 1 if data['success'] else 0,
+            "failed": 0 if data['success'] else 1,
+            "avg_quality": data.get('quality_score', {}).get('total_score', 0),
+            "drift": _calculate_drift(data),
+            "cost": data.get('cost', 0.01),
+            "duration_ms": data.get('duration_ms', 0)
+        }
+    }
+
 @router.get("/cron/stats")
-async def get_cron_stats():
+def get_cron_stats():
     """Get stats from calibrations"""
     try:
-        calibrations_file = Path("/opt/syntx-config/generator-data/syntex_calibrations.jsonl")
+        calibrations_file = CALIBRATIONS_FILE
         
         if not calibrations_file.exists():
             return {"erfolg": False}
         
-        total = 0
-        completed = 0
-        failed = 0
-        
-        with open(calibrations_file, 'r') as f:
-            for line in f:
-                try:
-                    data = json.loads(line.strip())
-                    total += 1
-                    if data.get('success'):
-                        completed += 1
-                    else:
-                        failed += 1
-                except:
-                    continue
+        # Index: Stats ohne das Log zu lesen
+        if get_calibration_index is not None:
+            stats = get_calibration_index(calibrations_file).stats()
+            total, completed, failed = stats["total"], stats["completed"], stats["failed"]
+        else:
+            entries = _read_all_entries(calibrations_file)
+            total = len(entries)
+            completed = sum(1 for data in entries if data.get('success'))
+            failed = total - completed
         
         return {
             "erfolg": True,
@@ -4,11 +4,18 @@ Deep insights into system performance
 """
 from fastapi import APIRouter, Query
 from pathlib import Path
-import json
 from typing import Optional, Dict, List
 from collections import defaultdict, Counter
 from datetime import datetime
 
+from utils.processed_index import get_processed_index
+from utils.log_loader import load_calibration_stats
+
+try:
+    from queue_system.monitoring.calibration_stats import histogram_count, histogram_median, histogram_mode
+except ImportError:
+    histogram_count = None
+
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
 QUEUE_DIR = Path("/opt/syntx-workflow-api-get-prompts/queue")
@@ -19,24 +26,8 @@ LOGS_DIR = Path("/opt/syntx-workflow-api-get-prompts/logs")
 # ============================================================================
 
 def load_all_processed() -> List[Dict]:
-    """Load all processed prompts - SAFE VERSION"""
-    processed = []
-    processed_dir = QUEUE_DIR / "processed"
-    
-    if not processed_dir.exists():
-        return processed
-    
-    for file in processed_dir.glob("*.json"):
-        try:
-            with open(file) as f:
-                data = json.load(f)
-                if data is not None and isinstance(data, dict):  # SAFE CHECK
-                    processed.append(data)
-        except Exception as e:
-            print(f"⚠️ Error loading {file}: {e}")
-            continue
-    
-    return processed
+    """Load all processed prompts - SAFE VERSION (via shared incremental index)"""
+    return get_processed_index().all()
 
 def safe_get_score(prompt: Dict) -> float:
     """Safely extract score from prompt"""
@@ -50,7 +41,7 @@ def safe_get_score(prompt: Dict) -> float:
 # ============================================================================
 
 @router.get("/overview")
-async def analytics_overview():
+def analytics_overview():
     """Complete system overview"""
     processed = load_all_processed()
     
@@ -81,7 +72,7 @@ async def analytics_overview():
 # ============================================================================
 
 @router.get("/topics")
-async def analytics_topics():
+def analytics_topics():
     """Topic performance breakdown"""
     processed = load_all_processed()
     if not processed:
@@ -114,7 +105,7 @@ async def analytics_topics():
     }
 
 @router.get("/topics/{topic_name}")
-async def analytics_topic_detail(topic_name: str):
+def analytics_topic_detail(topic_name: str):
     """Detailed analysis for specific topic"""
     processed = load_all_processed()
     topic_prompts = [p for p in processed if p.get('topic') == topic_name]
@@ -142,8 +133,12 @@ async def analytics_topic_detail(topic_name: str):
 # ============================================================================
 
 @router.get("/scores/distribution")
-async def score_distribution():
+def score_distribution():
     """Score distribution analysis"""
+    stats = load_calibration_stats()
+    if stats is not None:
+        return _distribution_from_stats(stats)
+    
     processed = load_all_processed()
     if not processed:
         return {"status": "NO_DATA"}
@@ -176,8 +171,37 @@ async def score_distribution():
         }
     }
 
+def _distribution_from_stats(stats) -> Dict:
+    """Verteilung aus dem Score-Histogramm (queue/.stats.db) statt aus allen Files"""
+    hist = dict(stats.histogram())
+    # Processed Jobs ohne Score zählen wie bisher als 0
+    unscored = stats.totals()["success"] - sum(hist.values())
+    if unscored > 0:
+        hist[0] = hist.get(0, 0) + unscored
+    
+    total = sum(hist.values())
+    if not total:
+        return {"status": "NO_DATA"}
+    
+    edges = [(0, 20), (20, 40), (40, 60), (60, 80), (80, 90), (90, 95), (95, 98), (98, 101)]
+    buckets = {
+        f"{low}-{min(high, 100)}": histogram_count(hist, low, high)
+        for low, high in edges
+    }
+    
+    return {
+        "status": "DISTRIBUTION_READY",
+        "total_scores": total,
+        "distribution": buckets,
+        "statistics": {
+            "mean": round(sum(score * n for score, n in hist.items()) / total, 2),
+            "median": histogram_median(hist),
+            "mode": histogram_mode(hist)
+        }
+    }
+
 @router.get("/scores/trends")
-async def score_trends():
+def score_trends():
     """Score trends over time"""
     processed = load_all_processed()
     if not processed:
@@ -211,7 +235,7 @@ async def score_trends():
 # ============================================================================
 
 @router.get("/complete-dashboard")
-async def complete_dashboard():
+def complete_dashboard():
     """
     🔥 COMPLETE SYNTX DASHBOARD
     Alles aggregiert: System Health, Quality, Keywords, Topics, Success Stories
@@ -10,6 +10,8 @@ from typing import Optional, Dict, List
 from collections import defaultdict, Counter
 import re
 
+from utils.processed_index import get_processed_index, get_archive_index
+
 router = APIRouter(prefix="/evolution", tags=["evolution"])
 
 QUEUE_DIR = Path("/opt/syntx-workflow-api-get-prompts/queue")
@@ -46,53 +48,47 @@ def extract_syntx_keywords(text: str) -> List[str]:
             found.append(keyword)
     return found
 
+def iter_prompts_with_text(include_archive: bool = True):
+    """(name, metadata, prompt_text) aus processed/ (+ archive/) - via shared index"""
+    indexes = [get_processed_index()]
+    if include_archive:
+        indexes.append(get_archive_index())
+    
+    for index in indexes:
+        for name, data, prompt_text in index.entries(with_text=True):
+            if prompt_text is None:
+                continue
+            yield name, data, prompt_text
+
 @router.get("/syntx-vs-normal")
-async def compare_syntx_vs_normal():
+def compare_syntx_vs_normal():
     """
     🌊 Compare SYNTX-style prompts vs normal prompts
     
     Shows the power of field-based language
     """
-    processed_dir = QUEUE_DIR / "processed"
-    archive_dir = QUEUE_DIR / "archive"
-    
     syntx_prompts = []
     normal_prompts = []
     
-    for search_dir in [processed_dir, archive_dir]:
-        if not search_dir.exists():
-            continue
+    for name, data, prompt_text in iter_prompts_with_text():
+        try:
+            score = data.get('syntex_result', {}).get('quality_score', {}).get('total_score', 0)
             
-        for json_file in search_dir.glob("*.json"):
-            try:
-                with open(json_file) as f:
-                    data = json.load(f)
-                
-                # Get prompt text
-                txt_file = json_file.with_suffix('.txt')
-                if not txt_file.exists():
-                    continue
-                
-                with open(txt_file) as f:
-                    prompt_text = f.read()
-                
-                score = data.get('syntex_result', {}).get('quality_score', {}).get('total_score', 0)
-                
-                prompt_data = {
-                    "job_id": data.get('filename', json_file.stem),
-                    "score": score,
-                    "topic": data.get('topic'),
-                    "wrapper": data.get('syntex_result', {}).get('wrapper'),
-                    "keywords": extract_syntx_keywords(prompt_text)
-                }
+            prompt_data = {
+                "job_id": data.get('filename', Path(name).stem),
+                "score": score,
+                "topic": data.get('topic'),
+                "wrapper": data.get('syntex_result', {}).get('wrapper'),
+                "keywords": extract_syntx_keywords(prompt_text)
+            }
+            
+            if is_syntx_prompt(prompt_text):
+                syntx_prompts.append(prompt_data)
+            else:
+                normal_prompts.append(prompt_data)
                 
-                if is_syntx_prompt(prompt_text):
-                    syntx_prompts.append(prompt_data)
-                else:
-                    normal_prompts.append(prompt_data)
-                    
-            except:
-                continue
+        except:
+            continue
     
     # Calculate stats
     syntx_scores = [p['score'] for p in syntx_prompts if p['score'] > 0]
@@ -144,43 +140,26 @@ async def compare_syntx_vs_normal():
 # ============================================================================
 
 @router.get("/keywords/power")
-async def analyze_keyword_power():
+def analyze_keyword_power():
     """
     💎 Analyze which keywords correlate with high scores
     
     Shows which words create resonance
     """
-    processed_dir = QUEUE_DIR / "processed"
-    archive_dir = QUEUE_DIR / "archive"
-    
     keyword_stats = defaultdict(lambda: {"scores": [], "count": 0})
     
-    for search_dir in [processed_dir, archive_dir]:
-        if not search_dir.exists():
-            continue
+    for name, data, prompt_text in iter_prompts_with_text():
+        try:
+            score = data.get('syntex_result', {}).get('quality_score', {}).get('total_score', 0)
             
-        for json_file in search_dir.glob("*.json"):
-            try:
-                with open(json_file) as f:
-                    data = json.load(f)
-                
-                txt_file = json_file.with_suffix('.txt')
-                if not txt_file.exists():
-                    continue
-                
-                with open(txt_file) as f:
-                    prompt_text = f.read()
-                
-                score = data.get('syntex_result', {}).get('quality_score', {}).get('total_score', 0)
-                
-                if score > 0:
-                    keywords = extract_syntx_keywords(prompt_text)
-                    for keyword in keywords:
-                        keyword_stats[keyword]["scores"].append(score)
-                        keyword_stats[keyword]["count"] += 1
-                        
-            except:
-                continue
+            if score > 0:
+                keywords = extract_syntx_keywords(prompt_text)
+                for keyword in keywords:
+                    keyword_stats[keyword]["scores"].append(score)
+                    keyword_stats[keyword]["count"] += 1
+                    
+        except:
+            continue
     
     # Calculate power ranking
     keyword_power = []
@@ -216,7 +195,7 @@ async def analyze_keyword_power():
 # ============================================================================
 
 @router.get("/generations/improvement")
-async def track_generation_improvement():
+def track_generation_improvement():
     """
     📈 Track improvement across generations
     
@@ -283,22 +262,17 @@ async def track_generation_improvement():
 # ============================================================================
 
 @router.get("/wrappers/learning")
-async def analyze_wrapper_learning():
+def analyze_wrapper_learning():
     """
     🔥 Track how each wrapper learns over time
     
     Shows which wrapper improves fastest
     """
-    processed_dir = QUEUE_DIR / "processed"
-    
     # Get all prompts sorted by timestamp
     prompts_by_wrapper = defaultdict(list)
     
-    for json_file in sorted(processed_dir.glob("*.json")):
+    for data in get_processed_index().all():
         try:
-            with open(json_file) as f:
-                data = json.load(f)
-            
             wrapper = data.get('syntex_result', {}).get('wrapper', 'unknown')
             score = data.get('syntex_result', {}).get('quality_score', {}).get('total_score', 0)
             timestamp = data.get('processed_at', data.get('created_at'))
@@ -355,22 +329,17 @@ async def analyze_wrapper_learning():
 # ============================================================================
 
 @router.get("/fields/evolution")
-async def track_field_evolution():
+def track_field_evolution():
     """
     ⚡ Track how field detection improves over time
     
     Shows which fields are getting better recognized
     """
-    processed_dir = QUEUE_DIR / "processed"
-    
     # Track field presence over time
     field_timeline = []
     
-    for json_file in sorted(processed_dir.glob("*.json")):
+    for data in get_processed_index().all():
         try:
-            with open(json_file) as f:
-                data = json.load(f)
-            
             breakdown = data.get('syntex_result', {}).get('quality_score', {}).get('detail_breakdown', {})
             timestamp = data.get('processed_at', data.get('created_at'))
             
@@ -429,14 +398,12 @@ async def track_field_evolution():
 # ============================================================================
 
 @router.get("/topics/resonance")
-async def analyze_topic_resonance():
+def analyze_topic_resonance():
     """
     🌊 Analyze which topics resonate best with SYNTX
     
     Shows topic-field harmony
     """
-    processed_dir = QUEUE_DIR / "processed"
-    
     topic_stats = defaultdict(lambda: {
         "syntx_prompts": 0,
         "normal_prompts": 0,
@@ -444,21 +411,11 @@ async def analyze_topic_resonance():
         "normal_scores": []
     })
     
-    for json_file in processed_dir.glob("*.json"):
+    for name, data, prompt_text in iter_prompts_with_text(include_archive=False):
         try:
-            with open(json_file) as f:
-                data = json.load(f)
-            
             topic = data.get('topic', 'unknown')
             score = data.get('syntex_result', {}).get('quality_score', {}).get('total_score', 0)
             
-            txt_file = json_file.with_suffix('.txt')
-            if not txt_file.exists():
-                continue
-            
-            with open(txt_file) as f:
-                prompt_text = f.read()
-            
             if is_syntx_prompt(prompt_text):
                 topic_stats[topic]["syntx_prompts"] += 1
                 topic_stats[topic]["syntx_scores"].append(score)
@@ -6,10 +6,11 @@ Features: Predict, Analysis, Templates
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Optional
-import json
 from pathlib import Path
 import re
 
+from utils.processed_index import get_processed_index
+
 router = APIRouter(prefix="/prompts/advanced", tags=["prompts-advanced"])
 
 # Base paths
@@ -29,18 +30,8 @@ class PredictRequest(BaseModel):
 # === HELPER: Load all processed for analysis ===
 
 def load_all_processed():
-    """Load all processed jobs with safe error handling"""
-    processed = []
-    
-    for json_file in PROCESSED_DIR.glob("*.json"):
-        try:
-            with open(json_file) as f:
-                data = json.load(f)
-                processed.append(data)
-        except:
-            continue
-    
-    return processed
+    """Load all processed jobs with safe error handling (via shared incremental index)"""
+    return get_processed_index().all()
 
 
 # === HELPER: Extract keywords ===
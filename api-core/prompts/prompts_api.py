@@ -9,33 +9,41 @@ from typing import Optional, Dict, List
 from datetime import datetime
 from collections import defaultdict, Counter
 
+from utils.processed_index import get_processed_index, get_archive_index
+from utils.fulltext_index import get_fulltext_index
+
+# Byte-Offset Index des Calibration-Logs (optional - nur wenn syntex im PYTHONPATH)
+try:
+    from syntex_injector.syntex.core.calibration_index import get_calibration_index, parse_timestamp
+except ImportError:
+    get_calibration_index = None
+
+# Vektor-Index der Meta-Prompts (optional - numpy + sentence-transformers)
+try:
+    from syntex_injector.syntex.analysis.vector_index import get_vector_index
+except ImportError:
+    get_vector_index = None
+
+# GPT Cost-Ledger (optional - gpt_generator im PYTHONPATH)
+try:
+    from gpt_generator.cost_tracker import get_total_costs
+except ImportError:
+    get_total_costs = None
+
 router = APIRouter(prefix="/prompts", tags=["prompts"])
 
 QUEUE_DIR = Path("/opt/syntx-workflow-api-get-prompts/queue")
 LOGS_DIR = Path("/opt/syntx-workflow-api-get-prompts/logs")
+# Calibration-Log des Consumers (CalibrationLogger Default)
+CALIBRATIONS_FILE = Path("/opt/syntx-config/generator-data/syntex_calibrations.jsonl")
 
 # ============================================================================
 # CORE HELPERS - THE FOUNDATION
 # ============================================================================
 
 def load_all_processed() -> List[Dict]:
-    """Load all processed prompts - SAFE"""
-    processed = []
-    processed_dir = QUEUE_DIR / "processed"
-    
-    if not processed_dir.exists():
-        return processed
-    
-    for file in processed_dir.glob("*.json"):
-        try:
-            with open(file) as f:
-                data = json.load(f)
-                if data and isinstance(data, dict):
-                    processed.append(data)
-        except:
-            continue
-    
-    return processed
+    """Load all processed prompts - SAFE (via shared incremental index)"""
+    return get_processed_index().all()
 
 def safe_get_score(prompt: dict) -> float:
     """Extract score - SAFE"""
@@ -74,7 +82,7 @@ def safe_get_fields(prompt: dict) -> Dict[str, bool]:
 # ============================================================================
 
 @router.get("/all")
-async def get_all_prompts(limit: int = Query(100, le=500)):
+def get_all_prompts(limit: int = Query(100, le=500)):
     """Get all prompts metadata (no text)"""
     processed = load_all_processed()
     
@@ -101,7 +109,7 @@ async def get_all_prompts(limit: int = Query(100, le=500)):
     }
 
 @router.get("/by-job/{job_id}")
-async def get_by_job(job_id: str):
+def get_by_job(job_id: str):
     """Get specific job by ID"""
     processed = load_all_processed()
     
@@ -118,7 +126,7 @@ async def get_by_job(job_id: str):
     raise HTTPException(status_code=404, detail="Job not found")
 
 @router.get("/best")
-async def get_best_prompts(limit: int = Query(20, le=100)):
+def get_best_prompts(limit: int = Query(20, le=100)):
     """Best performing prompts"""
     processed = load_all_processed()
     
@@ -149,7 +157,7 @@ async def get_best_prompts(limit: int = Query(20, le=100)):
 # ============================================================================
 
 @router.get("/fields/breakdown")
-async def fields_breakdown():
+def fields_breakdown():
     """Field completion analysis"""
     processed = load_all_processed()
     
@@ -185,8 +193,16 @@ async def fields_breakdown():
     }
 
 @router.get("/costs/total")
-async def total_costs():
-    """Total GPT costs"""
+def total_costs(days: Optional[int] = Query(None, ge=1, description="Ledger: nur die letzten N Tage")):
+    """
+    Total GPT costs
+    
+    total_* → aus den processed Jobs (gpt_cost in der Metadata)
+    ledger  → alle API Calls aus logs/costs_summary.json (inkl. Retries,
+              Refusals, Cache-Hits) - optional auf die letzten days Tage.
+              Read-only: nachgeführt wird nur vom Writer (save_cost_log)
+              bzw. per `python -m gpt_generator.cost_tracker --rebuild`
+    """
     processed = load_all_processed()
     
     # Sort by timestamp (newest first)
@@ -207,11 +223,12 @@ async def total_costs():
         "total_prompts": len(processed),
         "total_cost_usd": round(total_cost, 4),
         "total_tokens": total_tokens,
-        "avg_cost_per_prompt": round(total_cost / len(processed), 4) if len(processed) > 0 else 0
+        "avg_cost_per_prompt": round(total_cost / len(processed), 4) if len(processed) > 0 else 0,
+        "ledger": get_total_costs(days, log_dir=LOGS_DIR, read_only=True) if get_total_costs is not None else None
     }
 
 @router.get("/search")
-async def search_prompts(q: str = Query(..., min_length=2)):
+def search_prompts(q: str = Query(..., min_length=2)):
     """Search in prompts"""
     processed = load_all_processed()
     
@@ -240,12 +257,153 @@ async def search_prompts(q: str = Query(..., min_length=2)):
         "results": results
     }
 
+@router.get("/search/fulltext")
+def search_fulltext(
+    q: str = Query(..., min_length=2, description="Suchbegriffe (Groß/klein & Umlaute egal)"),
+    match: str = Query("all", regex="^(all|any)$", description="all = alle Begriffe, any = mindestens einer"),
+    prefix: bool = Query(True, description="Begriffe als Präfix matchen (kalibrier → kalibrierung)"),
+    min_score: Optional[float] = Query(None, ge=0, le=100),
+    max_score: Optional[float] = Query(None, ge=0, le=100),
+    wrapper: Optional[str] = Query(None, description="Filter by wrapper"),
+    topic: Optional[str] = Query(None, description="Filter by topic"),
+    page: int = Query(1, ge=1, description="Page number (starts at 1)"),
+    page_size: int = Query(20, ge=1, le=100, description="Items per page")
+):
+    """
+    🔎 VOLLTEXT-SUCHE - Meta-Prompts & Responses (SQLite FTS5, bm25 Ranking)
+    
+    Example:
+    - /prompts/search/fulltext?q=größe drift
+    - /prompts/search/fulltext?q=kalibrier&wrapper=syntex_wrapper_sigma&min_score=80&page=2
+    """
+    index = get_fulltext_index()
+    hits = index.search(
+        q, mode=match, prefix=prefix,
+        min_score=min_score, max_score=max_score, wrapper=wrapper, topic=topic,
+        limit=page_size, offset=(page - 1) * page_size
+    )
+    
+    total_items = hits["total"]
+    total_pages = (total_items + page_size - 1) // page_size
+    
+    results = []
+    for hit in hits["results"]:
+        results.append({
+            "id": Path(hit["name"]).stem + ".txt",
+            "topic": hit["topic"],
+            "style": hit["style"],
+            "category": hit["category"],
+            "wrapper": hit["wrapper"],
+            "score": hit["score"] if hit["score"] is not None else 0.0,
+            "timestamp": hit["processed_at"],
+            "rank": round(hit["rank"], 4),
+            "snippets": index.snippets(hit["name"], q)
+        })
+    
+    return {
+        "status": "SEARCH_COMPLETE",
+        "query": q,
+        "pagination": {
+            "page": page,
+            "page_size": page_size,
+            "total_items": total_items,
+            "total_pages": total_pages,
+            "has_next": page < total_pages,
+            "has_prev": page > 1
+        },
+        "filters": {
+            "min_score": min_score,
+            "max_score": max_score,
+            "wrapper": wrapper,
+            "topic": topic
+        },
+        "results": results
+    }
+
+@router.get("/similar")
+def similar_prompts(
+    job: Optional[str] = Query(None, description="Referenz-Job (Filename, mit oder ohne Endung)"),
+    q: Optional[str] = Query(None, min_length=3, description="Referenz-Text (statt job)"),
+    k: int = Query(10, ge=1, le=100),
+    min_score: float = Query(0, ge=0, le=100),
+    topic: Optional[str] = Query(None, description="Filter by topic")
+):
+    """
+    🧲 ÄHNLICHE PROMPTS - Top-k Nachbarn im Embedding-Raum (Cosine Similarity)
+    
+    Example:
+    - /prompts/similar?job=20251207_143022_123456__topic_ki__style_technisch&min_score=90
+    - /prompts/similar?q=Drift im Bildungssystem&k=5
+    """
+    if get_vector_index is None:
+        raise HTTPException(status_code=503, detail="Vector index not available (numpy/syntex_injector missing)")
+    if not job and not q:
+        raise HTTPException(status_code=400, detail="Either 'job' or 'q' is required")
+    
+    index = get_vector_index()
+    exclude = set()
+    if job:
+        uid = Path(job).stem
+        vector = index.vector(uid)
+        if vector is None:
+            raise HTTPException(status_code=404, detail=f"Job not in vector index: {job}")
+        exclude.add(uid)
+    else:
+        vector = index.embed(q)
+        if vector is None:
+            raise HTTPException(status_code=503, detail="Embedding model not available")
+    
+    processed_index = get_processed_index()
+    archive_index = get_archive_index()
+    
+    # Filter greifen erst nach der Suche → überabtasten bis k Treffer oder Index erschöpft
+    fetch = k * 4 if (min_score > 0 or topic) else k
+    while True:
+        hits = index.search(vector, fetch, exclude=exclude)
+        results = []
+        for uid, similarity in hits:
+            data, location = processed_index.get(uid), "processed"
+            if data is None:
+                data, location = archive_index.get(uid), "archive"
+            if data is None:
+                continue
+            score = safe_get_score(data)
+            if score < min_score:
+                continue
+            if topic and str(data.get('topic', '')).lower() != topic.lower():
+                continue
+            result = data.get('syntex_result') if isinstance(data.get('syntex_result'), dict) else {}
+            results.append({
+                "id": data.get('filename', f"{uid}.txt"),
+                "similarity": round(similarity, 4),
+                "topic": data.get('topic', 'unknown'),
+                "style": data.get('style', 'unknown'),
+                "category": data.get('category', 'unknown'),
+                "score": score,
+                "wrapper": result.get('wrapper', 'unknown'),
+                "timestamp": data.get('processed_at', ''),
+                "location": location
+            })
+            if len(results) >= k:
+                break
+        if len(results) >= k or len(hits) < fetch:
+            break
+        fetch *= 4
+    
+    return {
+        "status": "SIMILAR_FOUND",
+        "reference": {"job": job} if job else {"query": q},
+        "index_size": len(index),
+        "filters": {"min_score": min_score, "topic": topic},
+        "results": results
+    }
+
 # ============================================================================
 # TABLE VIEW - OVERVIEW WITHOUT TEXT
 # ============================================================================
 
 @router.get("/table-view")
-async def prompts_table_view(
+def prompts_table_view(
     limit: int = Query(50, le=200),
     min_score: float = Query(0, ge=0, le=100),
     topic: Optional[str] = None
@@ -319,7 +477,7 @@ async def prompts_table_view(
 # ============================================================================
 
 @router.get("/full-text/{filename}")
-async def get_full_prompt_text(filename: str):
+def get_full_prompt_text(filename: str):
     """
     📄 VOLLTEXT - Complete prompt & response for ONE file
     
@@ -386,8 +544,8 @@ async def get_full_prompt_text(filename: str):
 # ============================================================================
 
 def load_all_calibrations() -> Dict[str, Dict]:
-    """Load all calibrations and index by timestamp for matching"""
-    calibrations_file = LOGS_DIR / "syntex_calibrations.jsonl"
+    """Load all calibrations and index by timestamp for matching (Fallback ohne Index)"""
+    calibrations_file = CALIBRATIONS_FILE
     calibrations = []
     
     if not calibrations_file.exists():
@@ -407,9 +565,28 @@ def load_all_calibrations() -> Dict[str, Dict]:
     
     return calibrations
 
-def find_response_by_timestamp(processed_timestamp: str, calibrations: list) -> str:
-    """Find calibration response by nearest timestamp match"""
-    if not processed_timestamp or not calibrations:
+def find_response_by_timestamp(processed_timestamp: str, calibrations: Optional[list] = None) -> str:
+    """
+    Find calibration response by nearest timestamp match
+    
+    Ohne calibrations-Liste: Binary Search im Calibration-Index →
+    nur Einträge im ±5 Minuten Fenster werden aus dem Log gelesen
+    """
+    if not processed_timestamp:
+        return "[No response available]"
+    
+    if calibrations is None:
+        calibrations_file = CALIBRATIONS_FILE
+        if get_calibration_index is not None and calibrations_file.exists():
+            ts = parse_timestamp(processed_timestamp)
+            calibrations = [
+                c for c in get_calibration_index(calibrations_file).entries_between(ts - 300, ts + 300)
+                if c.get('response') and c.get('timestamp')
+            ]
+        else:
+            calibrations = load_all_calibrations()
+    
+    if not calibrations:
         return "[No response available]"
     
     try:
@@ -441,8 +618,24 @@ def find_response_by_timestamp(processed_timestamp: str, calibrations: list) ->
         return f"[Error matching: {e}]"
 
 
+def find_calibration_for_job(prompt: dict) -> Optional[Dict]:
+    """
+    Calibration-Eintrag eines processed Jobs - exakter Join über job_uid
+    
+    O(1) über den Hash-Index des Calibration-Logs. Jobs ohne job_uid
+    (vor Einführung verarbeitet) → None
+    """
+    job_uid = prompt.get('job_uid')
+    if not job_uid or get_calibration_index is None or not CALIBRATIONS_FILE.exists():
+        return None
+    try:
+        return get_calibration_index(CALIBRATIONS_FILE).find_job(job_uid)
+    except Exception:
+        return None
+
+
 @router.get("/complete-export")
-async def complete_export(
+def complete_export(
     page: int = Query(1, ge=1, description="Page number (starts at 1)"),
     page_size: int = Query(50, ge=1, le=200, description="Items per page"),
     min_score: float = Query(0, description="Minimum score filter"),
@@ -541,7 +734,13 @@ async def complete_export(
                 except:
                     pass
         
-        # Try 2: Fallback to JSON (BACKFILLED DATA)
+        # Try 2: Calibration-Log via job_uid (exakter Join, O(1))
+        if response_text == '[Response not available]':
+            calibration = find_calibration_for_job(p)
+            if calibration and calibration.get('response'):
+                response_text = calibration['response']
+        
+        # Try 3: Fallback to JSON (BACKFILLED DATA)
         if response_text == '[Response not available]':
             result = p.get('syntex_result')
             if result and isinstance(result, dict):
@@ -558,6 +757,7 @@ async def complete_export(
         # Build export item
         export_item = {
             "id": p.get('filename', 'unknown'),
+            "job_uid": p.get('job_uid'),
             "timestamp": p.get('processed_at', ''),
             
             # Prompt Data
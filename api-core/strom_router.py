@@ -5,12 +5,12 @@ from datetime import datetime
 router = APIRouter(prefix="/strom", tags=["strom"])
 
 @router.get("/health")
-async def strom_health():
+def strom_health():
     """Health check for the stream processing layer."""
     return {"status": "STROM_ONLINE", "timestamp": datetime.now().isoformat()}
 
 @router.get("/queue/status")
-async def strom_queue_status():
+def strom_queue_status():
     """Placeholder for stream queue status."""
     entries = load_field_flow()
     total_processed = len(entries)
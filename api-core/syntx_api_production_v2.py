@@ -8,6 +8,7 @@ from fastapi import FastAPI, HTTPException, Query, Path
 from fastapi.middleware.cors import CORSMiddleware
 from typing import Optional, List, Dict, Any
 import json
+import os
 from pathlib import Path as FilePath
 from datetime import datetime, timedelta
 from collections import defaultdict, Counter
@@ -15,7 +16,8 @@ import sys
 
 sys.path.append('/opt/syntx-workflow-api-get-prompts/api-core')
 
-from utils.log_loader import load_field_flow, load_evolution, get_queue_counts, QUEUE_DIR
+from utils.log_loader import load_field_flow, load_evolution, get_queue_counts, load_calibration_stats, QUEUE_DIR
+from utils.response_cache import install_response_cache, get_response_cache
 
 # Import all routers
 from analytics.dashboard import router as analytics_dashboard_router
@@ -39,12 +41,27 @@ app = FastAPI(
     version="2.1.0"
 )
 
+# Handler sind plain `def` → laufen im AnyIO Threadpool statt den Event-Loop
+# mit glob/json.load zu blockieren. Max. parallele Handler-Threads:
+API_THREADPOOL_SIZE = int(os.getenv("SYNTX_API_THREADS", "16"))
+
+@app.on_event("startup")
+async def limit_threadpool():
+    """Threadpool begrenzen (AnyIO Default: 40) - schützt Disk/CPU bei Polling-Spitzen"""
+    import anyio.to_thread
+    anyio.to_thread.current_default_thread_limiter().total_tokens = API_THREADPOOL_SIZE
+
+# ETag/304 + JSON-Cache für Dashboard-Polling (siehe utils/response_cache.py)
+# Vor CORS registrieren → CORS bleibt äußerste Schicht, auch 304/HIT bekommen CORS-Header
+install_response_cache(app)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 # Include routers
@@ -67,7 +84,7 @@ app.include_router(analytics_new_router)
 
 # Original endpoints
 @app.get("/feld/drift")
-async def get_drift_stream(
+def get_drift_stream(
     limit: int = Query(20),
     topic: Optional[str] = Query(None),
     wrapper: Optional[str] = Query(None),
@@ -112,7 +129,7 @@ async def get_drift_stream(
     }
 
 @app.get("/resonanz/queue")
-async def get_queue_resonanz():
+def get_queue_resonanz():
     """Queue Resonanz"""
     queue = get_queue_counts()
     total = sum(queue.values())
@@ -135,21 +152,26 @@ async def get_queue_resonanz():
     }
 
 @app.get("/resonanz/system")
-async def get_system_resonanz():
+def get_system_resonanz():
     """System Resonanz"""
     queue = get_queue_counts()
-    entries = load_field_flow(limit=100)
     generations = load_evolution()
     
-    scores = []
-    for e in entries:
-        qs = e.get('quality_score')
-        if qs and isinstance(qs, dict):
-            score = qs.get('total_score')
-            if score is not None:
-                scores.append(score)
-    
-    avg_score = sum(scores) / len(scores) if scores else 0
+    # Ø Score der letzten ~100 Jobs aus den Stunden-Aggregaten (queue/.stats.db)
+    stats = load_calibration_stats()
+    if stats is not None:
+        avg_score = stats.recent_average(min_scored=100)
+    else:
+        entries = load_field_flow(limit=100)
+        scores = []
+        for e in entries:
+            qs = e.get('quality_score')
+            if qs and isinstance(qs, dict):
+                score = qs.get('total_score')
+                if score is not None:
+                    scores.append(score)
+        
+        avg_score = sum(scores) / len(scores) if scores else 0
     
     if avg_score >= 90 and queue['incoming'] < 50:
         system_state = "OPTIMAL"
@@ -181,7 +203,7 @@ async def get_system_resonanz():
     }
 
 @app.get("/generation/progress")
-async def get_evolution_progress():
+def get_evolution_progress():
     """Evolution Progress"""
     generations = load_evolution()
     
@@ -209,18 +231,19 @@ async def get_evolution_progress():
     }
 
 @app.get("/health")
-async def health_check():
+def health_check():
     """System Health"""
     return {
         "status": "SYSTEM_GESUND",
         "api_version": "2.1.0",
         "timestamp": datetime.now().isoformat(),
         "queue_accessible": QUEUE_DIR.exists(),
+        "response_cache": get_response_cache().stats(),
         "modules": ["analytics", "compare", "feld", "resonanz", "generation", "predictions"]
     }
 
 @app.get("/")
-async def root():
+def root():
     """API Info"""
     return {
         "name": "SYNTX Production API",
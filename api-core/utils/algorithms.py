@@ -1,72 +1,92 @@
 """
 SYNTX Algorithms - Statistical & ML algorithms
+
+=== BATCH (NumPy) ===
+Gleiche Signaturen & Ergebnisse wie die alten Pure-Python Versionen,
+aber vektorisiert (Cumsum, polyfit, corrcoef) - Listen oder Arrays rein,
+Python-Listen/-Zahlen raus (JSON-tauglich).
+
+=== STREAMING ===
+RunningStats      → Mittelwert/Varianz/z-Score per Welford, O(1) pro Wert
+OnlineRegression  → lineare Regression/Korrelation über Co-Momente, O(1)
+Beide lassen sich mergen (Chan et al.) → Teil-Aggregate kombinierbar,
+z.B. pro Wrapper/Stunde wie in queue_system/monitoring/calibration_stats.
+
+Benchmark gegen die alten Versionen: scripts/benchmark_algorithms.sh
 """
 
-from typing import List, Dict, Any
-import statistics
+import math
+from typing import List, Dict, Any, Optional, Sequence
+
+import numpy as np
+
+# Steigung pro Job, ab der ein Trend als STEIGEND/FALLEND gilt
+TREND_THRESHOLD = 0.5
+
+
+def _as_array(values: Sequence[float]) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def _trend_label(slope: float, threshold: float = TREND_THRESHOLD) -> str:
+    if slope > threshold:
+        return "STEIGEND"
+    elif slope < -threshold:
+        return "FALLEND"
+    return "STABIL"
+
+
+# ============================================================================
+# BATCH
+# ============================================================================
 
 def calculate_moving_average(values: List[float], window: int = 5) -> List[float]:
+    """Gleitender Durchschnitt per Cumsum (O(n) statt O(n·w)) - die ersten window-1 Werte bleiben roh"""
     if len(values) < window:
         return values
-    result = []
-    for i in range(len(values)):
-        if i < window - 1:
-            result.append(values[i])
-        else:
-            window_values = values[i - window + 1:i + 1]
-            result.append(sum(window_values) / window)
-    return result
+    arr = _as_array(values)
+    csum = np.cumsum(np.concatenate(([0.0], arr)))
+    result = arr.copy()
+    result[window - 1:] = (csum[window:] - csum[:-window]) / window
+    return result.tolist()
 
 def detect_outliers(values: List[float], threshold: float = 2.0) -> List[int]:
+    """Indizes mit |z| > threshold (Stichproben-Stdev wie statistics.stdev)"""
     if len(values) < 3:
         return []
-    mean = statistics.mean(values)
-    stdev = statistics.stdev(values)
-    outliers = []
-    for i, value in enumerate(values):
-        z_score = abs((value - mean) / stdev) if stdev > 0 else 0
-        if z_score > threshold:
-            outliers.append(i)
-    return outliers
+    arr = _as_array(values)
+    stdev = arr.std(ddof=1)
+    if stdev == 0:
+        return []
+    z_scores = np.abs((arr - arr.mean()) / stdev)
+    return np.flatnonzero(z_scores > threshold).tolist()
+
+def calculate_slope(values: List[float]) -> float:
+    """Steigung der Regressionsgeraden über den Index (np.polyfit Grad 1)"""
+    if len(values) < 2:
+        return 0.0
+    arr = _as_array(values)
+    return float(np.polyfit(np.arange(len(arr), dtype=np.float64), arr, 1)[0])
 
 def calculate_trend(values: List[float]) -> str:
     if len(values) < 2:
         return "STABIL"
-    n = len(values)
-    x = list(range(n))
-    x_mean = sum(x) / n
-    y_mean = sum(values) / n
-    numerator = sum((x[i] - x_mean) * (values[i] - y_mean) for i in range(n))
-    denominator = sum((x[i] - x_mean) ** 2 for i in range(n))
-    if denominator == 0:
-        return "STABIL"
-    slope = numerator / denominator
-    if slope > 0.5:
-        return "STEIGEND"
-    elif slope < -0.5:
-        return "FALLEND"
-    else:
-        return "STABIL"
+    return _trend_label(calculate_slope(values))
 
 def calculate_correlation(x: List[float], y: List[float]) -> float:
     if len(x) != len(y) or len(x) < 2:
         return 0.0
-    n = len(x)
-    x_mean = sum(x) / n
-    y_mean = sum(y) / n
-    numerator = sum((x[i] - x_mean) * (y[i] - y_mean) for i in range(n))
-    x_var = sum((x[i] - x_mean) ** 2 for i in range(n))
-    y_var = sum((y[i] - y_mean) ** 2 for i in range(n))
-    denominator = (x_var * y_var) ** 0.5
-    if denominator == 0:
+    xa, ya = _as_array(x), _as_array(y)
+    # Konstante Reihe → corrcoef wäre NaN (+ RuntimeWarning)
+    if xa.std() == 0 or ya.std() == 0:
         return 0.0
-    return numerator / denominator
+    return float(np.corrcoef(xa, ya)[0, 1])
 
 def calculate_velocity(values: List[float]) -> float:
+    """Durchschnittliche Änderung pro Schritt - Teleskopsumme: (last - first) / (n - 1)"""
     if len(values) < 2:
         return 0.0
-    changes = [values[i] - values[i-1] for i in range(1, len(values))]
-    return sum(changes) / len(changes) if changes else 0.0
+    return (float(values[-1]) - float(values[0])) / (len(values) - 1)
 
 def predict_next_value(values: List[float]) -> float:
     if len(values) < 3:
@@ -92,3 +112,204 @@ def detect_bottleneck(queue_history: List[Dict]) -> Dict[str, Any]:
     if all(incoming_counts[i] < incoming_counts[i+1] for i in range(len(incoming_counts)-1)):
         return {"detected": True, "type": "GROWING_BACKLOG", "growth_rate": incoming_counts[-1] - incoming_counts[0]}
     return {"detected": False}
+
+
+# ============================================================================
+# STREAMING
+# ============================================================================
+
+class RunningStats:
+    """
+    Mittelwert & Varianz per Welford - numerisch stabil, O(1) pro Wert
+
+        stats = RunningStats()
+        for score in scores:
+            if stats.count >= 3 and abs(stats.z_score(score)) > 2.0:
+                ...  # Outlier relativ zu allem bisher Gesehenen
+            stats.update(score)
+
+    === STATE ===
+    count, mean, m2 (Summe quadrierter Abweichungen), min, max
+    → state() / from_state() für JSON/SQLite
+    """
+
+    __slots__ = ("count", "mean", "m2", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, value: float) -> None:
+        value = float(value)
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """Zwei Teil-Aggregate kombinieren (Chan et al.) - in-place, gibt self zurück"""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self) -> float:
+        """Stichproben-Varianz (ddof=1) wie statistics.variance"""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+    def z_score(self, value: float) -> float:
+        stdev = self.stdev
+        return (float(value) - self.mean) / stdev if stdev > 0 else 0.0
+
+    def state(self) -> Dict[str, float]:
+        return {"count": self.count, "mean": self.mean, "m2": self.m2, "min": self.min, "max": self.max}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, float]) -> "RunningStats":
+        stats = cls()
+        stats.count = int(state.get("count", 0))
+        stats.mean = float(state.get("mean", 0.0))
+        stats.m2 = float(state.get("m2", 0.0))
+        stats.min = float(state.get("min", math.inf))
+        stats.max = float(state.get("max", -math.inf))
+        return stats
+
+
+class OnlineRegression:
+    """
+    Lineare Regression y = slope·x + intercept, inkrementell über Co-Momente
+
+    Ohne x-Werte zählt der Index (0, 1, 2, ...) - gleiche Steigung wie
+    calculate_slope()/calculate_trend() über die ganze Reihe.
+
+        reg = OnlineRegression()
+        for score in scores:
+            reg.update(score)
+        reg.trend()   # → "STEIGEND" | "FALLEND" | "STABIL"
+
+    === STATE ===
+    count, mean_x, mean_y, m2_x, m2_y, c_xy → state() / from_state()
+    """
+
+    __slots__ = ("count", "mean_x", "mean_y", "m2_x", "m2_y", "c_xy")
+
+    def __init__(self):
+        self.count = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.m2_x = 0.0
+        self.m2_y = 0.0
+        self.c_xy = 0.0
+
+    def update(self, y: float, x: Optional[float] = None) -> None:
+        x = float(self.count if x is None else x)
+        y = float(y)
+        self.count += 1
+        dx = x - self.mean_x
+        dy = y - self.mean_y
+        self.mean_x += dx / self.count
+        self.mean_y += dy / self.count
+        self.m2_x += dx * (x - self.mean_x)
+        self.m2_y += dy * (y - self.mean_y)
+        self.c_xy += dx * (y - self.mean_y)
+
+    def merge(self, other: "OnlineRegression") -> "OnlineRegression":
+        """Teil-Regressionen kombinieren (x-Werte müssen vergleichbar sein) - in-place"""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            for name in self.__slots__:
+                setattr(self, name, getattr(other, name))
+            return self
+        count = self.count + other.count
+        factor = self.count * other.count / count
+        dx = other.mean_x - self.mean_x
+        dy = other.mean_y - self.mean_y
+        self.m2_x += other.m2_x + dx * dx * factor
+        self.m2_y += other.m2_y + dy * dy * factor
+        self.c_xy += other.c_xy + dx * dy * factor
+        self.mean_x += dx * other.count / count
+        self.mean_y += dy * other.count / count
+        self.count = count
+        return self
+
+    @property
+    def slope(self) -> float:
+        return self.c_xy / self.m2_x if self.m2_x > 0 else 0.0
+
+    @property
+    def intercept(self) -> float:
+        return self.mean_y - self.slope * self.mean_x
+
+    @property
+    def correlation(self) -> float:
+        denominator = math.sqrt(self.m2_x * self.m2_y)
+        return self.c_xy / denominator if denominator > 0 else 0.0
+
+    def predict(self, x: Optional[float] = None) -> float:
+        """y an Stelle x (default: nächster Index)"""
+        return self.slope * float(self.count if x is None else x) + self.intercept
+
+    def trend(self, threshold: float = TREND_THRESHOLD) -> str:
+        if self.count < 2:
+            return "STABIL"
+        return _trend_label(self.slope, threshold)
+
+    def state(self) -> Dict[str, float]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, float]) -> "OnlineRegression":
+        reg = cls()
+        for name in cls.__slots__:
+            setattr(reg, name, float(state.get(name, 0.0)))
+        reg.count = int(reg.count)
+        return reg
+
+
+class StreamingMovingAverage:
+    """Gleitender Durchschnitt über die letzten window Werte - O(1) pro Wert"""
+
+    def __init__(self, window: int = 5):
+        self.window = window
+        self._values: List[float] = []
+        self._pos = 0
+        self._sum = 0.0
+
+    def update(self, value: float) -> float:
+        value = float(value)
+        if len(self._values) < self.window:
+            self._values.append(value)
+            self._sum += value
+        else:
+            self._sum += value - self._values[self._pos]
+            self._values[self._pos] = value
+            self._pos = (self._pos + 1) % self.window
+            if self._pos == 0:
+                # Einmal pro Umlauf neu summieren → kein Rundungsdrift über Millionen Updates
+                self._sum = math.fsum(self._values)
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self._sum / len(self._values) if self._values else 0.0
@@ -0,0 +1,330 @@
+"""
+SYNTX Fulltext Index - SQLite FTS5 über Meta-Prompts & Responses in queue/processed/
+
+=== ZWECK ===
+/prompts/search kann nur topic/style/category matchen. Der Volltext steckt
+in <job>.txt (Meta-Prompt) und <job>_response.txt (Kalibrierung) - ohne
+Index bleibt nur ein Full-Scan über alle Files.
+
+=== SCHEMA (queue/.fulltext.db) ===
+docs(id, name, topic, style, category, wrapper, score, processed_at)
+    → Filter & Sortierung, name = <job>.json
+fts(prompt, response)   FTS5, rowid = docs.id
+    → gefaltete Texte, Ranking per bm25()
+
+=== FALTUNG ===
+Dokumente UND Queries laufen durch fold():
+    casefold (ß → ss, Groß/klein egal) + ä/ö/ü → ae/oe/ue
+    + unicode61 remove_diacritics (é → e)
+→ "Größe", "GROESSE", "größe" finden dasselbe.
+Snippets werden aus dem Original-Text geschnitten (Positions-Mapping).
+
+=== SYNC ===
+Vor jeder Query: ProcessedIndex.version unverändert → nichts zu tun.
+Sonst Delta über Dateinamen: neue Jobs indexieren, archivierte löschen,
+geänderte Metadata (Rescoring, invalidate) nachziehen. Texte werden
+nur für neue Jobs gelesen.
+
+=== VERWENDUNG ===
+    from utils.fulltext_index import get_fulltext_index
+    hits = get_fulltext_index().search("drift kalibrierung", min_score=80, limit=20)
+"""
+
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .processed_index import QUEUE_DIR, get_index
+
+FULLTEXT_DB = QUEUE_DIR / ".fulltext.db"
+
+# bm25 Gewichte (prompt, response) - Treffer im Meta-Prompt zählen mehr
+BM25_WEIGHTS = (2.0, 1.0)
+SNIPPET_CHARS = 160
+
+_UMLAUTS = {"ä": "ae", "ö": "oe", "ü": "ue"}
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def fold(text: str) -> str:
+    """Case- & Umlaut-Faltung für Index und Query"""
+    return "".join(_UMLAUTS.get(ch, ch) for ch in text.casefold())
+
+
+def _fold_with_offsets(text: str) -> Tuple[str, List[int]]:
+    """fold() + für jedes gefaltete Zeichen die Position im Original"""
+    chars, offsets = [], []
+    for i, ch in enumerate(text):
+        for folded in fold(ch):
+            chars.append(folded)
+            offsets.append(i)
+    return "".join(chars), offsets
+
+
+def _query_terms(query: str) -> List[str]:
+    return _TOKEN_RE.findall(fold(query))
+
+
+def build_match(query: str, mode: str = "all", prefix: bool = True) -> Optional[str]:
+    """
+    Freitext → FTS5 MATCH Ausdruck
+
+    Jeder Begriff wird gequotet (keine FTS-Syntax-Injection),
+    prefix=True → "begriff"* (deutsche Komposita: "kalibrier" findet "kalibrierung")
+    """
+    terms = _query_terms(query)
+    if not terms:
+        return None
+    star = "*" if prefix else ""
+    joiner = " OR " if mode == "any" else " AND "
+    return joiner.join(f'"{t}"{star}' for t in terms)
+
+
+def make_snippet(text: str, query: str, width: int = SNIPPET_CHARS) -> str:
+    """Ausschnitt aus dem Original um den ersten Treffer (gefaltet gesucht)"""
+    if not text:
+        return ""
+    folded, offsets = _fold_with_offsets(text)
+    best = None
+    for term in _query_terms(query):
+        match = re.search(r"\b" + re.escape(term), folded)
+        if match and (best is None or match.start() < best):
+            best = match.start()
+    if best is None:
+        return text[:width].strip()
+    center = offsets[best]
+    start = max(0, center - width // 3)
+    end = min(len(text), start + width)
+    snippet = " ".join(text[start:end].split())
+    return ("…" if start > 0 else "") + snippet + ("…" if end < len(text) else "")
+
+
+def _read_text(path: Path) -> str:
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            return f.read()
+    except OSError:
+        return ""
+
+
+def _doc_fields(name: str, data: Dict) -> Tuple:
+    """(topic, style, category, wrapper, score, processed_at) aus der Metadata"""
+    result = data.get("syntex_result")
+    if not isinstance(result, dict):
+        result = {}
+    quality = result.get("quality_score")
+    score = quality.get("total_score") if isinstance(quality, dict) else None
+    if isinstance(score, bool) or not isinstance(score, (int, float)):
+        score = None
+    return (
+        data.get("topic", "unknown"),
+        data.get("style", "unknown"),
+        data.get("category", "unknown"),
+        result.get("wrapper", "unknown"),
+        score,
+        data.get("processed_at", data.get("created_at", "")),
+    )
+
+
+class FulltextIndex:
+    """
+    FTS5 Index, synchronisiert mit einem ProcessedIndex
+
+    === THREAD-SAFETY ===
+    Eine SQLite Connection pro Thread, sync() unter Lock
+    """
+
+    def __init__(self, db_path: Path = FULLTEXT_DB, directory: Path = QUEUE_DIR / "processed"):
+        self.db_path = Path(db_path)
+        self.directory = Path(directory)
+        self._local = threading.local()
+        self._sync_lock = threading.Lock()
+        self._synced_version: Optional[str] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=10.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS docs (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL UNIQUE,
+                    topic TEXT, style TEXT, category TEXT, wrapper TEXT,
+                    score REAL,
+                    processed_at TEXT
+                );
+                CREATE INDEX IF NOT EXISTS docs_score ON docs (score);
+                CREATE INDEX IF NOT EXISTS docs_processed_at ON docs (processed_at);
+                CREATE VIRTUAL TABLE IF NOT EXISTS fts USING fts5 (
+                    prompt, response,
+                    tokenize = 'unicode61 remove_diacritics 2'
+                );
+            """)
+            self._local.conn = conn
+        return conn
+
+    # ========================================================================
+    # SYNC
+    # ========================================================================
+
+    def sync(self, force: bool = False) -> Dict[str, int]:
+        """
+        Index an das Verzeichnis angleichen (nur Deltas) → {added, removed, updated}
+
+        force=True ignoriert nur die Versions-Prüfung - Texte bekannter Jobs
+        werden nie neu gelesen (Prompt/Response ändern sich nach processed/ nicht)
+        """
+        index = get_index(self.directory)
+        with self._sync_lock:
+            version = index.version
+            if not force and version == self._synced_version:
+                return {"added": 0, "removed": 0, "updated": 0}
+            entries = {name: data for name, data, _ in index.entries()}
+
+            conn = self._connect()
+            known = {name: (doc_id, tuple(rest)) for doc_id, name, *rest in conn.execute(
+                "SELECT id, name, topic, style, category, wrapper, score, processed_at FROM docs"
+            )}
+
+            added = [n for n in entries if n not in known]
+            removed = [known[n][0] for n in known if n not in entries]
+            updated = []
+            for name, (doc_id, stored) in known.items():
+                data = entries.get(name)
+                if data is not None:
+                    fields = _doc_fields(name, data)
+                    if fields != stored:
+                        updated.append(fields + (doc_id,))
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany("DELETE FROM fts WHERE rowid = ?", [(i,) for i in removed])
+                conn.executemany("DELETE FROM docs WHERE id = ?", [(i,) for i in removed])
+                conn.executemany(
+                    "UPDATE docs SET topic = ?, style = ?, category = ?, wrapper = ?, score = ?, processed_at = ? "
+                    "WHERE id = ?", updated
+                )
+                for name in added:
+                    self._add(conn, name, entries[name])
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+            self._synced_version = version
+            return {"added": len(added), "removed": len(removed), "updated": len(updated)}
+
+    def _add(self, conn: sqlite3.Connection, name: str, data: Dict) -> None:
+        stem = Path(name).stem
+        prompt = _read_text(self.directory / f"{stem}.txt")
+        response = _read_text(self.directory / f"{stem}_response.txt")
+        if not response:
+            result = data.get("syntex_result")
+            if isinstance(result, dict):
+                response = result.get("response_text") or ""
+
+        doc_id = conn.execute(
+            "INSERT INTO docs (name, topic, style, category, wrapper, score, processed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (name,) + _doc_fields(name, data)
+        ).lastrowid
+        conn.execute("INSERT INTO fts (rowid, prompt, response) VALUES (?, ?, ?)",
+                     (doc_id, fold(prompt), fold(response)))
+
+    # ========================================================================
+    # SEARCH
+    # ========================================================================
+
+    def search(self, query: str, mode: str = "all", prefix: bool = True,
+               min_score: Optional[float] = None, max_score: Optional[float] = None,
+               wrapper: Optional[str] = None, topic: Optional[str] = None,
+               limit: int = 20, offset: int = 0) -> Dict:
+        """
+        Ranked Volltext-Suche
+
+        === RETURNS ===
+        {"total": int, "results": [{name, topic, style, category, wrapper,
+        score, processed_at, rank}]} - rank = bm25 (kleiner = besser)
+        """
+        match = build_match(query, mode, prefix)
+        if match is None:
+            return {"total": 0, "results": []}
+
+        self.sync()
+
+        where = ["fts MATCH ?"]
+        params: List = [match]
+        if min_score is not None:
+            where.append("d.score >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            where.append("d.score <= ?")
+            params.append(max_score)
+        if wrapper:
+            where.append("d.wrapper = ? COLLATE NOCASE")
+            params.append(wrapper)
+        if topic:
+            where.append("d.topic = ? COLLATE NOCASE")
+            params.append(topic)
+        clause = " AND ".join(where)
+
+        conn = self._connect()
+        total = conn.execute(
+            f"SELECT COUNT(*) FROM fts JOIN docs d ON d.id = fts.rowid WHERE {clause}", params
+        ).fetchone()[0]
+        rows = conn.execute(
+            f"SELECT d.name, d.topic, d.style, d.category, d.wrapper, d.score, d.processed_at, "
+            f"bm25(fts, {BM25_WEIGHTS[0]}, {BM25_WEIGHTS[1]}) AS rank "
+            f"FROM fts JOIN docs d ON d.id = fts.rowid WHERE {clause} "
+            f"ORDER BY rank LIMIT ? OFFSET ?",
+            params + [limit, offset]
+        ).fetchall()
+
+        columns = ("name", "topic", "style", "category", "wrapper", "score", "processed_at", "rank")
+        return {"total": total, "results": [dict(zip(columns, row)) for row in rows]}
+
+    def snippets(self, name: str, query: str) -> Dict[str, str]:
+        """Original-Ausschnitte (prompt, response) um den Treffer - liest nur die 2 Files"""
+        stem = Path(name).stem
+        return {
+            "prompt": make_snippet(_read_text(self.directory / f"{stem}.txt"), query),
+            "response": make_snippet(_read_text(self.directory / f"{stem}_response.txt"), query),
+        }
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+
+_index: Optional[FulltextIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_fulltext_index() -> FulltextIndex:
+    """Shared FulltextIndex über queue/processed/"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = FulltextIndex()
+        return _index
+
+
+if __name__ == "__main__":
+    # python3 -m utils.fulltext_index [query] (aus api-core/) → Index aufbauen/abfragen
+    import sys
+    import time
+
+    fts = get_fulltext_index()
+    start = time.perf_counter()
+    print(f"🔄 Sync: {fts.sync(force=True)} in {time.perf_counter() - start:.2f}s · {len(fts)} Dokumente")
+    if len(sys.argv) > 1:
+        query = " ".join(sys.argv[1:])
+        start = time.perf_counter()
+        hits = fts.search(query, limit=10)
+        print(f"🔎 '{query}': {hits['total']} Treffer in {(time.perf_counter() - start) * 1000:.1f}ms")
+        for hit in hits["results"]:
+            print(f"   {hit['rank']:.2f}  {hit['name']}  score={hit['score']}")
@@ -1,43 +1,50 @@
 """
 SYNTX Log Loader - FIXED
-Liest aus queue/processed/*.json
+Liest aus queue/processed/*.json (über den inkrementellen ProcessedIndex)
 """
 
 import json
 from pathlib import Path
 from typing import List, Dict, Optional
 
-QUEUE_DIR = Path("/opt/syntx-workflow-api-get-prompts/queue")
+from .processed_index import QUEUE_DIR, get_index
+
+# Queue-Zähler (queue_system liegt via PYTHONPATH im Repo-Root)
+try:
+    from queue_system.core.queue_counters import get_counters
+except ImportError:
+    get_counters = None
+
+# Rollende Kalibrierungs-Aggregate (queue/.stats.db)
+try:
+    from queue_system.monitoring.calibration_stats import get_calibration_stats
+except ImportError:
+    get_calibration_stats = None
 
 def load_field_flow(limit: Optional[int] = None) -> List[Dict]:
-    """Load from queue/processed/*.json"""
-    processed_dir = QUEUE_DIR / "processed"
-    
-    if not processed_dir.exists():
-        return []
+    """Load from queue/processed/*.json (via shared incremental index)"""
+    index = get_index(QUEUE_DIR / "processed")
     
     entries = []
-    for json_file in sorted(processed_dir.glob("*.json")):
-        try:
-            with open(json_file, 'r') as f:
-                data = json.load(f)
-                
-                # Transform to expected format
-                entry = {
-                    "job_id": data.get('filename', json_file.stem),
-                    "topic": data.get('topic', 'unknown'),
-                    "style": data.get('style', 'unknown'),
-                    "category": data.get('category', 'unknown'),
-                    "wrapper": data.get('syntex_result', {}).get('wrapper', 'unknown'),
-                    "quality_score": data.get('syntex_result', {}).get('quality_score', {}),
-                    "duration_ms": data.get('syntex_result', {}).get('duration_ms'),
-                    "session_id": data.get('syntex_result', {}).get('session_id'),
-                    "timestamp": data.get('processed_at', data.get('created_at')),
-                    "status": data.get('status', 'unknown')
-                }
-                entries.append(entry)
-        except Exception as e:
+    for name, data, _ in index.entries():
+        result = data.get('syntex_result', {})
+        if not isinstance(result, dict):
             continue
+        
+        # Transform to expected format
+        entry = {
+            "job_id": data.get('filename', Path(name).stem),
+            "topic": data.get('topic', 'unknown'),
+            "style": data.get('style', 'unknown'),
+            "category": data.get('category', 'unknown'),
+            "wrapper": result.get('wrapper', 'unknown'),
+            "quality_score": result.get('quality_score', {}),
+            "duration_ms": result.get('duration_ms'),
+            "session_id": result.get('session_id'),
+            "timestamp": data.get('processed_at', data.get('created_at')),
+            "status": data.get('status', 'unknown')
+        }
+        entries.append(entry)
     
     if limit:
         return entries[-limit:]
@@ -62,12 +69,18 @@ def load_evolution() -> List[Dict]:
     return entries
 
 def get_queue_counts() -> Dict[str, int]:
-    """Get queue counts"""
+    """Get queue counts - O(1) aus queue/.counters.db, Fallback: glob"""
+    if get_counters is not None:
+        try:
+            return get_counters(QUEUE_DIR).get()
+        except Exception:
+            pass
+    
     def count_files(subdir):
         p = QUEUE_DIR / subdir
         if not p.exists():
             return 0
-        return len(list(p.glob("*.txt")))
+        return len([f for f in p.glob("*.txt") if not f.name.endswith('_response.txt')])
     
     return {
         "incoming": count_files("incoming"),
@@ -76,6 +89,21 @@ def get_queue_counts() -> Dict[str, int]:
         "error": count_files("error")
     }
 
+def load_calibration_stats():
+    """
+    CalibrationStats der Queue (einmaliger Backfill bei leerer DB)
+    
+    None → Aggregator nicht verfügbar, Aufrufer rechnet wie bisher aus den Files
+    """
+    if get_calibration_stats is None:
+        return None
+    try:
+        stats = get_calibration_stats(QUEUE_DIR)
+        stats.ensure_backfilled()
+        return stats
+    except Exception:
+        return None
+
 # Exports
 FIELD_FLOW_LOG = Path("/dev/null")  # Not used anymore
 QUEUE_DIR = QUEUE_DIR
@@ -0,0 +1,335 @@
+"""
+SYNTX Metrics Snapshot - Spaltenbasierter NumPy-Snapshot über queue/processed/
+
+=== ZWECK ===
+analytics/advanced, analytics/performance und compare/* haben pro Request
+alle Jobs als Liste von Dicts durchlaufen (Trends, Outlier, Group-Bys).
+Der Snapshot hält die relevanten Felder pro Job als NumPy-Spalten -
+Group-Bys laufen über np.bincount statt über Python-Loops.
+
+=== SPALTEN ===
+name, job_id          str       (Dateiname .json / Original-Filename)
+timestamp             float64   Epoch-Sekunden (NaN = unbekannt)
+hour                  int8      Stunde 0-23 (-1 = unbekannt)
+topic, style,         int32     Codes → vocab[spalte][code]
+category, wrapper,
+status
+score                 float64   quality_score.total_score (NaN = kein Score)
+duration_ms           float64   syntex_result.duration_ms (NaN = fehlt)
+gpt_cost              float64   gpt_cost.total_cost (NaN = fehlt)
+fields                bool      (n, 6) Feld vorhanden laut detail_breakdown
+has_fields            bool      detail_breakdown vorhanden
+
+=== REFRESH ===
+Quelle ist der ProcessedIndex. Jeder get() vergleicht dessen Version
+(ein Verzeichnis-stat) - weicht sie ab, wird sofort neu gebaut, damit
+Snapshot und ETag (response_cache.data_version) nie auseinanderlaufen.
+Der Neubau ist inkrementell:
+- archivierte Jobs → Zeilen per Maske entfernen
+- neue Jobs → nur diese parsen und anhängen
+- gleiche Namen, neue Version (invalidate) → Vollbuild
+
+=== VERWENDUNG ===
+    from utils.metrics_snapshot import get_metrics_snapshot
+    snap = get_metrics_snapshot()
+    by_topic = snap.group_by("topic", snap["score"])
+"""
+
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .processed_index import QUEUE_DIR, get_processed_index
+
+SNAPSHOT_FILE = QUEUE_DIR / ".metrics_snapshot.npz"
+
+FIELDS = ("drift", "hintergrund_muster", "druckfaktoren", "tiefe", "wirkung", "klartext")
+CATEGORICAL = ("topic", "style", "category", "wrapper", "status")
+
+
+def to_py(value):
+    """NumPy-Skalar → JSON-taugliches int/float (ganzzahlige Werte bleiben int)"""
+    value = float(value)
+    if value.is_integer():
+        return int(value)
+    return value
+
+
+def _number(value) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return np.nan
+    return float(value)
+
+
+def _parse_time(value) -> Tuple[float, int]:
+    """ISO-Timestamp → (epoch, hour) - SAFE"""
+    if not value or not isinstance(value, str):
+        return np.nan, -1
+    try:
+        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        return dt.timestamp(), dt.hour
+    except (ValueError, OverflowError, OSError):
+        return np.nan, -1
+
+
+class MetricsSnapshot:
+    """
+    Unveränderlicher Spalten-Snapshot
+
+    === VOCAB ===
+    Kategorische Spalten sind int32 Codes. Das Vocab wächst nur
+    (inkrementelle Builds übernehmen es) → alte Codes bleiben gültig.
+    Labels ohne Zeilen tauchen in group_by/value_counts nicht auf.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], vocab: Dict[str, List[str]], version: str = ""):
+        self.columns = columns
+        self.vocab = vocab
+        self.version = version
+
+    def __len__(self) -> int:
+        return len(self.columns["name"])
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    # ========================================================================
+    # BUILD
+    # ========================================================================
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[Tuple[str, Dict, object]],
+                     vocab: Optional[Dict[str, List[str]]] = None, version: str = "") -> "MetricsSnapshot":
+        """
+        Baut Spalten aus (name, metadata, _) Tupeln des ProcessedIndex
+
+        Gleiche Transformation wie log_loader.load_field_flow():
+        Jobs mit nicht-dict syntex_result werden übersprungen.
+        """
+        vocab = {c: list((vocab or {}).get(c, [])) for c in CATEGORICAL}
+        lookup = {c: {label: i for i, label in enumerate(vocab[c])} for c in CATEGORICAL}
+
+        names, job_ids, timestamps, hours = [], [], [], []
+        scores, durations, costs, fields, has_fields = [], [], [], [], []
+        codes = {c: [] for c in CATEGORICAL}
+
+        for name, data, _ in entries:
+            result = data.get('syntex_result', {})
+            if not isinstance(result, dict):
+                continue
+
+            quality = result.get('quality_score')
+            if not isinstance(quality, dict):
+                quality = {}
+            breakdown = quality.get('detail_breakdown')
+            cost = data.get('gpt_cost')
+            ts, hour = _parse_time(data.get('processed_at', data.get('created_at')))
+
+            labels = {
+                "topic": data.get('topic', 'unknown'),
+                "style": data.get('style', 'unknown'),
+                "category": data.get('category', 'unknown'),
+                "wrapper": result.get('wrapper', 'unknown'),
+                "status": data.get('status', 'unknown'),
+            }
+            for column, label in labels.items():
+                label = "" if label is None else str(label)
+                table = lookup[column]
+                code = table.get(label)
+                if code is None:
+                    code = table[label] = len(vocab[column])
+                    vocab[column].append(label)
+                codes[column].append(code)
+
+            names.append(name)
+            job_ids.append(str(data.get('filename', Path(name).stem)))
+            timestamps.append(ts)
+            hours.append(hour)
+            scores.append(_number(quality.get('total_score')))
+            durations.append(_number(result.get('duration_ms')))
+            costs.append(_number(cost.get('total_cost')) if isinstance(cost, dict) else np.nan)
+            if isinstance(breakdown, dict) and breakdown:
+                fields.append([bool(breakdown.get(f)) for f in FIELDS])
+                has_fields.append(True)
+            else:
+                fields.append([False] * len(FIELDS))
+                has_fields.append(False)
+
+        columns = {
+            "name": np.array(names, dtype=str),
+            "job_id": np.array(job_ids, dtype=str),
+            "timestamp": np.array(timestamps, dtype=np.float64),
+            "hour": np.array(hours, dtype=np.int8),
+            "score": np.array(scores, dtype=np.float64),
+            "duration_ms": np.array(durations, dtype=np.float64),
+            "gpt_cost": np.array(costs, dtype=np.float64),
+            "fields": np.array(fields, dtype=bool).reshape(len(names), len(FIELDS)),
+            "has_fields": np.array(has_fields, dtype=bool),
+        }
+        for column in CATEGORICAL:
+            columns[column] = np.array(codes[column], dtype=np.int32)
+        return cls(columns, vocab, version)
+
+    def take(self, mask: np.ndarray) -> "MetricsSnapshot":
+        """Zeilen-Auswahl (bool Maske oder Indizes), Vocab bleibt gleich"""
+        return MetricsSnapshot({k: v[mask] for k, v in self.columns.items()}, self.vocab, self.version)
+
+    def concat(self, other: "MetricsSnapshot") -> "MetricsSnapshot":
+        """Hängt other an - other muss mit self.vocab als Basis gebaut sein"""
+        columns = {k: np.concatenate([v, other.columns[k]]) for k, v in self.columns.items()}
+        return MetricsSnapshot(columns, other.vocab, other.version)
+
+    # ========================================================================
+    # PERSISTENZ (.npz) - für Offline-Analysen mit NumPy/pandas
+    # ========================================================================
+
+    def save(self, path: Path = SNAPSHOT_FILE) -> Path:
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp.npz")
+        arrays = dict(self.columns)
+        for column in CATEGORICAL:
+            arrays[f"vocab__{column}"] = np.array(self.vocab[column], dtype=str)
+        np.savez(tmp, **arrays)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path: Path = SNAPSHOT_FILE) -> "MetricsSnapshot":
+        with np.load(path) as data:
+            vocab = {c: data[f"vocab__{c}"].tolist() for c in CATEGORICAL}
+            columns = {k: data[k] for k in data.files if not k.startswith("vocab__")}
+        return cls(columns, vocab)
+
+    # ========================================================================
+    # QUERIES
+    # ========================================================================
+
+    def codes_matching(self, column: str, value: str, case_insensitive: bool = True) -> np.ndarray:
+        """Bool-Maske: Zeilen deren Label == value"""
+        wanted = value.lower() if case_insensitive else value
+        matches = [i for i, label in enumerate(self.vocab[column])
+                   if (label.lower() if case_insensitive else label) == wanted]
+        return np.isin(self.columns[column], matches)
+
+    def value_counts(self, column: str, mask: Optional[np.ndarray] = None) -> Dict[str, int]:
+        """Label → Anzahl Zeilen (absteigend sortiert)"""
+        codes = self.columns[column] if mask is None else self.columns[column][mask]
+        counts = np.bincount(codes, minlength=len(self.vocab[column]))
+        order = np.argsort(-counts, kind="stable")
+        return {self.vocab[column][i]: int(counts[i]) for i in order if counts[i] > 0}
+
+    def group_by(self, column: str, values: np.ndarray, mask: Optional[np.ndarray] = None) -> Dict[str, Dict]:
+        """
+        Aggregate von values pro Label
+
+        === RETURNS ===
+        label → {rows, count, sum, mean, min, max}
+        rows  = Zeilen in der Gruppe
+        count = davon mit Wert (nicht NaN)
+        """
+        codes = self.columns[column]
+        if mask is not None:
+            codes, values = codes[mask], values[mask]
+        size = len(self.vocab[column])
+        rows = np.bincount(codes, minlength=size)
+
+        valid = ~np.isnan(values)
+        vcodes, vvalues = codes[valid], values[valid]
+        count = np.bincount(vcodes, minlength=size)
+        total = np.bincount(vcodes, weights=vvalues, minlength=size)
+        low = np.full(size, np.inf)
+        high = np.full(size, -np.inf)
+        np.minimum.at(low, vcodes, vvalues)
+        np.maximum.at(high, vcodes, vvalues)
+
+        groups = {}
+        for i in np.flatnonzero(rows):
+            n = int(count[i])
+            groups[self.vocab[column][i]] = {
+                "rows": int(rows[i]),
+                "count": n,
+                "sum": float(total[i]),
+                "mean": float(total[i] / n) if n else 0.0,
+                "min": to_py(low[i]) if n else None,
+                "max": to_py(high[i]) if n else None,
+            }
+        return groups
+
+    def top_per_group(self, column: str, other: str, k: int = 5,
+                      mask: Optional[np.ndarray] = None) -> Dict[str, Dict[str, int]]:
+        """Häufigste other-Labels pro column-Label (wie Counter.most_common(k))"""
+        a, b = self.columns[column], self.columns[other]
+        if mask is not None:
+            a, b = a[mask], b[mask]
+        na, nb = len(self.vocab[column]), len(self.vocab[other])
+        matrix = np.bincount(a.astype(np.int64) * nb + b, minlength=na * nb).reshape(na, nb)
+
+        result = {}
+        for i in np.flatnonzero(matrix.sum(axis=1)):
+            row = matrix[i]
+            top = np.argsort(-row, kind="stable")[:k]
+            result[self.vocab[column][i]] = {self.vocab[other][j]: int(row[j]) for j in top if row[j] > 0}
+        return result
+
+
+# ============================================================================
+# SHARED SNAPSHOT - periodisch & inkrementell aus dem ProcessedIndex
+# ============================================================================
+
+class SnapshotStore:
+    """Hält den aktuellen Snapshot und baut ihn bei Index-Änderungen nach"""
+
+    def __init__(self):
+        self._snapshot: Optional[MetricsSnapshot] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> MetricsSnapshot:
+        with self._lock:
+            current = self._snapshot
+            index = get_processed_index()
+            version = index.version
+            if current is None or version != current.version:
+                self._snapshot = self._build(index.entries(), version, current)
+            return self._snapshot
+
+    @staticmethod
+    def _build(entries, version: str, previous: Optional[MetricsSnapshot]) -> MetricsSnapshot:
+        if previous is None:
+            return MetricsSnapshot.from_entries(entries, version=version)
+
+        names = [name for name, _, _ in entries]
+        keep = np.isin(previous["name"], names)
+        known = set(previous["name"][keep].tolist())
+        added = [e for e in entries if e[0] not in known]
+
+        # Gleiche Dateien, trotzdem neue Version → In-Place Update → Vollbuild
+        if not added and keep.all():
+            return MetricsSnapshot.from_entries(entries, version=version)
+
+        kept = previous.take(keep)
+        fresh = MetricsSnapshot.from_entries(added, vocab=previous.vocab, version=version)
+        merged = kept.concat(fresh)
+        # ProcessedIndex liefert nach Dateiname sortiert (= Zeit) - Reihenfolge halten
+        return merged.take(np.argsort(merged["name"], kind="stable"))
+
+
+_store = SnapshotStore()
+
+
+def get_metrics_snapshot() -> MetricsSnapshot:
+    """Aktueller Snapshot über queue/processed/"""
+    return _store.get()
+
+
+if __name__ == "__main__":
+    # python3 -m utils.metrics_snapshot (aus api-core/) → Snapshot bauen & als .npz ablegen
+    start = time.perf_counter()
+    snap = get_metrics_snapshot()
+    print(f"📊 {len(snap)} Jobs in {(time.perf_counter() - start) * 1000:.1f}ms")
+    print(f"   Scores: {int((~np.isnan(snap['score'])).sum())} · Wrapper: {len(snap.value_counts('wrapper'))}")
+    print(f"💾 {snap.save()}")
@@ -0,0 +1,207 @@
+"""
+SYNTX Processed Index - Inkrementeller In-Memory Index über queue/processed/
+
+=== ZWECK ===
+Alle Read-Endpoints brauchen die Metadata aus queue/processed/*.json.
+Statt bei JEDEM Request alle Dateien zu globben und zu json.load'en,
+lädt der Index einmal und aktualisiert sich danach inkrementell.
+
+=== UPDATE STRATEGIE ===
+1. stat() auf das Verzeichnis (1 Syscall)
+2. mtime unverändert → Cache ist aktuell, fertig
+3. mtime geändert → Dateinamen listen (kein json.load!)
+   - neue .json Files → laden
+   - verschwundene .json Files (archiviert) → entfernen
+   - bekannte Files bleiben im Cache
+
+FileHandler.move_to_processed und FieldAnalyzer.archive_processed_jobs
+arbeiten per rename() → Verzeichnis-mtime ändert sich garantiert.
+Wer ein File in-place umschreibt, ruft invalidate(name).
+Prompt-Texte (.txt) werden erst beim ersten entries(with_text=True)
+gelesen und dann ebenfalls gecached.
+
+=== VERWENDUNG ===
+    from utils.processed_index import get_processed_index
+    processed = get_processed_index().all()
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+QUEUE_DIR = Path("/opt/syntx-workflow-api-get-prompts/queue")
+
+
+class ProcessedIndex:
+    """
+    Index über ein Queue-Verzeichnis (processed/ oder archive/)
+
+    === THREAD-SAFETY ===
+    Ein Lock schützt refresh() - sync Handler laufen im Threadpool
+
+    === ENTRIES ===
+    name → metadata
+    name → prompt_text (lazy, nur für evolution_api & Co.)
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._entries: Dict[str, Dict] = {}
+        self._texts: Dict[str, Optional[str]] = {}
+        self._sorted_names: List[str] = []
+        self._dir_mtime_ns: Optional[int] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    # ========================================================================
+    # REFRESH
+    # ========================================================================
+
+    def refresh(self, force: bool = False) -> None:
+        """Synchronisiert den Index mit dem Verzeichnis (nur Deltas)"""
+        with self._lock:
+            try:
+                mtime_ns = self.directory.stat().st_mtime_ns
+            except FileNotFoundError:
+                if self._entries:
+                    self._entries = {}
+                    self._texts = {}
+                    self._sorted_names = []
+                    self._generation += 1
+                self._dir_mtime_ns = None
+                return
+
+            if not force and mtime_ns == self._dir_mtime_ns:
+                return
+
+            with os.scandir(self.directory) as it:
+                names = {e.name for e in it if e.name.endswith('.json')}
+
+            known = set(self._entries) if not force else set()
+            added = names - known
+            removed = set(self._entries) - names
+
+            if force:
+                self._entries = {}
+                self._texts = {}
+            for name in removed:
+                self._entries.pop(name, None)
+                self._texts.pop(name, None)
+            for name in added:
+                entry = self._load_entry(name)
+                if entry is not None:
+                    self._entries[name] = entry
+
+            if added or removed or force:
+                self._sorted_names = sorted(self._entries)
+                self._generation += 1
+
+            self._dir_mtime_ns = mtime_ns
+
+    def invalidate(self, name: str) -> None:
+        """Erzwingt Neuladen eines einzelnen Files (nach In-Place Update)"""
+        with self._lock:
+            if not name.endswith('.json'):
+                name = Path(name).with_suffix('.json').name
+            entry = self._load_entry(name)
+            self._texts.pop(name, None)
+            if entry is None:
+                self._entries.pop(name, None)
+            else:
+                self._entries[name] = entry
+            self._sorted_names = sorted(self._entries)
+            self._generation += 1
+
+    def _load_entry(self, name: str) -> Optional[Dict]:
+        """Lädt Metadata - SAFE"""
+        try:
+            with open(self.directory / name) as f:
+                data = json.load(f)
+        except Exception:
+            return None
+
+        if not data or not isinstance(data, dict):
+            return None
+        return data
+
+    def _load_text(self, name: str) -> Optional[str]:
+        """Lädt den Prompt-Text zum .json - SAFE"""
+        try:
+            with open((self.directory / name).with_suffix('.txt')) as f:
+                return f.read()
+        except Exception:
+            return None
+
+    # ========================================================================
+    # QUERIES
+    # ========================================================================
+
+    def all(self) -> List[Dict]:
+        """Alle Metadata-Dicts, sortiert nach Dateiname (= Zeit)"""
+        self.refresh()
+        entries = self._entries
+        return [entries[n] for n in self._sorted_names if n in entries]
+
+    def entries(self, with_text: bool = False) -> List[Tuple[str, Dict, Optional[str]]]:
+        """
+        Alle (name, metadata, prompt_text) Tupel, sortiert nach Dateiname
+
+        prompt_text ist None wenn with_text=False oder kein .txt existiert
+        """
+        self.refresh()
+        with self._lock:
+            entries = self._entries
+            names = [n for n in self._sorted_names if n in entries]
+            if with_text:
+                texts = self._texts
+                for n in names:
+                    if n not in texts:
+                        texts[n] = self._load_text(n)
+                return [(n, entries[n], texts[n]) for n in names]
+            return [(n, entries[n], None) for n in names]
+
+    def get(self, name: str) -> Optional[Dict]:
+        """Metadata für ein File (mit oder ohne .json Endung)"""
+        self.refresh()
+        if not name.endswith('.json'):
+            name = Path(name).with_suffix('.json').name
+        return self._entries.get(name)
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self._entries)
+
+    @property
+    def version(self) -> str:
+        """Daten-Version - ändert sich bei jedem Add/Remove/Invalidate"""
+        self.refresh()
+        return f"{self._generation}-{len(self._entries)}-{self._dir_mtime_ns or 0}"
+
+
+# ============================================================================
+# SHARED INSTANCES - ein Index pro Verzeichnis und Prozess
+# ============================================================================
+
+_indexes: Dict[str, ProcessedIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(directory: Path) -> ProcessedIndex:
+    """Shared Index für ein beliebiges Queue-Verzeichnis"""
+    key = str(directory)
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = ProcessedIndex(directory)
+        return _indexes[key]
+
+
+def get_processed_index() -> ProcessedIndex:
+    """Shared Index über queue/processed/"""
+    return get_index(QUEUE_DIR / "processed")
+
+
+def get_archive_index() -> ProcessedIndex:
+    """Shared Index über queue/archive/"""
+    return get_index(QUEUE_DIR / "archive")
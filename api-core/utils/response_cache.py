@@ -0,0 +1,195 @@
+"""
+SYNTX Response Cache - ETag / 304 für Read-Heavy Dashboard Endpoints
+
+=== ZWECK ===
+Die Frontend-Dashboards pollen /analytics/*, /prompts/complete-dashboard,
+/evolution/* und /monitoring/live-queue im Sekundentakt. Solange sich
+an den Daten nichts geändert hat, ist das Ergebnis identisch - es wird
+einmal berechnet und bis zur nächsten Daten-Änderung ausgeliefert.
+
+=== KEY ===
+Route + sortierte Query-Params + Daten-Version
+
+Daten-Version = ProcessedIndex.version (processed/) + mtime der
+anderen Queue-Ordner + Größe/mtime von Evolution- und Calibration-Log
+→ nur ein paar stat() Calls pro Request
+
+=== FLOW ===
+1. If-None-Match == aktuelles ETag → 304 (Endpoint läuft gar nicht)
+2. Cache-Hit mit gleicher Version → gespeicherte JSON Bytes
+3. Sonst Endpoint ausführen, 200er JSON cachen, ETag mitschicken
+
+=== TTL ===
+Routen mit zeitabhängigen Werten (live-queue: "age_seconds") bekommen
+zusätzlich eine max. Lebensdauer - auch ohne Daten-Änderung.
+
+=== CONFIG ===
+SYNTX_API_CACHE=false → Middleware reicht alles unverändert durch
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from .processed_index import QUEUE_DIR, get_processed_index
+
+API_CACHE_ENABLED = os.getenv("SYNTX_API_CACHE", "true").lower() == "true"
+API_CACHE_MAX_ENTRIES = 256
+
+# Route-Prefix → TTL in Sekunden (None = nur Daten-Version zählt)
+CACHED_ROUTES: Dict[str, Optional[float]] = {
+    "/analytics/": None,
+    "/prompts/complete-dashboard": None,
+    "/evolution/": None,
+    "/monitoring/live-queue": 5,
+}
+
+# Weitere Datenquellen der gecachten Endpoints
+VERSION_FILES = [
+    QUEUE_DIR / "incoming",
+    QUEUE_DIR / "processing",
+    QUEUE_DIR / "error",
+    QUEUE_DIR / "archive",
+    Path("/opt/syntx-config/logs/evolution.jsonl"),
+    Path("/opt/syntx-workflow-api-get-prompts/logs/evolution.jsonl"),
+    Path("/opt/syntx-config/generator-data/syntex_calibrations.jsonl"),
+]
+
+
+def data_version() -> str:
+    """Aktuelle Daten-Version über alle Quellen der gecachten Endpoints"""
+    parts = [get_processed_index().version]
+    for path in VERSION_FILES:
+        try:
+            stat = path.stat()
+            parts.append(f"{stat.st_mtime_ns}:{stat.st_size}")
+        except OSError:
+            parts.append("-")
+    return "|".join(parts)
+
+
+def route_ttl(path: str) -> Tuple[bool, Optional[float]]:
+    """(gecacht?, TTL) für einen Request-Pfad"""
+    for prefix, ttl in CACHED_ROUTES.items():
+        if path.startswith(prefix):
+            return True, ttl
+    return False, None
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match Header (Liste, "*", W/-Prefix) gegen ein ETag - Weak Comparison, exakt pro Tag"""
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if (tag[2:] if tag.startswith("W/") else tag) == opaque:
+            return True
+    return False
+
+
+class ResponseCache:
+    """
+    LRU über gerenderte JSON-Responses
+
+    === THREAD-SAFETY ===
+    Ein Lock um das OrderedDict (Sync-Endpoints laufen im Threadpool)
+    """
+
+    def __init__(self, max_entries: int = API_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, bytes, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    @staticmethod
+    def make_etag(key: str, version: str, ttl: Optional[float]) -> str:
+        window = f"|{int(time.time() // ttl)}" if ttl else ""
+        digest = hashlib.sha1(f"{key}|{version}{window}".encode("utf-8")).hexdigest()[:20]
+        return f'W/"{digest}"'
+
+    def get(self, key: str, etag: str) -> Optional[Tuple[bytes, str]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != etag:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], entry[2]
+
+    def put(self, key: str, etag: str, body: bytes, media_type: str) -> None:
+        with self._lock:
+            self._entries[key] = (etag, body, media_type)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+            }
+
+
+_cache = ResponseCache()
+
+
+def get_response_cache() -> ResponseCache:
+    return _cache
+
+
+def install_response_cache(app) -> None:
+    """
+    Middleware an die FastAPI App hängen
+
+        app = FastAPI(...)
+        install_response_cache(app)
+    """
+    if not API_CACHE_ENABLED:
+        return
+
+    from starlette.concurrency import run_in_threadpool
+    from starlette.responses import Response
+
+    @app.middleware("http")
+    async def response_cache_middleware(request, call_next):
+        if request.method != "GET":
+            return await call_next(request)
+        cached, ttl = route_ttl(request.url.path)
+        if not cached:
+            return await call_next(request)
+
+        key = request.url.path + "?" + "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        # data_version() macht stat() + ggf. Index-Refresh → nicht im Event-Loop
+        etag = _cache.make_etag(key, await run_in_threadpool(data_version), ttl)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        # 1. Client hat schon den aktuellen Stand
+        if etag_matches(request.headers.get("if-none-match", ""), etag):
+            _cache.not_modified += 1
+            return Response(status_code=304, headers=headers)
+
+        # 2. Server hat schon den aktuellen Stand
+        hit = _cache.get(key, etag)
+        if hit is not None:
+            body, media_type = hit
+            return Response(content=body, media_type=media_type, headers={**headers, "X-Cache": "HIT"})
+
+        # 3. Berechnen
+        response = await call_next(request)
+        media_type = response.headers.get("content-type", "")
+        if response.status_code != 200 or not media_type.startswith("application/json"):
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        _cache.put(key, etag, body, media_type)
+        return Response(content=body, media_type=media_type, headers={**headers, "X-Cache": "MISS"})
@@ -0,0 +1,289 @@
+"""
+SYNTX Batch Producer
+Evolution-Prompts über die OpenAI Batch API (50% Preis, nicht latenzkritisch)
+
+Flow:
+1. Lerne aus processed/ (FieldAnalyzer + PatternLearner, wie EvolutionaryProducer)
+2. Baue JSONL: get_random_topics × Style × create_meta_prompt
+3. Submit über BatchBackend (openai | stub) → Manifest in queue/.batches/
+4. Polle bis die Batch fertig ist
+5. Streame jedes Ergebnis über FileHandler.atomic_write nach incoming/
+
+=== RESUMABLE ===
+Jede eingereichte Batch hat ein Manifest (<batch_id>.json) + eine
+.written Liste (custom_ids die schon in der Queue sind). Ein Cron-Lauf
+mit --no-wait reicht ein und sammelt alles ein, was inzwischen fertig ist
+- auch Batches früherer Läufe. Abgeschlossene Manifeste → .batches/done/
+
+CLI:
+    python3 evolution/batch_producer.py                    # submit + warten
+    python3 evolution/batch_producer.py --no-wait          # Cron-Modus
+    python3 evolution/batch_producer.py --collect          # nur einsammeln
+    python3 evolution/batch_producer.py --stub [out.jsonl] # lokal, ohne API
+"""
+import json
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from evolution.field_analyzer import FieldAnalyzer
+from evolution.pattern_learner import PatternLearner
+from config.config_loader import get_config
+from gpt_generator.batch_api import (
+    BATCH_POLL_SECONDS, TERMINAL_STATUSES, BatchBackend,
+    build_request, get_batch_backend, parse_result, write_requests
+)
+from gpt_generator.topics_database import get_random_topics
+from gpt_generator.prompt_styles import get_all_styles
+from queue_system.config.queue_config import QUEUE_BACKEND, QUEUE_BASE, QUEUE_INCOMING
+from queue_system.core.dedup import get_deduplicator
+from queue_system.core.file_handler import FileHandler
+
+
+class BatchProducer:
+    """Evolution-Prompts als Batch: submit → poll → stream in Queue"""
+
+    def __init__(self, backend: Optional[BatchBackend] = None, state_dir: Optional[Path] = None):
+        self.analyzer = FieldAnalyzer()
+        self.learner = PatternLearner()
+        self.file_handler = FileHandler()
+        self.dedup = get_deduplicator()
+
+        # Settings (gleiche Keys wie EvolutionaryProducer)
+        self.batch_size = get_config('evolution', 'producer', 'generation', 'batch_size', default=20)
+        self.learning_enabled = get_config('evolution', 'producer', 'learning', 'enabled', default=True)
+        self.max_samples = get_config('evolution', 'producer', 'learning', 'max_samples', default=50)
+        self.min_score = get_config('evolution', 'producer', 'learning', 'min_score', default=90)
+        self.max_wait_seconds = get_config('evolution', 'producer', 'batch', 'max_wait_seconds', default=3600)
+
+        self.state_dir = Path(state_dir) if state_dir else QUEUE_BASE / ".batches"
+        self.backend = backend or get_batch_backend(
+            get_config('evolution', 'producer', 'batch', 'backend', default='openai'),
+            root=self.state_dir / "stub"
+        )
+
+        # Queue Backend - None = FileHandler.atomic_write nach incoming/
+        QUEUE_INCOMING.mkdir(parents=True, exist_ok=True)
+        self.queue_backend = None
+        if QUEUE_BACKEND != "directory":
+            from queue_system.core.queue_backend import get_backend
+            self.queue_backend = get_backend()
+
+    # ========================================================================
+    # SUBMIT
+    # ========================================================================
+
+    def build_jobs(self, count: int) -> List[Dict[str, Any]]:
+        """Topics + Styles (+ Meta-Prompt aus Learning) → Job-Liste mit custom_id"""
+        analysis = None
+        if self.learning_enabled:
+            learned = self.analyzer.get_top_processed_jobs(max_samples=self.max_samples, min_score=self.min_score)
+            if learned:
+                analysis = self.analyzer.analyze_patterns(learned)
+                print(f"   📚 Learning from {len(learned)} jobs (Avg Score {analysis['avg_score']}/100)")
+
+        styles = get_all_styles()
+        jobs = []
+        for i, (category, topic) in enumerate(get_random_topics(count)):
+            if analysis and analysis['sample_count'] > 0:
+                top_styles = list(analysis['styles'].keys())[:3]
+                style = random.choice(top_styles) if top_styles else random.choice(styles)
+                prompt = self.learner.create_meta_prompt(analysis, topic, style)
+            else:
+                style = random.choice(styles)
+                prompt = topic
+            jobs.append({
+                "custom_id": f"job-{i:04d}",
+                "topic": topic,
+                "category": category,
+                "style": style,
+                "prompt": prompt
+            })
+        return jobs
+
+    def submit(self, count: Optional[int] = None) -> Dict[str, Any]:
+        """JSONL bauen + einreichen → Manifest"""
+        jobs = self.build_jobs(count or self.batch_size)
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        jsonl_path = write_requests(
+            [build_request(job['custom_id'], job['prompt'], job['style']) for job in jobs],
+            self.state_dir / f"requests_{stamp}.jsonl"
+        )
+        batch_id = self.backend.submit(jsonl_path)
+
+        manifest = {
+            "batch_id": batch_id,
+            "backend": self.backend.name,
+            "submitted_at": datetime.now().isoformat(),
+            "requests_file": jsonl_path.name,
+            "jobs": {job['custom_id']: job for job in jobs}
+        }
+        with open(self.state_dir / f"{batch_id}.json", 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        print(f"   📤 Submitted {len(jobs)} requests → {batch_id}")
+        return manifest
+
+    # ========================================================================
+    # COLLECT
+    # ========================================================================
+
+    def pending(self) -> List[Dict[str, Any]]:
+        """Manifeste eingereichter, noch nicht eingesammelter Batches"""
+        if not self.state_dir.exists():
+            return []
+        manifests = []
+        for path in sorted(self.state_dir.glob("*.json")):
+            with open(path, encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get("backend") == self.backend.name:
+                manifests.append(manifest)
+        return manifests
+
+    def collect(self, wait: bool = True) -> Dict[str, int]:
+        """
+        Alle offenen Batches pollen, fertige in die Queue streamen
+
+        wait=True → pollt bis Endzustand oder max_wait_seconds
+        """
+        totals = {"batches": 0, "written": 0, "failed": 0, "duplicates": 0, "pending": 0}
+        deadline = time.monotonic() + (self.max_wait_seconds if wait else 0)
+
+        for manifest in self.pending():
+            batch_id = manifest["batch_id"]
+            while True:
+                status = self.backend.status(batch_id)
+                if status["status"] in TERMINAL_STATUSES or time.monotonic() >= deadline:
+                    break
+                print(f"   ⏳ {batch_id}: {status['status']} ({status['completed']}/{status['total']})")
+                time.sleep(min(BATCH_POLL_SECONDS, max(1, deadline - time.monotonic())))
+
+            if status["status"] not in TERMINAL_STATUSES:
+                totals["pending"] += 1
+                continue
+
+            stats = self._stream(manifest)
+            totals["batches"] += 1
+            for key in ("written", "failed", "duplicates"):
+                totals[key] += stats[key]
+            print(f"   📥 {batch_id} ({status['status']}): {stats['written']} written, "
+                  f"{stats['failed']} failed, {stats['duplicates']} duplicates")
+            self._finish(manifest, status["status"], stats)
+
+        return totals
+
+    def _stream(self, manifest: Dict[str, Any]) -> Dict[str, int]:
+        """Output-Zeilen einzeln parsen + schreiben - .written macht es wiederaufnehmbar"""
+        batch_id = manifest["batch_id"]
+        written_path = self.state_dir / f"{batch_id}.written"
+        done = set(written_path.read_text(encoding='utf-8').split()) if written_path.exists() else set()
+        stats = {"written": 0, "failed": 0, "duplicates": 0}
+
+        with open(written_path, 'a', encoding='utf-8') as log:
+            for line in self.backend.results(batch_id):
+                custom_id = line.get("custom_id")
+                job = manifest["jobs"].get(custom_id)
+                if job is None or custom_id in done:
+                    continue
+                result = parse_result(line, style=job['style'])
+                outcome = self._write(job, result, batch_id) if result["success"] else "failed"
+                stats[outcome] += 1
+                log.write(f"{custom_id}\n")
+                log.flush()
+        return stats
+
+    def _write(self, job: Dict[str, Any], result: Dict[str, Any], batch_id: str) -> str:
+        """Ein Ergebnis → Dedup → Queue → "written" | "duplicates" | "failed" """
+        content = result['prompt_generated']
+        metadata = {
+            'topic': job['topic'],
+            'style': job['style'],
+            'language': 'de',
+            'category': job['category'],
+            'gpt_quality': result.get('quality_score'),
+            'gpt_cost': result.get('cost'),
+            'model': result.get('model'),
+            'gpt_user_prompt': job['prompt'],
+            'batch_id': batch_id,
+            'producer_run': datetime.now().isoformat()
+        }
+
+        try:
+            verdict = self.dedup.screen(content, metadata)
+        except Exception as e:
+            print(f"⚠️  Dedup check failed: {e}")
+            verdict = None
+        if verdict is not None and verdict.action == "drop":
+            return "duplicates"
+
+        try:
+            if self.queue_backend is not None:
+                filename = self.queue_backend.enqueue(content=content, metadata=metadata)
+            else:
+                filename = self.file_handler.atomic_write(content, metadata, QUEUE_INCOMING).name
+        except Exception as e:
+            print(f"   ❌ Queue Write Failed: {e}")
+            return "failed"
+
+        if verdict is not None:
+            try:
+                self.dedup.register(filename, verdict, job['topic'])
+            except Exception as e:
+                print(f"⚠️  Dedup register failed: {e}")
+        return "written"
+
+    def _finish(self, manifest: Dict[str, Any], status: str, stats: Dict[str, int]) -> None:
+        """Manifest + .written + Request-JSONL nach done/ (mit Endstatus & Zahlen)"""
+        done_dir = self.state_dir / "done"
+        done_dir.mkdir(exist_ok=True)
+        batch_id = manifest["batch_id"]
+        manifest.update({"status": status, "collected_at": datetime.now().isoformat(), "stats": stats})
+        with open(done_dir / f"{batch_id}.json", 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        (self.state_dir / f"{batch_id}.json").unlink()
+        for path in (self.state_dir / f"{batch_id}.written", self.state_dir / manifest.get("requests_file", "")):
+            if path.is_file():
+                path.rename(done_dir / path.name)
+
+    def run(self, count: Optional[int] = None, wait: bool = True) -> Dict[str, Any]:
+        """Submit + Collect (sammelt auch offene Batches früherer Läufe ein)"""
+        print(f"\n{'='*60}")
+        print(f"📦 SYNTX BATCH PRODUCER ({self.backend.name})")
+        print(f"{'='*60}\n")
+
+        manifest = self.submit(count)
+        totals = self.collect(wait=wait)
+
+        stats = {
+            'batch_id': manifest['batch_id'],
+            'submitted': len(manifest['jobs']),
+            **totals,
+            'timestamp': datetime.now().isoformat()
+        }
+        print(f"\n📊 Written: {stats['written']} · Failed: {stats['failed']} · "
+              f"Duplicates: {stats['duplicates']} · Pending batches: {stats['pending']}\n")
+        return stats
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    backend = None
+    if "--stub" in args:
+        i = args.index("--stub")
+        replay = Path(args[i + 1]) if i + 1 < len(args) and not args[i + 1].startswith("--") else None
+        backend = get_batch_backend("stub", root=QUEUE_BASE / ".batches" / "stub", replay=replay)
+
+    producer = BatchProducer(backend=backend)
+    if "--collect" in args:
+        print(json.dumps(producer.collect(wait="--no-wait" not in args), indent=2))
+    else:
+        stats = producer.run(wait="--no-wait" not in args)
+        print("✅ Batch Producer completed!")
+        print(f"   Queue: {stats['written']} prompts ready for Consumer")
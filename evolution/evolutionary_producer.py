@@ -21,7 +21,7 @@ from config.config_loader import get_config
 
 # Import GPT Generator
 sys.path.insert(0, str(Path(__file__).parent.parent / "gpt_generator"))
-from gpt_generator.syntx_prompt_generator import generate_prompt
+from gpt_generator.parallel_generator import generate_parallel, GPT_CONCURRENCY
 from gpt_generator.topics_database import get_random_topics
 from gpt_generator.prompt_styles import get_all_styles
 
@@ -33,8 +33,8 @@ class EvolutionaryProducer:
     Flow:
     1. Analysiere processed/ Jobs (FieldAnalyzer)
     2. Lerne erfolgreiche Patterns (PatternLearner)
-    3. Generiere optimierte Prompts (GPT-4 mit Meta-Prompts)
-    4. Schreibe in queue/incoming/ (QueueWriter)
+    3. Generiere optimierte Prompts (GPT-4 mit Meta-Prompts, parallel)
+    4. Schreibe jedes Ergebnis sofort in queue/incoming/ (QueueWriter)
     5. Archiviere gelernte Jobs
     6. Logge Evolution
     """
@@ -51,6 +51,7 @@ class EvolutionaryProducer:
         self.max_samples = get_config('evolution', 'producer', 'learning', 'max_samples', default=50)
         self.min_score = get_config('evolution', 'producer', 'learning', 'min_score', default=90)
         self.archive_after_read = get_config('evolution', 'producer', 'learning', 'archive_after_read', default=True)
+        self.concurrency = get_config('evolution', 'producer', 'generation', 'concurrency', default=GPT_CONCURRENCY)
         
         self.generation = self._get_current_generation()
     
@@ -108,63 +109,61 @@ class EvolutionaryProducer:
                 print(f"   ℹ️  No jobs with score >= {self.min_score} found")
                 print(f"   ℹ️  Generation {self.generation} will explore without learning\n")
         
-        # PHASE 2: GENERATION
-        print(f"🎨 PHASE 2: GENERATING {self.batch_size} OPTIMIZED PROMPTS")
+        # PHASE 2+3: GENERATION → QUEUE (parallel, jedes Ergebnis sofort geschrieben)
+        print(f"🎨 PHASE 2: GENERATING {self.batch_size} OPTIMIZED PROMPTS ({self.concurrency} parallel)")
         
         # Topics holen
         topics = get_random_topics(self.batch_size)
         styles = get_all_styles()
         
-        results = []
-        successful = 0
-        
-        for i, (category, topic) in enumerate(topics, 1):
+        jobs = []
+        for category, topic in topics:
             # Style wählen (aus Patterns wenn vorhanden)
             if analysis and analysis['sample_count'] > 0:
                 # Nutze erfolgreiche Styles
                 top_styles = list(analysis['styles'].keys())[:3]
                 style = random.choice(top_styles) if top_styles else random.choice(styles)
-            else:
-                style = random.choice(styles)
-            
-            print(f"   [{i}/{self.batch_size}] {category}: {topic} ({style})")
-            
-            # Meta-Prompt erstellen wenn Learning aktiv
-            if analysis and analysis['sample_count'] > 0:
-                meta_prompt = self.learner.create_meta_prompt(analysis, topic, style)
-                # Nutze optimierten Meta-Prompt
-                result = generate_prompt(
-                    prompt=meta_prompt,
-                    style=style,
-                    category=category,
-                    max_tokens=500
-                )
+                # Optimierter Meta-Prompt aus gelernten Patterns
+                prompt = self.learner.create_meta_prompt(analysis, topic, style)
             else:
                 # Normaler Prompt ohne Learning
-                result = generate_prompt(
-                    prompt=topic,
-                    style=style,
-                    category=category,
-                    max_tokens=500
-                )
-            
-            results.append(result)
-            
+                style = random.choice(styles)
+                prompt = topic
+            jobs.append({
+                "prompt": prompt,
+                "style": style,
+                "category": category,
+                "max_tokens": 500,
+                "_topic": topic
+            })
+        
+        write_stats = {'written': 0, 'failed': 0, 'duplicates': 0, 'dropped': 0}
+        done = [0]
+        
+        def write(job: Dict[str, Any], result: Dict[str, Any]) -> None:
+            done[0] += 1
+            print(f"   [{done[0]}/{self.batch_size}] {job['category']}: {job['_topic']} ({job['style']})")
             if result['success']:
-                successful += 1
-                quality = result.get('quality_score', {}).get('total_score', 0)
+                quality = (result.get('quality_score') or {}).get('total_score', 0)
                 print(f"        ✅ Generated (GPT Quality: {quality}/10)")
             else:
                 print(f"        ❌ Failed: {result.get('error', 'Unknown')}")
+            result.setdefault('topic', job['_topic'])
+            batch = self.writer.write_batch([result])
+            for key in write_stats:
+                write_stats[key] += batch[key]
         
-        print()
+        generation = generate_parallel(jobs, on_result=write, concurrency=self.concurrency)
+        successful = generation['successful']
         
-        # PHASE 3: WRITE TO QUEUE
-        print(f"📝 PHASE 3: WRITING {successful} PROMPTS TO QUEUE")
-        write_stats = self.writer.write_batch(results)
+        print()
+        print(f"📝 PHASE 3: WROTE {write_stats['written']} PROMPTS TO QUEUE")
         print(f"   ✅ Written: {write_stats['written']} to queue/incoming/")
         if write_stats['failed'] > 0:
             print(f"   ⚠️  Failed: {write_stats['failed']}")
+        if write_stats['duplicates'] > 0:
+            print(f"   ♻️  Near-duplicates: {write_stats['duplicates']} ({write_stats['dropped']} dropped)")
+        print(f"   ⏱️  {generation['duration_seconds']:.1f}s (rate limited {generation['rate_limited_seconds']}s)")
         print()
         
         # PHASE 4: ARCHIVE
@@ -192,6 +191,7 @@ class EvolutionaryProducer:
             'successful': successful,
             'failed': self.batch_size - successful,
             'written_to_queue': write_stats['written'],
+            'duplicates': write_stats['duplicates'],
             'archived': archived,
             'learning_enabled': self.learning_enabled,
             'timestamp': datetime.now().isoformat()
@@ -202,6 +202,7 @@ class EvolutionaryProducer:
         print(f"   Learned from: {stats['learned_from']} jobs")
         print(f"   Generated: {stats['successful']}/{stats['generated']} successful")
         print(f"   Written to Queue: {stats['written_to_queue']}")
+        print(f"   Duplicates: {stats['duplicates']}")
         print(f"   Archived: {stats['archived']} jobs")
         print(f"{'='*60}\n")
         
@@ -10,6 +10,7 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from config.config_loader import get_config
+from queue_system.core.queue_counters import get_counters
 
 
 class FieldAnalyzer:
@@ -181,6 +182,7 @@ class FieldAnalyzer:
         self.archive_dir.mkdir(exist_ok=True)
         
         archived = 0
+        moved_jobs = 0
         for job in jobs:
             try:
                 file_path = job['file']
@@ -195,6 +197,7 @@ class FieldAnalyzer:
                 if txt_file.exists():
                     archive_txt = self.archive_dir / txt_file.name
                     txt_file.rename(archive_txt)
+                    moved_jobs += 1
                 
                 archived += 1
                 
@@ -202,6 +205,13 @@ class FieldAnalyzer:
                 print(f"⚠️  Archive error {file_path}: {e}")
                 continue
         
+        # Queue-Zähler nachführen (archive/ wird nicht gezählt)
+        if moved_jobs:
+            try:
+                get_counters(self.queue_base).adjust("processed", -moved_jobs)
+            except Exception as e:
+                print(f"⚠️  Queue counter update failed: {e}")
+        
         return archived
 
 
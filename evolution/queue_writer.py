@@ -10,6 +10,9 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from config.config_loader import get_config
+from queue_system.config.queue_config import QUEUE_BACKEND
+from queue_system.core.queue_counters import get_counters
+from queue_system.core.dedup import get_deduplicator
 
 
 class QueueWriter:
@@ -23,6 +26,17 @@ class QueueWriter:
         # Ensure directories exist
         self.incoming_dir.mkdir(parents=True, exist_ok=True)
         self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Queue Backend - None = klassisch direkt in incoming/ schreiben
+        self.backend = None
+        if QUEUE_BACKEND != "directory":
+            from queue_system.core.queue_backend import get_backend
+            self.backend = get_backend()
+        
+        # Near-Duplicate Check (queue/.dedup.db) - gezählt pro Writer-Instanz
+        self.dedup = get_deduplicator(self.queue_base)
+        self.duplicates = 0
+        self.dropped = 0
     
     def write_prompt(self, prompt_result: Dict[str, Any]) -> bool:
         """
@@ -32,11 +46,32 @@ class QueueWriter:
             prompt_result: Output von generate_prompt()
             
         Returns:
-            True wenn erfolgreich
+            True wenn erfolgreich (False auch bei verworfenem Duplikat)
         """
         if not prompt_result.get('success'):
             return False
         
+        content = prompt_result['prompt_generated']
+        metadata = self._build_metadata(prompt_result)
+        
+        # Near-Duplicate? drop → nicht schreiben, flag → Metadata markiert
+        try:
+            verdict = self.dedup.screen(content, metadata)
+        except Exception as e:
+            print(f"⚠️  Dedup check failed: {e}")
+            verdict = None
+        if verdict is not None and verdict.is_duplicate:
+            self.duplicates += 1
+            if verdict.action == "drop":
+                self.dropped += 1
+                return False
+        
+        # Nicht-Directory Backend (z.B. sqlite) → über QueueBackend schreiben
+        if self.backend is not None:
+            filename = self.backend.enqueue(content=content, metadata=metadata)
+            self._register(filename, verdict, prompt_result)
+            return True
+        
         # Filename erstellen
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
         topic = prompt_result.get('category', 'unknown')
@@ -50,22 +85,11 @@ class QueueWriter:
         
         # Write TXT
         with open(txt_file, 'w', encoding='utf-8') as f:
-            f.write(prompt_result['prompt_generated'])
+            f.write(content)
         
         # Write JSON (Metadata)
-        metadata = {
-            'topic': prompt_result.get('category'),
-            'style': prompt_result.get('style'),
-            'language': prompt_result.get('language', 'de'),
-            'category': prompt_result.get('category'),
-            'gpt_quality': prompt_result.get('quality_score'),
-            'gpt_cost': prompt_result.get('cost'),
-            'model': prompt_result.get('model'),
-            'duration_ms': prompt_result.get('duration_ms'),
-            'producer_run': datetime.now().isoformat(),
-            'created_at': datetime.now().isoformat(),
-            'filename': f"{filename}.txt"
-        }
+        metadata['created_at'] = datetime.now().isoformat()
+        metadata['filename'] = f"{filename}.txt"
         
         with open(json_file, 'w', encoding='utf-8') as f:
             json.dump(metadata, f, ensure_ascii=False, indent=2)
@@ -77,25 +101,64 @@ class QueueWriter:
         txt_file.rename(txt_target)
         json_file.rename(json_target)
         
+        # Queue-Zähler nachführen (Fehler → Reconciliation korrigiert)
+        try:
+            get_counters(self.queue_base).adjust("incoming", 1)
+        except Exception as e:
+            print(f"⚠️  Queue counter update failed: {e}")
+        
+        self._register(txt_target.name, verdict, prompt_result)
         return True
     
+    def _register(self, filename: str, verdict, prompt_result: Dict[str, Any]) -> None:
+        """Geschriebenen Prompt in den Dedup-Index aufnehmen"""
+        if verdict is None:
+            return
+        try:
+            # Echtes Topic (wie IntelligentProducer) - nicht die Kategorie
+            self.dedup.register(filename, verdict, prompt_result.get('topic'))
+        except Exception as e:
+            print(f"⚠️  Dedup register failed: {e}")
+    
+    def _build_metadata(self, prompt_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Job-Metadata aus generate_prompt() Output"""
+        return {
+            'topic': prompt_result.get('category'),
+            'style': prompt_result.get('style'),
+            'language': prompt_result.get('language', 'de'),
+            'category': prompt_result.get('category'),
+            'gpt_quality': prompt_result.get('quality_score'),
+            'gpt_cost': prompt_result.get('cost'),
+            'model': prompt_result.get('model'),
+            'duration_ms': prompt_result.get('duration_ms'),
+            'producer_run': datetime.now().isoformat()
+        }
+    
     def write_batch(self, results: list) -> Dict[str, int]:
         """
         Schreibt einen Batch von Prompts
         
         Returns:
-            {'written': N, 'failed': M}
+            {'written': N, 'failed': M, 'duplicates': D, 'dropped': X}
+            (verworfene Duplikate zählen nicht als failed)
         """
         written = 0
         failed = 0
+        duplicates_before, dropped_before = self.duplicates, self.dropped
         
         for result in results:
+            dropped = self.dropped
             if self.write_prompt(result):
                 written += 1
-            else:
+            elif self.dropped == dropped:
                 failed += 1
         
-        return {'written': written, 'failed': failed}
+        return {
+            'written': written,
+            'failed': failed,
+            'duplicates': self.duplicates - duplicates_before,
+            'dropped': self.dropped - dropped_before
+        }
 
 
 if __name__ == "__main__":
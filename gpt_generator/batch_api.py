@@ -0,0 +1,283 @@
+"""
+OpenAI Batch API - Prompt-Generierung zum halben Preis, asynchron
+
+=== ZWECK ===
+Der Evolution-Cron (alle 2h) braucht seine Prompts nicht in Sekunden.
+Die Batch API nimmt ein JSONL mit Chat-Requests, liefert innerhalb von
+24h (meist Minuten) und kostet 50% der synchronen Completions.
+
+=== ABLAUF ===
+1. build_request() pro Prompt → JSONL (gleiche Messages wie generate_prompt)
+2. backend.submit(jsonl) → batch_id
+3. backend.status(batch_id) pollen bis completed/failed/expired/cancelled
+4. backend.results(batch_id) → Output-Zeilen, parse_result() → gleiches
+   Dict wie generate_prompt() (success, prompt_generated, quality_score, cost)
+
+=== BACKENDS ===
+OpenAIBatchBackend   echte Batch API (Files + Batches Endpoint)
+StubBatchBackend     lokal, ohne Netz: spielt ein Output-JSONL ab
+                     (oder erzeugt Dummy-Antworten) - für Tests & Dry-Runs
+
+=== CONFIG ===
+SYNTX_BATCH_POLL_SECONDS   Poll-Intervall (default 60)
+"""
+import json
+import os
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from .cost_tracker import calculate_cost, save_cost_log
+from .prompt_scorer import score_prompt
+from .prompt_styles import apply_style
+
+BATCH_MODEL = "gpt-4o"
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_COMPLETION_WINDOW = "24h"
+BATCH_DISCOUNT = 0.5  # Batch API = 50% der synchronen Preise
+BATCH_POLL_SECONDS = int(os.getenv("SYNTX_BATCH_POLL_SECONDS", "60"))
+
+# Endzustände einer Batch (OpenAI Batch.status)
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def build_request(
+    custom_id: str,
+    prompt: str,
+    style: Optional[str] = None,
+    temperature: float = 0.7,
+    top_p: float = 1.0,
+    max_tokens: int = 500,
+    model: str = BATCH_MODEL
+) -> Dict[str, Any]:
+    """Eine JSONL-Zeile - Style-Prefix wie in generate_prompt()"""
+    content = apply_style(prompt, style) if style else prompt
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": BATCH_ENDPOINT,
+        "body": {
+            "model": model,
+            "messages": [{"role": "user", "content": content}],
+            "temperature": temperature,
+            "top_p": top_p,
+            "max_tokens": max_tokens
+        }
+    }
+
+
+def write_requests(requests: List[Dict[str, Any]], path: Path) -> Path:
+    """Requests als JSONL schreiben (Input für submit)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for request in requests:
+            f.write(json.dumps(request, ensure_ascii=False) + "\n")
+    return path
+
+
+def parse_result(line: Dict[str, Any], log_cost: bool = True, style: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Eine Output-Zeile → Result-Dict wie generate_prompt()
+
+    Kosten mit BATCH_DISCOUNT, landen (log_cost=True) in logs/costs.jsonl
+    - style aus dem Job (steht nicht in der Output-Zeile) → by_style im Ledger
+    """
+    from .syntx_prompt_generator import is_refusal
+
+    result = {
+        "custom_id": line.get("custom_id"),
+        "success": False,
+        "prompt_generated": None,
+        "error": None,
+        "model": BATCH_MODEL,
+        "quality_score": None,
+        "cost": None,
+        "batch": True
+    }
+
+    response = line.get("response") or {}
+    if line.get("error") or response.get("status_code") != 200:
+        error = line.get("error") or (response.get("body") or {}).get("error") or {}
+        result["error"] = f"Batch error: {error.get('message', error) if isinstance(error, dict) else error}"
+        return result
+
+    body = response.get("body") or {}
+    choice = (body.get("choices") or [{}])[0]
+    text = (choice.get("message") or {}).get("content")
+    result["model"] = body.get("model", BATCH_MODEL)
+
+    usage = body.get("usage") or {}
+    cost = calculate_cost(usage, BATCH_MODEL)
+    for key in ("input_cost", "output_cost", "total_cost"):
+        if key in cost:
+            cost[key] = round(cost[key] * BATCH_DISCOUNT, 6)
+    cost["batch"] = True
+    if log_cost:
+        save_cost_log(cost, style=style)
+    result["cost"] = cost
+
+    if not text:
+        result["error"] = "Empty batch response"
+        return result
+
+    result["prompt_generated"] = text
+    result["quality_score"] = score_prompt(text)
+    if choice.get("finish_reason") == "content_filter" or is_refusal(text):
+        result["error"] = "Refusal detected"
+        return result
+
+    result["success"] = True
+    return result
+
+
+# ============================================================================
+# BACKENDS
+# ============================================================================
+
+class BatchBackend(ABC):
+    """Interface - submit / status / results"""
+
+    name = "abstract"
+
+    @abstractmethod
+    def submit(self, jsonl_path: Path) -> str:
+        """JSONL hochladen + Batch starten → batch_id"""
+
+    @abstractmethod
+    def status(self, batch_id: str) -> Dict[str, Any]:
+        """{"status": ..., "completed": n, "failed": n, "total": n}"""
+
+    @abstractmethod
+    def results(self, batch_id: str) -> Iterator[Dict[str, Any]]:
+        """Output-Zeilen (auch Fehlerzeilen) - erst nach Endzustand sinnvoll"""
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """Echte Batch API über den geteilten OpenAI Client"""
+
+    name = "openai"
+
+    def __init__(self, client=None):
+        if client is None:
+            from .openai_client import get_openai_client
+            client = get_openai_client()
+        self.client = client
+
+    def submit(self, jsonl_path: Path) -> str:
+        with open(jsonl_path, "rb") as f:
+            upload = self.client.files.create(file=f, purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=upload.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=BATCH_COMPLETION_WINDOW
+        )
+        return batch.id
+
+    def status(self, batch_id: str) -> Dict[str, Any]:
+        batch = self.client.batches.retrieve(batch_id)
+        counts = batch.request_counts
+        return {
+            "status": batch.status,
+            "completed": counts.completed if counts else 0,
+            "failed": counts.failed if counts else 0,
+            "total": counts.total if counts else 0
+        }
+
+    def results(self, batch_id: str) -> Iterator[Dict[str, Any]]:
+        batch = self.client.batches.retrieve(batch_id)
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for raw in self.client.files.content(file_id).text.splitlines():
+                if raw.strip():
+                    yield json.loads(raw)
+
+
+class StubBatchBackend(BatchBackend):
+    """
+    Lokale Batch ohne Netz
+
+    === REPLAY ===
+    replay: Output-JSONL (Format wie die Batch API) - Zeilen werden per
+    custom_id zugeordnet, übrige Requests bekommen die Zeilen der Reihe
+    nach (custom_id umgeschrieben). Ohne replay → Dummy-Antwort pro Request.
+
+    polls: so viele status()-Aufrufe bleibt die Batch "in_progress"
+    """
+
+    name = "stub"
+
+    def __init__(self, root: Path, replay: Optional[Path] = None, polls: int = 0):
+        self.root = Path(root)
+        self.replay = Path(replay) if replay else None
+        self.polls = polls
+        self._polled: Dict[str, int] = {}
+
+    def _input(self, batch_id: str) -> Path:
+        return self.root / f"{batch_id}.input.jsonl"
+
+    def submit(self, jsonl_path: Path) -> str:
+        batch_id = f"stub_batch_{uuid.uuid4().hex[:12]}"
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._input(batch_id).write_bytes(Path(jsonl_path).read_bytes())
+        return batch_id
+
+    def status(self, batch_id: str) -> Dict[str, Any]:
+        if not self._input(batch_id).exists():
+            return {"status": "failed", "completed": 0, "failed": 0, "total": 0}
+        with open(self._input(batch_id), encoding="utf-8") as f:
+            total = sum(1 for raw in f if raw.strip())
+        self._polled[batch_id] = self._polled.get(batch_id, 0) + 1
+        if self._polled[batch_id] <= self.polls:
+            return {"status": "in_progress", "completed": 0, "failed": 0, "total": total}
+        return {"status": "completed", "completed": total, "failed": 0, "total": total}
+
+    def results(self, batch_id: str) -> Iterator[Dict[str, Any]]:
+        with open(self._input(batch_id), encoding="utf-8") as f:
+            requests = [json.loads(raw) for raw in f if raw.strip()]
+
+        canned: List[Dict[str, Any]] = []
+        if self.replay is not None:
+            with open(self.replay, encoding="utf-8") as f:
+                canned = [json.loads(raw) for raw in f if raw.strip()]
+        by_id = {line.get("custom_id"): line for line in canned}
+
+        for i, request in enumerate(requests):
+            custom_id = request["custom_id"]
+            if custom_id in by_id:
+                yield by_id[custom_id]
+            elif canned:
+                yield {**canned[i % len(canned)], "custom_id": custom_id}
+            else:
+                yield self._dummy(request)
+
+    @staticmethod
+    def _dummy(request: Dict[str, Any]) -> Dict[str, Any]:
+        content = request["body"]["messages"][-1]["content"]
+        text = f"[stub] Meta-Prompt: {content[:200]}"
+        return {
+            "id": f"batch_req_{uuid.uuid4().hex[:12]}",
+            "custom_id": request["custom_id"],
+            "response": {
+                "status_code": 200,
+                "body": {
+                    "model": request["body"].get("model", BATCH_MODEL),
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": text}}],
+                    "usage": {"prompt_tokens": len(content) // 4, "completion_tokens": len(text) // 4,
+                              "total_tokens": (len(content) + len(text)) // 4}
+                }
+            },
+            "error": None
+        }
+
+
+def get_batch_backend(name: str = "openai", root: Optional[Path] = None,
+                      replay: Optional[Path] = None) -> BatchBackend:
+    """Backend nach Name - "stub" braucht root (Ablage der Input-Files)"""
+    if name == "stub":
+        return StubBatchBackend(root or Path("./logs/batch_stub"), replay=replay)
+    if name == "openai":
+        return OpenAIBatchBackend()
+    raise ValueError(f"Unknown batch backend: {name}")
@@ -1,10 +1,29 @@
 """
 OpenAI API Cost Tracking
 Berechnet und tracked Kosten für API-Calls
+
+=== LEDGER ===
+logs/costs.jsonl          Rohdaten, eine Zeile pro Call (append-only)
+logs/costs_summary.json   laufende Summen pro Tag (+ Model, Style) und gesamt
+
+save_cost_log() hängt an und faltet neue Zeilen in die Summary (Byte-Offset
+merkt sich, was schon gezählt ist). get_total_costs() liest nur die Summary:
+gesamt O(1), days=N summiert N Tages-Buckets - kein Scan der JSONL.
+Summary fehlt/kaputt oder JSONL kürzer als Offset → rebuild_ledger()
+baut aus den Rohdaten neu auf.
 """
 import json
+import os
+import sys
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, date, timedelta
+
+try:
+    import fcntl
+except ImportError:  # Nicht-POSIX: ohne File-Lock
+    fcntl = None
+
+COST_LOG_DIR = Path(os.getenv("SYNTX_COST_LOG_DIR", "./logs"))
 
 
 # OpenAI Pricing (Stand Nov 2025, in USD)
@@ -29,6 +48,7 @@ def calculate_cost(usage: dict, model: str = "gpt-4o") -> dict:
     """
     if model not in PRICING:
         return {
+            "model": model,
             "input_cost": 0.0,
             "output_cost": 0.0,
             "total_cost": 0.0,
@@ -43,6 +63,7 @@ def calculate_cost(usage: dict, model: str = "gpt-4o") -> dict:
     total_cost = input_cost + output_cost
     
     return {
+        "model": model,
         "input_tokens": input_tokens,
         "output_tokens": output_tokens,
         "input_cost": round(input_cost, 6),
@@ -52,9 +73,9 @@ def calculate_cost(usage: dict, model: str = "gpt-4o") -> dict:
     }
 
 
-def save_cost_log(cost_data: dict) -> None:
-    """Speichert Cost-Log in separate Datei."""
-    log_dir = Path("./logs")
+def save_cost_log(cost_data: dict, style: str = None, log_dir: Path = None) -> None:
+    """Speichert Cost-Log in separate Datei und führt die Ledger-Summary nach."""
+    log_dir = Path(log_dir or COST_LOG_DIR)
     log_dir.mkdir(exist_ok=True)
     
     cost_file = log_dir / "costs.jsonl"
@@ -63,55 +84,268 @@ def save_cost_log(cost_data: dict) -> None:
         "timestamp": datetime.now().isoformat(),
         **cost_data
     }
+    if style:
+        log_entry["style"] = style
     
     with open(cost_file, "a", encoding="utf-8") as f:
         f.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
+    
+    # Summary-Fehler dürfen nie einen Call abbrechen - nächster Sync holt nach
+    try:
+        CostLedger(log_dir).sync()
+    except Exception as e:
+        print(f"⚠️  Cost ledger update failed: {e}")
 
 
-def get_total_costs(days: int = None) -> dict:
+def save_cache_hit(cost_data: dict, style: str = None) -> dict:
     """
-    Berechnet Gesamt-Kosten aus Cost-Logs.
+    Cache-Hit loggen: kein API Call, total_cost 0, saved_cost = was der Call gekostet hätte.
+    Landet in costs.jsonl, zählt aber nicht als Request (siehe get_total_costs).
     
-    Args:
-        days: Nur Kosten der letzten N Tage (None = alle)
-        
     Returns:
-        dict mit Gesamt-Statistiken
+        Der geloggte Cost-Eintrag (für das Result von generate_prompt)
     """
-    log_dir = Path("./logs")
-    cost_file = log_dir / "costs.jsonl"
+    entry = {
+        "model": cost_data.get("model", "gpt-4o"),
+        "input_tokens": cost_data.get("input_tokens", 0),
+        "output_tokens": cost_data.get("output_tokens", 0),
+        "input_cost": 0.0,
+        "output_cost": 0.0,
+        "total_cost": 0.0,
+        "currency": "USD",
+        "cache_hit": True,
+        "saved_cost": cost_data.get("total_cost", 0.0)
+    }
+    save_cost_log(entry, style=style)
+    return entry
+
+
+# ============================================================================
+# LEDGER
+# ============================================================================
+
+def _empty_bucket() -> dict:
+    return {
+        "cost": 0.0, "requests": 0, "input_tokens": 0, "output_tokens": 0,
+        "cache_hits": 0, "cache_misses": 0, "saved_cost": 0.0,
+        "models": {}, "styles": {}
+    }
+
+
+def _fold(bucket: dict, entry: dict) -> None:
+    """Einen costs.jsonl Eintrag in einen Bucket einrechnen"""
+    if entry.get("cache_hit"):
+        bucket["cache_hits"] += 1
+        bucket["saved_cost"] += entry.get("saved_cost", 0.0)
+        return
     
-    if not cost_file.exists():
-        return {
-            "total_cost": 0.0,
-            "total_requests": 0,
-            "avg_cost_per_request": 0.0,
-            "currency": "USD"
-        }
+    cost = entry.get("total_cost", 0.0)
+    bucket["cost"] += cost
+    bucket["requests"] += 1
+    bucket["input_tokens"] += entry.get("input_tokens", 0)
+    bucket["output_tokens"] += entry.get("output_tokens", 0)
+    if entry.get("cache_miss"):
+        bucket["cache_misses"] += 1
+    
+    # Alte Einträge ohne model: bis dahin war gpt-4o das einzige Model
+    for group, key in (("models", entry.get("model", "gpt-4o")), ("styles", entry.get("style") or "unknown")):
+        slot = bucket[group].setdefault(key, {"cost": 0.0, "requests": 0})
+        slot["cost"] += cost
+        slot["requests"] += 1
+
+
+def _merge_bucket(target: dict, bucket: dict) -> None:
+    for key in ("cost", "requests", "input_tokens", "output_tokens", "cache_hits", "cache_misses", "saved_cost"):
+        target[key] += bucket[key]
+    for group in ("models", "styles"):
+        for key, slot in bucket[group].items():
+            dest = target[group].setdefault(key, {"cost": 0.0, "requests": 0})
+            dest["cost"] += slot["cost"]
+            dest["requests"] += slot["requests"]
+
+
+class CostLedger:
+    """
+    Laufende Kosten-Summen über logs/costs.jsonl
+    
+    === SUMMARY (costs_summary.json) ===
+    offset  Bytes der JSONL, die schon eingerechnet sind
+    totals  Bucket über alles
+    days    {"YYYY-MM-DD": Bucket}
+    Bucket = cost, requests, tokens, cache_hits/misses, saved_cost,
+             models {name: {cost, requests}}, styles {name: {cost, requests}}
+    
+    === PROZESSE ===
+    Producer, Consumer und API schreiben parallel - sync() läuft unter
+    flock (costs_summary.lock) und liest nur vollständige Zeilen.
+    Leser (API GET) nehmen peek(): kein Lock, kein Schreiben - der Rest
+    der JSONL seit offset wird nur im Speicher eingerechnet.
+    """
     
-    total_cost = 0.0
-    total_requests = 0
+    def __init__(self, log_dir: Path = None):
+        self.log_dir = Path(log_dir or COST_LOG_DIR)
+        self.cost_file = self.log_dir / "costs.jsonl"
+        self.summary_file = self.log_dir / "costs_summary.json"
+        self.lock_file = self.log_dir / "costs_summary.lock"
     
-    with open(cost_file, "r", encoding="utf-8") as f:
-        for line in f:
+    def _locked(self):
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        handle = open(self.lock_file, "a")
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        return handle
+    
+    def _load(self) -> dict:
+        try:
+            with open(self.summary_file, "r", encoding="utf-8") as f:
+                summary = json.load(f)
+            if summary.get("version") == 1:
+                return summary
+        except (OSError, ValueError):
+            pass
+        return {"version": 1, "offset": 0, "totals": _empty_bucket(), "days": {}}
+    
+    def _save(self, summary: dict) -> None:
+        tmp = self.summary_file.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, self.summary_file)
+    
+    def _catch_up(self, summary: dict) -> bool:
+        """Neue vollständige Zeilen ab offset einrechnen → True wenn etwas neu war"""
+        if not self.cost_file.exists():
+            return False
+        size = self.cost_file.stat().st_size
+        if size < summary["offset"]:
+            # JSONL rotiert/gekürzt → von vorne
+            summary.update({"offset": 0, "totals": _empty_bucket(), "days": {}})
+        if size == summary["offset"]:
+            return False
+        
+        with open(self.cost_file, "rb") as f:
+            f.seek(summary["offset"])
+            chunk = f.read(size - summary["offset"])
+        end = chunk.rfind(b"\n") + 1
+        if end == 0:
+            return False
+        
+        for raw in chunk[:end].splitlines():
             try:
-                entry = json.loads(line)
-                total_cost += entry.get("total_cost", 0.0)
-                total_requests += 1
-            except:
+                entry = json.loads(raw)
+            except ValueError:
                 continue
+            day = str(entry.get("timestamp", ""))[:10] or "unknown"
+            _fold(summary["totals"], entry)
+            _fold(summary["days"].setdefault(day, _empty_bucket()), entry)
+        summary["offset"] += end
+        return True
+    
+    def sync(self) -> dict:
+        """Summary auf Stand der JSONL bringen → Summary"""
+        with self._locked():
+            summary = self._load()
+            if self._catch_up(summary):
+                self._save(summary)
+            return summary
+    
+    def peek(self) -> dict:
+        """Summary + ungesyncter JSONL-Rest, read-only (LOGS_DIR darf read-only sein)"""
+        summary = self._load()
+        try:
+            self._catch_up(summary)
+        except OSError:
+            pass
+        return summary
+    
+    def rebuild(self) -> dict:
+        """Summary komplett aus costs.jsonl neu aufbauen"""
+        with self._locked():
+            summary = {"version": 1, "offset": 0, "totals": _empty_bucket(), "days": {}}
+            self._catch_up(summary)
+            self._save(summary)
+            return summary
     
+    def totals(self, days: int = None, read_only: bool = False) -> dict:
+        """Bucket über alles (O(1)) oder die letzten days Kalendertage (inkl. heute)"""
+        summary = self.peek() if read_only else self.sync()
+        if days is None:
+            return summary["totals"]
+        cutoff = (date.today() - timedelta(days=max(days, 1) - 1)).isoformat()
+        bucket = _empty_bucket()
+        for day, day_bucket in summary["days"].items():
+            if day >= cutoff:
+                _merge_bucket(bucket, day_bucket)
+        return bucket
+    
+    def by_day(self, days: int = None, read_only: bool = False) -> dict:
+        """{tag: {cost, requests}} aufsteigend"""
+        summary = self.peek() if read_only else self.sync()
+        cutoff = (date.today() - timedelta(days=max(days, 1) - 1)).isoformat() if days else ""
+        return {
+            day: {"cost": round(b["cost"], 4), "requests": b["requests"]}
+            for day, b in sorted(summary["days"].items()) if day >= cutoff
+        }
+
+
+def rebuild_ledger(log_dir: Path = None) -> dict:
+    """Summary aus der rohen costs.jsonl neu aufbauen"""
+    return CostLedger(log_dir).rebuild()
+
+
+def get_total_costs(days: int = None, log_dir: Path = None, read_only: bool = False) -> dict:
+    """
+    Gesamt-Kosten aus der Ledger-Summary (kein Scan der costs.jsonl).
+    
+    Args:
+        days: Nur Kosten der letzten N Tage inkl. heute (None = alle)
+        log_dir: Verzeichnis mit costs.jsonl (default SYNTX_COST_LOG_DIR / ./logs)
+        read_only: Summary nur lesen, nichts anlegen/nachführen (API Endpoints)
+        
+    Returns:
+        dict mit Gesamt-Statistiken
+    """
+    bucket = CostLedger(log_dir).totals(days, read_only=read_only)
+    
+    total_cost = bucket["cost"]
+    total_requests = bucket["requests"]
+    cache_hits = bucket["cache_hits"]
+    cache_misses = bucket["cache_misses"]
     avg_cost = total_cost / total_requests if total_requests > 0 else 0.0
     
+    def rounded(group: dict) -> dict:
+        return {
+            key: {"cost": round(slot["cost"], 4), "requests": slot["requests"]}
+            for key, slot in sorted(group.items(), key=lambda item: -item[1]["cost"])
+        }
+    
     return {
         "total_cost": round(total_cost, 4),
         "total_requests": total_requests,
         "avg_cost_per_request": round(avg_cost, 6),
-        "currency": "USD"
+        "currency": "USD",
+        "days": days,
+        "total_tokens": {"input": bucket["input_tokens"], "output": bucket["output_tokens"]},
+        "by_model": rounded(bucket["models"]),
+        "by_style": rounded(bucket["styles"]),
+        "cache": {
+            "hits": cache_hits,
+            "misses": cache_misses,
+            "hit_rate": round(cache_hits / (cache_hits + cache_misses), 4) if cache_hits + cache_misses else 0.0,
+            "saved_cost": round(bucket["saved_cost"], 4)
+        }
     }
 
 
 if __name__ == "__main__":
+    # Ledger CLI: --rebuild | --days N
+    if "--rebuild" in sys.argv or "--days" in sys.argv:
+        if "--rebuild" in sys.argv:
+            summary = rebuild_ledger()
+            print(f"✅ Ledger rebuilt: {summary['totals']['requests']} requests, {len(summary['days'])} days")
+        days = int(sys.argv[sys.argv.index("--days") + 1]) if "--days" in sys.argv else None
+        print(json.dumps(get_total_costs(days), indent=2))
+        sys.exit(0)
+    
     # Test
     test_usage = {
         "prompt_tokens": 50,
@@ -0,0 +1,171 @@
+"""
+GPT Generation Cache - gleiche Inputs → gespeicherte Antwort statt neuem API Call
+
+=== ZWECK ===
+Producer-Neustart nach Crash oder /strom/dispatch mit gleichem Topic+Style
+zahlt sonst gpt-4o nochmal für Inputs, die gerade erst generiert wurden.
+
+=== KEY ===
+sha256 über (model, messages, temperature, top_p, max_tokens, variant)
+variant unterscheidet mehrere gewollt verschiedene Antworten auf dieselben
+Inputs (z.B. strom_anzahl > 1 → variant 0..n-1).
+
+=== SPEICHER ===
+SQLite (WAL) entries(key, created, last_used, size, response)
+response = {"text", "finish_reason", "usage"} - nur erfolgreiche,
+nicht abgelehnte Antworten werden gespeichert.
+
+=== EVICTION ===
+TTL: ältere Einträge sind ein Miss (und werden gelöscht)
+Größe: über SYNTX_GPT_CACHE_MAX_MB → least recently used raus bis 90%
+
+=== CONFIG ===
+SYNTX_GPT_CACHE          "true" → generate_prompt nutzt den Cache (default aus)
+SYNTX_GPT_CACHE_DB       SQLite File (default ./logs/gpt_cache.db)
+SYNTX_GPT_CACHE_TTL      Sekunden (default 86400)
+SYNTX_GPT_CACHE_MAX_MB   Größenlimit (default 50)
+
+Hits + gesparte Dollar → cost_tracker (logs/costs.jsonl, get_total_costs)
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+GPT_CACHE_ENABLED = os.getenv("SYNTX_GPT_CACHE", "false").lower() == "true"
+GPT_CACHE_DB = Path(os.getenv("SYNTX_GPT_CACHE_DB", "./logs/gpt_cache.db"))
+GPT_CACHE_TTL = int(os.getenv("SYNTX_GPT_CACHE_TTL", "86400"))
+GPT_CACHE_MAX_BYTES = int(float(os.getenv("SYNTX_GPT_CACHE_MAX_MB", "50")) * 1024 * 1024)
+
+
+def cache_key(model: str, messages: List[Dict[str, str]], temperature: float, top_p: float,
+              max_tokens: int, variant: int = 0) -> str:
+    """Deterministischer Key - JSON mit sortierten Keys, Floats normalisiert"""
+    payload = json.dumps({
+        "model": model,
+        "messages": messages,
+        "temperature": round(float(temperature), 4),
+        "top_p": round(float(top_p), 4),
+        "max_tokens": int(max_tokens),
+        "variant": int(variant)
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class GenerationCache:
+    """
+    On-Disk Response Cache
+
+    === THREAD-SAFETY ===
+    Eine SQLite Connection pro Thread (generate_parallel ruft aus mehreren)
+    """
+
+    def __init__(self, db_path: Path = GPT_CACHE_DB, ttl: int = GPT_CACHE_TTL,
+                 max_bytes: int = GPT_CACHE_MAX_BYTES):
+        self.db_path = Path(db_path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    created REAL NOT NULL,
+                    last_used REAL NOT NULL,
+                    size INTEGER NOT NULL,
+                    response TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+            """)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Gespeicherte Antwort oder None (abgelaufen → gelöscht)"""
+        conn = self._connect()
+        row = conn.execute("SELECT created, response FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        if now - row[0] > self.ttl:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            return None
+        conn.execute("UPDATE entries SET last_used = ? WHERE key = ?", (now, key))
+        return json.loads(row[1])
+
+    def put(self, key: str, text: str, finish_reason: Optional[str], usage: Dict[str, int]) -> None:
+        response = json.dumps({"text": text, "finish_reason": finish_reason, "usage": usage}, ensure_ascii=False)
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO entries (key, created, last_used, size, response) VALUES (?, ?, ?, ?, ?)",
+            (key, now, now, len(response.encode("utf-8")), response)
+        )
+        self.evict()
+
+    def evict(self) -> int:
+        """Abgelaufene raus, dann LRU bis unter 90% von max_bytes → Anzahl gelöscht"""
+        conn = self._connect()
+        removed = conn.execute("DELETE FROM entries WHERE created < ?", (time.time() - self.ttl,)).rowcount
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return removed
+
+        target = total - int(self.max_bytes * 0.9)
+        doomed, freed = [], 0
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY last_used"):
+            doomed.append((key,))
+            freed += size
+            if freed >= target:
+                break
+        conn.executemany("DELETE FROM entries WHERE key = ?", doomed)
+        return removed + len(doomed)
+
+    def stats(self) -> Dict[str, Any]:
+        entries, size = self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        return {
+            "entries": entries,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl
+        }
+
+    def clear(self) -> None:
+        self._connect().execute("DELETE FROM entries")
+
+
+_cache: Optional[GenerationCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_generation_cache() -> GenerationCache:
+    """Shared Cache pro Prozess"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = GenerationCache()
+        return _cache
+
+
+# === MAIN BLOCK ===
+if __name__ == "__main__":
+    import sys
+
+    cache = get_generation_cache()
+    if "--clear" in sys.argv:
+        cache.clear()
+        print("🧹 Cache geleert")
+    print(json.dumps({"enabled": GPT_CACHE_ENABLED, "db": str(cache.db_path), **cache.stats()}, indent=2))
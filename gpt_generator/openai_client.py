@@ -0,0 +1,109 @@
+"""
+OpenAI Client Factory - ein Client + Connection Pool pro Prozess
+
+=== ZWECK ===
+OpenAI() pro Request = neuer httpx Pool = neuer TCP + TLS Handshake
+(~100-300 ms pro Prompt). Der geteilte Client hält die Verbindungen
+offen (Keep-Alive) - generate_prompt, generate_parallel und der
+MultilingualProducer nutzen alle denselben Pool. httpx.Client ist
+thread-safe → auch für parallele Generierung geeignet.
+
+=== CONFIG ===
+SYNTX_OPENAI_TIMEOUT            Request Timeout in Sekunden (default 45)
+SYNTX_OPENAI_MAX_CONNECTIONS    max. offene Verbindungen (default 20)
+SYNTX_OPENAI_KEEPALIVE          davon max. idle gehalten (default 10)
+SYNTX_OPENAI_KEEPALIVE_EXPIRY   idle Verbindung schließen nach N Sekunden (default 60)
+
+=== VERWENDUNG ===
+    client = get_openai_client()
+    client.chat.completions.create(...)
+
+    client = get_async_openai_client()      # im laufenden Event Loop
+    await client.chat.completions.create(...)
+
+Benchmark (geteilter vs. neuer Client pro Call): scripts/benchmark_openai_client.sh
+"""
+import asyncio
+import os
+import threading
+import weakref
+from typing import Optional
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+OPENAI_TIMEOUT = float(os.getenv("SYNTX_OPENAI_TIMEOUT", "45"))
+OPENAI_MAX_CONNECTIONS = int(os.getenv("SYNTX_OPENAI_MAX_CONNECTIONS", "20"))
+OPENAI_KEEPALIVE = int(os.getenv("SYNTX_OPENAI_KEEPALIVE", "10"))
+OPENAI_KEEPALIVE_EXPIRY = float(os.getenv("SYNTX_OPENAI_KEEPALIVE_EXPIRY", "60"))
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=OPENAI_KEEPALIVE,
+        keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY
+    )
+
+
+def create_openai_client(timeout: float = OPENAI_TIMEOUT) -> OpenAI:
+    """Neuer Client mit eigenem Pool (Benchmarks, Tests - sonst get_openai_client)"""
+    return OpenAI(
+        timeout=timeout,
+        http_client=httpx.Client(limits=_limits(), timeout=timeout)
+    )
+
+
+_client: Optional[OpenAI] = None
+_client_pid: Optional[int] = None
+_client_lock = threading.Lock()
+
+
+def get_openai_client() -> OpenAI:
+    """
+    Geteilter sync Client
+
+    Nach fork() (neue PID) wird ein neuer Pool angelegt - Sockets des
+    Eltern-Prozesses dürfen nicht weiterverwendet werden.
+    """
+    global _client, _client_pid
+    with _client_lock:
+        if _client is None or _client_pid != os.getpid():
+            _client = create_openai_client()
+            _client_pid = os.getpid()
+        return _client
+
+
+# Ein AsyncClient gehört zu genau einem Event Loop → Cache pro Loop
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """Geteilter async Client für den laufenden Event Loop"""
+    loop = asyncio.get_running_loop()
+    with _client_lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            client = AsyncOpenAI(
+                timeout=OPENAI_TIMEOUT,
+                http_client=httpx.AsyncClient(limits=_limits(), timeout=OPENAI_TIMEOUT)
+            )
+            _async_clients[loop] = client
+        return client
+
+
+def close_openai_clients() -> None:
+    """Sync Pool schließen (Shutdown) - async Clients schließen mit ihrem Loop"""
+    global _client
+    with _client_lock:
+        if _client is not None and _client_pid == os.getpid():
+            _client.close()
+        _client = None
+
+
+# === MAIN BLOCK ===
+if __name__ == "__main__":
+    client = get_openai_client()
+    print(f"Client: {client.base_url} · timeout {OPENAI_TIMEOUT}s")
+    print(f"Pool: max {OPENAI_MAX_CONNECTIONS} connections, {OPENAI_KEEPALIVE} keep-alive ({OPENAI_KEEPALIVE_EXPIRY}s)")
+    print(f"Same instance: {client is get_openai_client()}")
@@ -0,0 +1,214 @@
+"""
+Parallel Prompt Generation - mehrere generate_prompt() Calls gleichzeitig
+
+=== ZWECK ===
+Ein Batch von 20 Prompts = 20 GPT Round-Trips. Sequenziell ~20 × 8s,
+parallel mit 4 Workern ~5 × 8s. Das Ergebnis jedes Calls geht sofort an
+on_result (z.B. Queue-Write) - nicht erst am Ende des Batches.
+
+=== RATE LIMITS (OpenAI) ===
+Zwei Token-Buckets, beide müssen reichen bevor ein Request startet:
+  RPM: 1 Token pro Request
+  TPM: geschätzte Tokens (Prompt-Länge / 4 + max_tokens)
+Nach dem Call wird die Schätzung mit der echten Usage verrechnet.
+Dazu max. GPT_CONCURRENCY Requests in Flight (BoundedSemaphore).
+
+=== CONFIG ===
+SYNTX_GPT_CONCURRENCY   parallele Requests (default 4, 1 = sequenziell)
+SYNTX_OPENAI_RPM        Requests pro Minute (default 500)
+SYNTX_OPENAI_TPM        Tokens pro Minute (default 30000)
+
+=== VERWENDUNG ===
+    def write(job, result):
+        ...
+
+    stats = generate_parallel(
+        [{"prompt": topic, "style": style, "category": cat, "max_tokens": 500}, ...],
+        on_result=write
+    )
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional
+
+from .syntx_prompt_generator import generate_prompt
+
+GPT_CONCURRENCY = int(os.getenv("SYNTX_GPT_CONCURRENCY", "4"))
+OPENAI_RPM = int(os.getenv("SYNTX_OPENAI_RPM", "500"))
+OPENAI_TPM = int(os.getenv("SYNTX_OPENAI_TPM", "30000"))
+
+
+class TokenBucket:
+    """
+    Token-Bucket: füllt sich mit rate_per_minute / 60 pro Sekunde bis capacity
+
+    acquire() blockiert bis genug Tokens da sind. Anfragen größer als die
+    Kapazität werden auf die Kapazität begrenzt (sonst warten sie ewig).
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, amount: float = 1.0) -> float:
+        """0 → Tokens genommen, sonst Sekunden bis genug Tokens da sind"""
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill()
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return 0.0
+            return (amount - self._tokens) / self.rate
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """Blockiert bis amount Tokens genommen sind → gewartete Sekunden"""
+        start = time.monotonic()
+        while True:
+            wait = self.try_acquire(amount)
+            if wait == 0:
+                return time.monotonic() - start
+            # Max. 0.5s schlafen - adjust() kann zwischendurch Tokens zurückgeben
+            time.sleep(min(wait, 0.5))
+
+    def adjust(self, delta: float) -> None:
+        """Nachträgliche Korrektur (+ zurückgeben, - nachbelasten, darf ins Minus)"""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + delta)
+
+
+class RateLimiter:
+    """RPM + TPM Buckets für einen OpenAI Account"""
+
+    def __init__(self, rpm: int = OPENAI_RPM, tpm: int = OPENAI_TPM):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self._tokens_lock = threading.Lock()
+
+    @staticmethod
+    def estimate_tokens(prompt: str, max_tokens: int) -> int:
+        """Grobe Schätzung vor dem Call: ~4 Zeichen pro Token + volles max_tokens"""
+        return len(prompt or "") // 4 + max_tokens
+
+    def acquire(self, estimated_tokens: int) -> float:
+        """Wartet auf beide Buckets → gewartete Sekunden"""
+        # TPM zuerst und unter Lock: große Requests sollen nicht von
+        # nachdrängenden kleinen ausgehungert werden
+        with self._tokens_lock:
+            waited = self.tokens.acquire(estimated_tokens)
+        return waited + self.requests.acquire(1)
+
+    def settle(self, estimated_tokens: int, result: Dict[str, Any]) -> None:
+        """Schätzung gegen echte Usage verrechnen (cost.input_tokens + output_tokens)"""
+        cost = result.get("cost") or {}
+        if "input_tokens" not in cost:
+            return
+        actual = cost.get("input_tokens", 0) + cost.get("output_tokens", 0)
+        self.tokens.adjust(estimated_tokens - actual)
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Ein Limiter pro Prozess - alle Producer teilen sich das Account-Limit"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter()
+        return _limiter
+
+
+def generate_parallel(
+    jobs: List[Dict[str, Any]],
+    on_result: Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]] = None,
+    concurrency: int = GPT_CONCURRENCY,
+    limiter: Optional[RateLimiter] = None,
+    generate: Callable[..., Dict[str, Any]] = generate_prompt
+) -> Dict[str, Any]:
+    """
+    generate_prompt() für alle Jobs, max. concurrency gleichzeitig
+
+    === ARGS ===
+    jobs: kwargs für generate_prompt (prompt, style, category, max_tokens, ...)
+          Keys mit "_" werden nicht übergeben (Kontext für on_result, z.B. _topic)
+    on_result: callback(job, result) - läuft im aufrufenden Thread, in
+               Fertigstellungs-Reihenfolge → Queue-Writes brauchen kein Locking
+    generate: austauschbar (z.B. Fake für Benchmarks)
+
+    === RETURNS ===
+    {"results": [...] (Reihenfolge wie jobs), "successful": N, "failed": M,
+     "duration_seconds": float, "rate_limited_seconds": float}
+    """
+    limiter = limiter or get_rate_limiter()
+    slots = threading.BoundedSemaphore(max(1, concurrency))
+    waited = [0.0]
+    waited_lock = threading.Lock()
+
+    def run(job: Dict[str, Any]) -> Dict[str, Any]:
+        estimate = limiter.estimate_tokens(job.get("prompt", ""), job.get("max_tokens", 500))
+        with slots:
+            wait = limiter.acquire(estimate)
+            if wait:
+                with waited_lock:
+                    waited[0] += wait
+            try:
+                result = generate(**{k: v for k, v in job.items() if not k.startswith("_")})
+            except Exception as e:
+                result = {"success": False, "error": f"Error: {e}", "prompt_generated": None,
+                          "style": job.get("style"), "category": job.get("category")}
+        limiter.settle(estimate, result)
+        return result
+
+    start = time.perf_counter()
+    results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+    successful = 0
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="gpt") as pool:
+        futures = {pool.submit(run, job): i for i, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            i = futures[future]
+            result = future.result()
+            results[i] = result
+            if result.get("success"):
+                successful += 1
+            if on_result is not None:
+                try:
+                    on_result(jobs[i], result)
+                except Exception as e:
+                    print(f"   ⚠️  on_result failed: {e}")
+
+    return {
+        "results": results,
+        "successful": successful,
+        "failed": len(jobs) - successful,
+        "duration_seconds": time.perf_counter() - start,
+        "rate_limited_seconds": round(waited[0], 2)
+    }
+
+
+# === MAIN BLOCK ===
+if __name__ == "__main__":
+    import random
+
+    # Fake-GPT (2s Latenz) - zeigt den Speedup ohne API Key
+    def fake_generate(prompt, max_tokens=500, **kwargs):
+        time.sleep(2)
+        return {"success": True, "prompt_generated": f"Meta: {prompt}",
+                "cost": {"input_tokens": len(prompt) // 4, "output_tokens": random.randint(100, max_tokens)}}
+
+    jobs = [{"prompt": f"Topic {i}", "max_tokens": 400} for i in range(8)]
+    for concurrency in (1, 4):
+        stats = generate_parallel(jobs, concurrency=concurrency, generate=fake_generate)
+        print(f"concurrency={concurrency}: {stats['successful']}/{len(jobs)} in {stats['duration_seconds']:.1f}s")
@@ -3,11 +3,13 @@ import json
 import time
 from datetime import datetime
 from pathlib import Path
-from openai import OpenAI, APIError, RateLimitError, APIConnectionError, APITimeoutError
+from openai import APIError, RateLimitError, APIConnectionError, APITimeoutError
 
 # Import unserer neuen Module
 from .prompt_scorer import score_prompt
-from .cost_tracker import calculate_cost, save_cost_log
+from .cost_tracker import calculate_cost, save_cost_log, save_cache_hit
+from .generation_cache import GPT_CACHE_ENABLED, cache_key, get_generation_cache
+from .openai_client import get_openai_client
 from .prompt_styles import apply_style
 
 
@@ -49,7 +51,9 @@ def generate_prompt(
     max_tokens: int = 500, 
     max_refusal_retries: int = 3,
     style: str = None,
-    category: str = None
+    category: str = None,
+    use_cache: bool = None,
+    cache_variant: int = 0
 ) -> dict:
     """
     Generiert Prompts via OpenAI API mit Scoring und Cost-Tracking.
@@ -61,11 +65,15 @@ def generate_prompt(
         max_tokens: Maximale Token-Anzahl
         max_refusal_retries: Max. Versuche bei Refusals
         style: Prompt-Style (technisch, kreativ, akademisch, casual)
+        use_cache: Generation Cache nutzen (None = SYNTX_GPT_CACHE, False = Bypass)
+        cache_variant: Cache-Slot für gewollt verschiedene Antworten auf gleiche Inputs
         
     Returns:
         dict mit success, prompt_sent, prompt_generated, error, model, duration_ms, 
-             retries, refusal_attempts, quality_score, cost, style
+             retries, refusal_attempts, quality_score, cost, style, cached
     """
+    if use_cache is None:
+        use_cache = GPT_CACHE_ENABLED
     
     # Style anwenden falls angegeben
     original_prompt = prompt
@@ -111,32 +119,51 @@ def generate_prompt(
         # Inner Loop: Network/API Retries
         while retry_count <= max_retries:
             try:
-                # OpenAI Client initialisieren
-                client = OpenAI(timeout=45.0)
+                messages = [
+                    {"role": "user", "content": current_prompt}
+                ]
                 
-                # API Call
-                response = client.chat.completions.create(
-                    model="gpt-4o",
-                    messages=[
-                        {"role": "user", "content": current_prompt}
-                    ],
-                    temperature=temperature,
-                    top_p=top_p,
-                    max_tokens=max_tokens
-                )
+                # Generation Cache - gleiche Inputs → gespeicherte Antwort
+                key, cached = None, None
+                if use_cache:
+                    key = cache_key("gpt-4o", messages, temperature, top_p, max_tokens, cache_variant)
+                    try:
+                        cached = get_generation_cache().get(key)
+                    except Exception as e:
+                        print(f"  ⚠️  Generation cache read failed: {e}")
                 
-                # Response extrahieren
-                generated_text = response.choices[0].message.content
-                finish_reason = response.choices[0].finish_reason
-                usage = {
-                    "prompt_tokens": response.usage.prompt_tokens,
-                    "completion_tokens": response.usage.completion_tokens,
-                    "total_tokens": response.usage.total_tokens
-                }
-                
-                # Cost berechnen
-                cost_info = calculate_cost(usage, "gpt-4o")
-                save_cost_log(cost_info)
+                if cached is not None:
+                    generated_text = cached["text"]
+                    finish_reason = cached["finish_reason"]
+                    usage = cached["usage"]
+                    
+                    # Kein API Call - gesparte Kosten loggen
+                    cost_info = save_cache_hit(calculate_cost(usage, "gpt-4o"), style=style)
+                else:
+                    # Geteilter Client (Connection Pool bleibt über Calls offen)
+                    client = get_openai_client()
+                    
+                    # API Call
+                    response = client.chat.completions.create(
+                        model="gpt-4o",
+                        messages=messages,
+                        temperature=temperature,
+                        top_p=top_p,
+                        max_tokens=max_tokens
+                    )
+                    
+                    # Response extrahieren
+                    generated_text = response.choices[0].message.content
+                    finish_reason = response.choices[0].finish_reason
+                    usage = {
+                        "prompt_tokens": response.usage.prompt_tokens,
+                        "completion_tokens": response.usage.completion_tokens,
+                        "total_tokens": response.usage.total_tokens
+                    }
+                    
+                    # Cost berechnen
+                    cost_info = calculate_cost(usage, "gpt-4o")
+                    save_cost_log({**cost_info, "cache_miss": True} if use_cache else cost_info, style=style)
                 
                 # Quality Score berechnen
                 quality = score_prompt(generated_text)
@@ -189,7 +216,13 @@ def generate_prompt(
                         }
                         return result
                 else:
-                    # Erfolg!
+                    # Erfolg! (nur nicht abgelehnte Antworten landen im Cache)
+                    if use_cache and cached is None:
+                        try:
+                            get_generation_cache().put(key, generated_text, finish_reason, usage)
+                        except Exception as e:
+                            print(f"  ⚠️  Generation cache write failed: {e}")
+                    
                     result = {
                         "success": True,
                         "prompt_sent": original_prompt,
@@ -203,7 +236,8 @@ def generate_prompt(
                         "quality_score": quality,
                         "cost": cost_info,
                         "style": style,
-            "category": category
+            "category": category,
+                        "cached": cached is not None
                     }
                     
                     # Final Log
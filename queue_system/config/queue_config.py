@@ -1,6 +1,7 @@
 """
 Queue System Configuration
 """
+import os
 from pathlib import Path
 
 # Base Paths
@@ -12,6 +13,24 @@ QUEUE_ERROR = QUEUE_BASE / "error"
 QUEUE_ARCHIVE = QUEUE_BASE / "archive"
 QUEUE_TMP = QUEUE_BASE / ".tmp"
 
+# Backend: "directory" (Default, .txt/.json Files) | "sqlite" (WAL Job-Store)
+QUEUE_BACKEND = os.getenv("SYNTX_QUEUE_BACKEND", "directory")
+QUEUE_SQLITE_PATH = Path(os.getenv("SYNTX_QUEUE_DB", str(QUEUE_BASE / "queue.db")))
+QUEUE_SQLITE_BUSY_TIMEOUT_MS = 5000
+QUEUE_SQLITE_EXPORT_PROCESSED = True  # processed Jobs auch nach processed/ schreiben (API liest dort)
+
+# Queue Counters (queue/.counters.db) - Reconciliation-Scan spätestens alle N Sekunden
+COUNTERS_RECONCILE_SECONDS = int(os.getenv("SYNTX_COUNTERS_RECONCILE_SECONDS", "300"))
+
+# Prompt Dedup (queue/.dedup.db) - MinHash/LSH gegen jüngste incoming/ + processed/ Prompts
+DEDUP_MODE = os.getenv("SYNTX_DEDUP_MODE", "drop")  # drop | flag | off
+DEDUP_THRESHOLD = float(os.getenv("SYNTX_DEDUP_THRESHOLD", "0.8"))  # geschätzte Jaccard
+DEDUP_WINDOW_DAYS = float(os.getenv("SYNTX_DEDUP_WINDOW_DAYS", "14"))
+DEDUP_PRUNE_SECONDS = 3600  # register() räumt höchstens stündlich alte Signaturen ab
+DEDUP_NUM_PERM = 128  # MinHash Signaturlänge
+DEDUP_BANDS = 16      # LSH: 16 Bänder × 8 Zeilen
+DEDUP_SHINGLE_SIZE = 3
+
 # Thresholds
 QUEUE_MIN_THRESHOLD = 5    # Unter 5 → Producer aktiviert
 QUEUE_MAX_THRESHOLD = 50   # Über 50 → Producer wartet
@@ -26,6 +45,10 @@ CONSUMER_BATCH_SIZE = 20
 CONSUMER_MAX_WORKERS = 3
 CONSUMER_PROCESSING_TIMEOUT = 3600  # 1 Stunde
 
+# Consumer Daemon - Wrapper und max. parallele Jobs pro Wrapper ("wrapper:limit,...")
+CONSUMER_WRAPPERS = os.getenv("SYNTX_CONSUMER_WRAPPERS", "syntex_system:1,sigma:2")
+CONSUMER_POLL_INTERVAL = 10  # Sekunden Pause wenn Queue leer
+
 # Cleanup Settings
 ARCHIVE_AFTER_DAYS = 30
 ERROR_RETENTION_DAYS = 90
@@ -18,12 +18,15 @@ File-Based Locking via Atomic Rename:
 - incoming/job.txt → processing/job.txt = Lock acquired
 - Wenn rename fails → Job bereits von anderem Worker gelocked
 - Ermöglicht parallele Worker ohne Koordination
+
+=== BACKEND ===
+Claim/Complete/Fail laufen über das QueueBackend (queue_backend.py).
+SYNTX_QUEUE_BACKEND=sqlite → SQLite Job-Store statt Directory-Scans
 """
 import sys
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Tuple
-from dataclasses import dataclass
 
 # Add parent for SYNTX imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -34,27 +37,16 @@ from syntex_injector.syntex.core.calibrator_enhanced import EnhancedSyntexCalibr
 from queue_system.utils.wrapper_patcher import patch_wrapper_system
 patched_wrappers = patch_wrapper_system()
 
-from .file_handler import FileHandler
+from .job import Job
+from .queue_backend import QueueBackend, get_backend
 from ..config.queue_config import *
+from ..monitoring.calibration_stats import get_calibration_stats
 
-
-@dataclass
-class Job:
-    """
-    Job Container
-    
-    === FIELDS ===
-    - file_path: Path zum .txt File in processing/
-    - meta_path: Path zum .json File
-    - content: Meta-Prompt Text
-    - metadata: Job Metadata (topic, style, gpt_quality, etc.)
-    - filename: Original Filename
-    """
-    file_path: Path
-    meta_path: Path
-    content: str
-    metadata: dict
-    filename: str
+# Vektor-Index für /prompts/similar (optional - braucht numpy + Embedding-Model)
+try:
+    from syntex_injector.syntex.analysis.vector_index import get_vector_index, VECTOR_INDEX_ENABLED
+except ImportError:
+    get_vector_index, VECTOR_INDEX_ENABLED = None, False
 
 
 class QueueConsumer:
@@ -71,13 +63,15 @@ class QueueConsumer:
     - Fehler werden geloggt + retry-count erhöht
     """
     
-    def __init__(self, wrapper_name: str = "human", worker_id: Optional[str] = None):
+    def __init__(self, wrapper_name: str = "human", worker_id: Optional[str] = None,
+                 backend: Optional[QueueBackend] = None):
         """
         Initialisiert Consumer
         
         === ARGS ===
         wrapper_name: "human" | "sigma" | "sigma_v2"
         worker_id: Optional ID für Logging (default: PID)
+        backend: Optional QueueBackend (default: get_backend() aus Config)
         """
         import os
         self.worker_id = worker_id or f"worker_{os.getpid()}"
@@ -86,103 +80,25 @@ class QueueConsumer:
         # SYNTX Calibrator
         self.calibrator = EnhancedSyntexCalibrator(wrapper_name=wrapper_name)
         
-        # File Handler
-        self.file_handler = FileHandler()
+        # Queue Backend (directory | sqlite)
+        self.backend = backend or get_backend()
         
-        print(f"🔧 Consumer [{self.worker_id}] initialized (wrapper: {wrapper_name})")
+        print(f"🔧 Consumer [{self.worker_id}] initialized (wrapper: {wrapper_name}, backend: {self.backend.name})")
     
     def get_next_job(self) -> Optional[Job]:
         """
         Holt nächsten Job aus Queue MIT LOCK
         
         === LOCK MECHANISM ===
-        1. Liste alle .txt Files in incoming/ (sortiert nach Timestamp)
-        2. Versuche älteste Datei: incoming/ → processing/
-        3. Wenn rename() erfolgreich → Lock acquired, return Job
-        4. Wenn FileNotFoundError → anderer Worker war schneller, try next
-        5. Wenn keine Files mehr → return None (Queue leer)
-        
-        === WARUM ATOMIC ===
-        rename() ist atomic auf POSIX filesystems
-        Entweder: File ist verschoben (Lock acquired)
-        Oder: FileNotFoundError (Lock von anderem Worker)
-        Niemals: Partial state oder doppeltes Processing
+        Delegiert an das konfigurierte QueueBackend:
+        - directory: atomic rename incoming/ → processing/
+        - sqlite: atomic UPDATE ... RETURNING
         
         === RETURNS ===
         Job object wenn erfolgreich gelocked
         None wenn Queue leer
         """
-        # Alle .txt Files in incoming/ (sortiert = älteste zuerst)
-        # Get all .txt files EXCEPT _response.txt files!
-        all_txt_files = sorted(QUEUE_INCOMING.glob("*.txt"))
-        incoming_files = [f for f in all_txt_files if not f.name.endswith('_response.txt')]
-        
-        if not incoming_files:
-            return None  # Queue leer
-        
-        # Versuche jedes File zu locken (älteste zuerst)
-        for file_path in incoming_files:
-            try:
-                # === ATOMIC LOCK ===
-                # Target in processing/
-                processing_path = QUEUE_PROCESSING / file_path.name
-                
-                # Atomic rename = Lock
-                # Wenn das wirft FileNotFoundError → anderer Worker hat's
-                file_path.rename(processing_path)
-                
-                # === LOCK ACQUIRED! ===
-                # Metadata auch verschieben
-                meta_path_incoming = file_path.with_suffix('.json')
-                meta_path_processing = processing_path.with_suffix('.json')
-                
-                if meta_path_incoming.exists():
-                    meta_path_incoming.rename(meta_path_processing)
-                
-                # Job laden
-                return self._load_job(processing_path, meta_path_processing)
-                
-            except FileNotFoundError:
-                # Anderer Worker war schneller
-                # Try next file
-                continue
-            except Exception as e:
-                print(f"⚠️  Error locking {file_path.name}: {e}")
-                continue
-        
-        # Alle Files waren bereits gelocked
-        return None
-    
-    def _load_job(self, file_path: Path, meta_path: Path) -> Job:
-        """
-        Lädt Job-Content + Metadata
-        
-        === ARGS ===
-        file_path: Path zum .txt in processing/
-        meta_path: Path zum .json in processing/
-        
-        === RETURNS ===
-        Job object mit allen Daten
-        """
-        # Content laden
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Metadata laden
-        import json
-        if meta_path.exists():
-            with open(meta_path, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
-        else:
-            metadata = {}
-        
-        return Job(
-            file_path=file_path,
-            meta_path=meta_path,
-            content=content,
-            metadata=metadata,
-            filename=file_path.name
-        )
+        return self.backend.claim_next(self.worker_id)
     
     def process_job(self, job: Job) -> bool:
         """
@@ -205,12 +121,16 @@ class QueueConsumer:
         print(f"Style: {job.metadata.get('style', 'unknown')}")
         print(f"{'='*60}")
         
+        # Stabile Job-ID in Metadata + Calibration-Log → exakter Join im Export
+        job.metadata['job_uid'] = job.uid
+        
         try:
             # === SYNTX KALIBRIERUNG ===
             success, response, result_meta = self.calibrator.calibrate(
                 meta_prompt=job.content,
                 verbose=True,
-                gpt_user_prompt=job.metadata.get("gpt_user_prompt")  # 🔥 NEU!
+                gpt_user_prompt=job.metadata.get("gpt_user_prompt"),  # 🔥 NEU!
+                job_uid=job.uid
             )
             
             if success:
@@ -227,16 +147,10 @@ class QueueConsumer:
                     'response_text': response  # ← RESPONSE SPEICHERN!
                 }
                 
-                # Move zu processed/ FIRST!
-                self.file_handler.move_to_processed(job)
-                
-                # THEN save response in processed/ (not processing/!)
-                if response:
-                    # Use QUEUE_PROCESSED - file is now in processed/!
-                    response_file = QUEUE_PROCESSED / (job.filename.replace('.txt', '_response.txt'))
-                    with open(response_file, 'w', encoding='utf-8') as f:
-                        f.write(response)
-                    print(f"  💾 Response saved to: {response_file}")
+                # Move zu processed/ + Response speichern
+                self.backend.complete(job, response)
+                self._record_stats(job, True, result_meta)
+                self._index_vector(job)
                 
                 return True
                 
@@ -252,7 +166,8 @@ class QueueConsumer:
                 print(f"❌ Kalibrierung fehlgeschlagen: {error_info['error']}")
                 
                 # Move zu error/ (mit retry-count)
-                self.file_handler.move_to_error(job, error_info)
+                self.backend.fail(job, error_info)
+                self._record_stats(job, False, result_meta)
                 
                 return False
                 
@@ -267,10 +182,33 @@ class QueueConsumer:
             }
             
             # Move zu error/
-            self.file_handler.move_to_error(job, error_info)
+            self.backend.fail(job, error_info)
+            self._record_stats(job, False, {})
             
             return False
     
+    def _record_stats(self, job: Job, success: bool, result_meta: dict) -> None:
+        """Rollende Aggregate nachführen (queue/.stats.db) - Fehler brechen den Job nie ab"""
+        try:
+            get_calibration_stats(QUEUE_BASE).record_job(
+                job.metadata,
+                success=success,
+                score=(result_meta.get('quality_score') or {}).get('total_score'),
+                duration_ms=result_meta.get('duration_ms'),
+                wrapper=self.wrapper_name
+            )
+        except Exception as e:
+            print(f"⚠️  Stats update failed: {e}")
+    
+    def _index_vector(self, job: Job) -> None:
+        """Meta-Prompt in den Vektor-Index (queue → /prompts/similar) - Fehler brechen den Job nie ab"""
+        if not VECTOR_INDEX_ENABLED:
+            return
+        try:
+            get_vector_index().add_text(job.uid, job.content)
+        except Exception as e:
+            print(f"⚠️  Vector index update failed: {e}")
+    
     def process_batch(self, batch_size: int = 20) -> dict:
         """
         Verarbeitet Batch von Jobs
@@ -0,0 +1,251 @@
+"""
+Consumer Daemon - Langlaufender Multi-Worker Consumer
+
+=== ZWECK ===
+QueueConsumer.process_batch() verarbeitet einen Job nach dem anderen
+und blockiert pro Llama-Call bis zu READ_TIMEOUT. Der Daemon hält
+stattdessen bis zu CONSUMER_MAX_WORKERS Kalibrierungen gleichzeitig
+in Flight - Durchsatz skaliert mit dem was der Llama-Endpoint schafft.
+
+=== DESIGN ===
+- ThreadPoolExecutor mit CONSUMER_MAX_WORKERS Threads
+- Globale Semaphore: max. CONSUMER_MAX_WORKERS Jobs in Flight
+- Pro Wrapper eine Semaphore: max. N parallele Jobs pro Wrapper
+  (CONSUMER_WRAPPERS = "syntex_system:1,sigma:2")
+- Main-Loop claimed Jobs (Backend-Lock) und verteilt sie round-robin
+  auf die Wrapper mit freiem Slot
+- Pro Thread + Wrapper ein eigener QueueConsumer (eigener Calibrator,
+  kein geteilter State zwischen Threads)
+
+=== SHUTDOWN ===
+SIGTERM / SIGINT:
+1. Keine neuen Jobs mehr claimen
+2. Laufende Kalibrierungen fertig machen (drain)
+3. Stats ausgeben, Exit
+Zweites Signal während drain → sofortiger Abbruch
+
+=== VERWENDUNG ===
+    python3 -m queue_system.core.consumer_daemon
+    python3 -m queue_system.core.consumer_daemon --wrappers sigma:3 --max-workers 3
+"""
+import os
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Optional
+
+from .consumer import QueueConsumer
+from .queue_backend import QueueBackend, get_backend
+from ..config.queue_config import *
+
+
+def parse_wrapper_limits(spec: str) -> Dict[str, int]:
+    """
+    "syntex_system:1,sigma:2" → {"syntex_system": 1, "sigma": 2}
+
+    Wrapper ohne Limit → 1
+    """
+    limits = {}
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, limit = part.partition(":")
+        limits[name.strip()] = max(1, int(limit)) if limit else 1
+    return limits
+
+
+class ConsumerDaemon:
+    """
+    Multi-Worker Consumer mit begrenztem In-Flight Pool
+
+    === GUARANTEES ===
+    - Nie mehr als max_workers Jobs gleichzeitig
+    - Nie mehr als wrapper_limits[w] Jobs gleichzeitig pro Wrapper
+    - Geclaimte Jobs werden bei SIGTERM fertig verarbeitet (kein Job
+      bleibt in processing/ hängen)
+    """
+
+    def __init__(
+        self,
+        wrapper_limits: Optional[Dict[str, int]] = None,
+        max_workers: int = CONSUMER_MAX_WORKERS,
+        poll_interval: float = CONSUMER_POLL_INTERVAL,
+        backend: Optional[QueueBackend] = None
+    ):
+        self.wrapper_limits = wrapper_limits or parse_wrapper_limits(CONSUMER_WRAPPERS)
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self.backend = backend or get_backend()
+        self.daemon_id = f"daemon_{os.getpid()}"
+
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._wrapper_slots = {
+            name: threading.BoundedSemaphore(limit)
+            for name, limit in self.wrapper_limits.items()
+        }
+        self._rr = 0  # Start-Wrapper der nächsten Runde (Round-Robin)
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()  # Slot frei geworden / Stop
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            'processed': 0,
+            'failed': 0,
+            'total': 0,
+            'per_wrapper': {name: {'processed': 0, 'failed': 0} for name in self.wrapper_limits}
+        }
+
+    # ========================================================================
+    # WORKER
+    # ========================================================================
+
+    def _consumer_for(self, wrapper_name: str) -> QueueConsumer:
+        """Ein QueueConsumer pro Thread + Wrapper (lazy)"""
+        consumers = getattr(self._local, "consumers", None)
+        if consumers is None:
+            consumers = self._local.consumers = {}
+        if wrapper_name not in consumers:
+            worker_id = f"{self.daemon_id}_{wrapper_name}_{threading.current_thread().name}"
+            consumers[wrapper_name] = QueueConsumer(wrapper_name, worker_id, backend=self.backend)
+        return consumers[wrapper_name]
+
+    def _run_job(self, wrapper_name: str, job) -> None:
+        """Läuft im Pool-Thread - gibt Slots IMMER wieder frei"""
+        try:
+            success = self._consumer_for(wrapper_name).process_job(job)
+        except Exception as e:
+            print(f"❌ [{wrapper_name}] Unhandled error for {job.filename}: {e}")
+            success = False
+        finally:
+            self._wrapper_slots[wrapper_name].release()
+            self._slots.release()
+            self._wakeup.set()
+
+        with self._stats_lock:
+            key = 'processed' if success else 'failed'
+            self.stats[key] += 1
+            self.stats['total'] += 1
+            self.stats['per_wrapper'][wrapper_name][key] += 1
+
+    # ========================================================================
+    # MAIN LOOP
+    # ========================================================================
+
+    def _dispatch_round(self, pool: ThreadPoolExecutor) -> int:
+        """
+        Ein Durchlauf über alle Wrapper: pro Wrapper mit freiem Slot
+        einen Job claimen und submitten - jede Runde beginnt beim
+        nächsten Wrapper, sonst bekäme der erste bei knappen Slots alles
+
+        === RETURNS ===
+        Anzahl submitteter Jobs (0 = Queue leer oder alle Slots belegt)
+        """
+        submitted = 0
+        items = list(self._wrapper_slots.items())
+        rr = self._rr % len(items) if items else 0
+        self._rr = rr + 1
+        for wrapper_name, wrapper_slot in items[rr:] + items[:rr]:
+            if self._stop.is_set():
+                break
+            if not wrapper_slot.acquire(blocking=False):
+                continue
+            if not self._slots.acquire(blocking=False):
+                wrapper_slot.release()
+                break
+
+            job = self.backend.claim_next(f"{self.daemon_id}_{wrapper_name}")
+            if job is None:
+                wrapper_slot.release()
+                self._slots.release()
+                break
+
+            pool.submit(self._run_job, wrapper_name, job)
+            submitted += 1
+        return submitted
+
+    def run(self) -> dict:
+        """
+        Daemon starten - blockiert bis SIGTERM/SIGINT
+
+        === RETURNS ===
+        dict mit Stats (processed, failed, total, per_wrapper, duration_seconds)
+        """
+        self._install_signal_handlers()
+        start_time = datetime.now()
+
+        print(f"🚀 Consumer Daemon [{self.daemon_id}] started")
+        print(f"Backend: {self.backend.name}")
+        print(f"Max in flight: {self.max_workers}")
+        print(f"Wrappers: {self.wrapper_limits}\n")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="calib") as pool:
+            while not self._stop.is_set():
+                self._wakeup.clear()
+                if self._dispatch_round(pool) == 0:
+                    # Queue leer oder alle Slots belegt → warten bis
+                    # ein Job fertig ist, Stop kommt oder poll_interval um ist
+                    self._wakeup.wait(self.poll_interval)
+
+            print(f"\n🛑 Shutdown requested - draining in-flight jobs...")
+            # Context-Exit = pool.shutdown(wait=True) → laufende Jobs fertig
+
+        self.stats['duration_seconds'] = (datetime.now() - start_time).total_seconds()
+
+        print(f"\n{'='*60}")
+        print(f"DAEMON STOPPED")
+        print(f"{'='*60}")
+        print(f"Processed: {self.stats['processed']}")
+        print(f"Failed: {self.stats['failed']}")
+        print(f"Total: {self.stats['total']}")
+        print(f"Duration: {self.stats['duration_seconds']:.1f}s")
+        print(f"{'='*60}\n")
+
+        return self.stats
+
+    def stop(self) -> None:
+        """Graceful Stop: keine neuen Jobs, laufende fertig machen"""
+        self._stop.set()
+        self._wakeup.set()
+
+    def _install_signal_handlers(self) -> None:
+        """SIGTERM/SIGINT → drain, zweites Signal → sofort beenden"""
+        if threading.current_thread() is not threading.main_thread():
+            return
+
+        def handle(signum, frame):
+            if self._stop.is_set():
+                print(f"\n⚠️  Second signal - exiting without drain")
+                os._exit(1)
+            print(f"\n📥 Signal {signum} received")
+            self.stop()
+
+        signal.signal(signal.SIGTERM, handle)
+        signal.signal(signal.SIGINT, handle)
+
+
+# === MAIN BLOCK ===
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="SYNTX Consumer Daemon")
+    parser.add_argument("--wrappers", type=str, default=CONSUMER_WRAPPERS,
+                        help="Wrapper + Limit, z.B. 'syntex_system:1,sigma:2'")
+    parser.add_argument("--max-workers", type=int, default=CONSUMER_MAX_WORKERS,
+                        help="Max. parallele Kalibrierungen gesamt")
+    parser.add_argument("--poll-interval", type=float, default=CONSUMER_POLL_INTERVAL,
+                        help="Sekunden Pause wenn Queue leer")
+
+    args = parser.parse_args()
+
+    daemon = ConsumerDaemon(
+        wrapper_limits=parse_wrapper_limits(args.wrappers),
+        max_workers=args.max_workers,
+        poll_interval=args.poll_interval
+    )
+    stats = daemon.run()
+
+    print("=== FINAL STATS ===")
+    print(json.dumps(stats, indent=2))
@@ -0,0 +1,371 @@
+"""
+Prompt Dedup - Near-Duplicate Erkennung bevor ein Prompt in die Queue geht
+
+=== ZWECK ===
+GPT liefert für das gleiche Topic immer wieder fast identische Meta-Prompts.
+Jeder davon kostet Minuten Llama-Zeit im Consumer - für ein Ergebnis,
+das wir schon haben. Der Producer prüft deshalb jeden neuen Prompt gegen
+die jüngsten incoming/ + processed/ Prompts.
+
+=== VERFAHREN: MinHash + LSH ===
+1. Text → Wort-Shingles (3 Wörter, casefold)
+2. Shingles → MinHash Signatur (DEDUP_NUM_PERM Hashes, NumPy)
+   Anteil gleicher Signatur-Werte ≈ Jaccard-Ähnlichkeit der Shingle-Mengen
+3. Signatur → DEDUP_BANDS Bänder, jedes Band → Bucket-Hash
+   Nur Prompts die in mindestens einem Bucket kollidieren sind Kandidaten
+   (Schwelle der S-Kurve ≈ (1/bands)^(1/rows) = 0.71 bei 16 × 8)
+4. Kandidaten: geschätzte Jaccard >= DEDUP_THRESHOLD → Duplikat
+
+=== SPEICHER (queue/.dedup.db) ===
+sigs(name, topic, created, sig)      Signaturen der letzten DEDUP_WINDOW_DAYS
+bands(band, bucket, name)            LSH Buckets → Kandidaten per Index-Lookup
+meta(key, value)                     Zähler + backfilled_at + pruned_at
+
+Kandidaten außerhalb des Fensters zählen nie als Duplikat; register()
+löscht sie höchstens alle DEDUP_PRUNE_SECONDS aus der DB.
+
+=== MODUS (SYNTX_DEDUP_MODE) ===
+drop → Duplikat wird nicht geschrieben (Default)
+flag → wird geschrieben, Metadata bekommt duplicate_of + duplicate_similarity
+off  → kein Check
+
+=== VERWENDUNG ===
+    dedup = get_deduplicator()
+    verdict = dedup.screen(content, metadata)
+    if verdict.action != "drop":
+        filename = backend.enqueue(content, metadata)
+        dedup.register(filename, verdict)
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..config.queue_config import *
+
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_PRIME = np.uint64(4294967311)  # kleinste Primzahl > 2^32 → (a·h + b) passt in uint64
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, 2 ** 32 - 1, size=DEDUP_NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, 2 ** 32 - 1, size=DEDUP_NUM_PERM, dtype=np.uint64)
+
+_COUNTERS = ("checked", "duplicates", "dropped", "flagged")
+
+
+def shingles(text: str, size: int = DEDUP_SHINGLE_SIZE) -> List[str]:
+    """Wort-Shingles (casefold) - kurze Texte → ein Shingle aus allen Wörtern"""
+    words = _TOKEN_RE.findall(text.casefold())
+    if len(words) <= size:
+        return [" ".join(words)] if words else []
+    return [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+
+def minhash(text: str) -> Optional[np.ndarray]:
+    """MinHash Signatur (uint32, DEDUP_NUM_PERM Werte) - leerer Text → None"""
+    parts = shingles(text)
+    if not parts:
+        return None
+    hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in set(parts)), dtype=np.uint64)
+    permuted = (hashes[:, None] * _PERM_A + _PERM_B) % _PRIME & _MAX_HASH
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def similarity(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    """Geschätzte Jaccard-Ähnlichkeit zweier Signaturen"""
+    return float(np.count_nonzero(sig_a == sig_b)) / len(sig_a)
+
+
+def _band_buckets(sig: np.ndarray) -> List[int]:
+    """Ein Bucket-Hash (signed int64 für SQLite) pro Band"""
+    rows = len(sig) // DEDUP_BANDS
+    return [
+        int.from_bytes(hashlib.blake2b(sig[b * rows:(b + 1) * rows].tobytes(), digest_size=8).digest(),
+                       "big", signed=True)
+        for b in range(DEDUP_BANDS)
+    ]
+
+
+@dataclass
+class DedupVerdict:
+    """Ergebnis von screen() - action: accept | drop | flag"""
+    action: str
+    signature: Optional[np.ndarray] = None
+    match: Optional[str] = None
+    similarity: float = 0.0
+
+    @property
+    def is_duplicate(self) -> bool:
+        return self.match is not None
+
+
+class PromptDeduplicator:
+    """
+    MinHash/LSH Index über die jüngsten Queue-Prompts
+
+    === THREAD-SAFETY ===
+    Eine SQLite Connection pro Thread, Schreibzugriffe als Transaktion
+    """
+
+    def __init__(self, queue_base: Path = QUEUE_BASE, mode: str = DEDUP_MODE,
+                 threshold: float = DEDUP_THRESHOLD, window_days: float = DEDUP_WINDOW_DAYS):
+        self.queue_base = Path(queue_base)
+        self.db_path = self.queue_base / ".dedup.db"
+        self.mode = mode
+        self.threshold = threshold
+        self.window_days = window_days
+        self._local = threading.local()
+        self._backfill_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.queue_base.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS sigs (
+                    name TEXT PRIMARY KEY,
+                    topic TEXT,
+                    created REAL NOT NULL,
+                    sig BLOB NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS sigs_created ON sigs (created);
+                CREATE TABLE IF NOT EXISTS bands (
+                    band INTEGER NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    name TEXT NOT NULL,
+                    PRIMARY KEY (band, bucket, name)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            """)
+            self._local.conn = conn
+        return conn
+
+    # ========================================================================
+    # CHECK
+    # ========================================================================
+
+    def _cutoff(self, window_days: Optional[float] = None) -> float:
+        return time.time() - (self.window_days if window_days is None else window_days) * 86400
+
+    def find_duplicate(self, sig: np.ndarray) -> Optional[tuple]:
+        """Ähnlichster Kandidat im Fenster über der Schwelle → (name, similarity) oder None"""
+        buckets = _band_buckets(sig)
+        conn = self._connect()
+        clause = " OR ".join("(band = ? AND bucket = ?)" for _ in buckets)
+        params = [v for pair in enumerate(buckets) for v in pair]
+        rows = conn.execute(
+            f"SELECT s.name, s.sig FROM sigs s WHERE s.created >= ? AND s.name IN "
+            f"(SELECT DISTINCT name FROM bands WHERE {clause})", [self._cutoff()] + params
+        ).fetchall()
+
+        best = None
+        for name, blob in rows:
+            score = similarity(sig, np.frombuffer(blob, dtype=np.uint32))
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (name, score)
+        return best
+
+    def screen(self, content: str, metadata: Optional[Dict] = None) -> DedupVerdict:
+        """
+        Prüft einen neuen Prompt - VOR dem Schreiben in die Queue
+
+        flag-Modus → metadata bekommt duplicate_of / duplicate_similarity
+        """
+        if self.mode == "off":
+            return DedupVerdict("accept")
+        self.ensure_backfilled()
+
+        sig = minhash(content)
+        if sig is None:
+            return DedupVerdict("accept")
+
+        match = self.find_duplicate(sig)
+        if match is None:
+            self._bump(checked=1)
+            return DedupVerdict("accept", sig)
+
+        name, score = match
+        if self.mode == "flag":
+            if metadata is not None:
+                metadata["duplicate_of"] = name
+                metadata["duplicate_similarity"] = round(score, 3)
+            self._bump(checked=1, duplicates=1, flagged=1)
+            return DedupVerdict("flag", sig, name, score)
+
+        self._bump(checked=1, duplicates=1, dropped=1)
+        return DedupVerdict("drop", sig, name, score)
+
+    # ========================================================================
+    # REGISTER
+    # ========================================================================
+
+    def register(self, name: str, verdict_or_content, topic: Optional[str] = None) -> None:
+        """Geschriebenen Prompt in den Index aufnehmen (Verdict aus screen() oder Text)"""
+        if self.mode == "off":
+            return
+        if isinstance(verdict_or_content, DedupVerdict):
+            sig = verdict_or_content.signature
+        else:
+            sig = minhash(verdict_or_content)
+        if sig is None:
+            return
+        conn = self._connect()
+        self._insert(conn, [(name, topic, time.time(), sig)])
+
+        pruned_at = conn.execute("SELECT value FROM meta WHERE key = 'pruned_at'").fetchone()
+        if pruned_at is None or time.time() - float(pruned_at[0]) >= DEDUP_PRUNE_SECONDS:
+            self.prune()
+
+    def _insert(self, conn: sqlite3.Connection, items: List[tuple]) -> None:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for name, topic, created, sig in items:
+                conn.execute(
+                    "INSERT OR REPLACE INTO sigs (name, topic, created, sig) VALUES (?, ?, ?, ?)",
+                    (name, topic, created, sig.astype(np.uint32).tobytes())
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO bands (band, bucket, name) VALUES (?, ?, ?)",
+                    [(band, bucket, name) for band, bucket in enumerate(_band_buckets(sig))]
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def prune(self, window_days: Optional[float] = None) -> int:
+        """Signaturen älter als window_days (default: self.window_days) entfernen → Anzahl gelöscht"""
+        cutoff = self._cutoff(window_days)
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "DELETE FROM bands WHERE name IN (SELECT name FROM sigs WHERE created < ?)", (cutoff,)
+            )
+            removed = conn.execute("DELETE FROM sigs WHERE created < ?", (cutoff,)).rowcount
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('pruned_at', ?)", (str(time.time()),))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return removed
+
+    # ========================================================================
+    # BACKFILL - Bestand aus incoming/ + processed/
+    # ========================================================================
+
+    def ensure_backfilled(self) -> None:
+        conn = self._connect()
+        if conn.execute("SELECT 1 FROM meta WHERE key = 'backfilled_at'").fetchone():
+            return
+        with self._backfill_lock:
+            if not conn.execute("SELECT 1 FROM meta WHERE key = 'backfilled_at'").fetchone():
+                self.rebuild()
+
+    def rebuild(self, window_days: Optional[float] = None) -> int:
+        """Signaturen aller Prompts der letzten window_days aus incoming/ + processed/"""
+        cutoff = self._cutoff(window_days)
+        items = []
+        for source in (self.queue_base / "incoming", self.queue_base / "processed"):
+            if not source.exists():
+                continue
+            with os.scandir(source) as it:
+                for entry in it:
+                    if not entry.name.endswith(".txt") or entry.name.endswith("_response.txt"):
+                        continue
+                    try:
+                        mtime = entry.stat().st_mtime
+                        if mtime < cutoff:
+                            continue
+                        with open(entry.path, encoding="utf-8") as f:
+                            sig = minhash(f.read())
+                    except OSError:
+                        continue
+                    if sig is not None:
+                        items.append((entry.name, None, mtime, sig))
+
+        conn = self._connect()
+        self._insert(conn, items)
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('backfilled_at', ?)", (str(time.time()),))
+        self.prune(window_days)
+        return len(items)
+
+    # ========================================================================
+    # STATS
+    # ========================================================================
+
+    def _bump(self, **deltas: int) -> None:
+        self._connect().executemany(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = CAST(value AS INTEGER) + excluded.value",
+            [(f"count_{k}", v) for k, v in deltas.items()]
+        )
+
+    def stats(self) -> Dict:
+        """
+        Zähler + gesparte Model-Zeit
+
+        saved_model_seconds = dropped × Ø Kalibrierungsdauer (CalibrationStats)
+        """
+        conn = self._connect()
+        values = dict(conn.execute("SELECT key, value FROM meta WHERE key LIKE 'count_%'").fetchall())
+        result = {k: int(values.get(f"count_{k}", 0)) for k in _COUNTERS}
+        result["indexed"] = conn.execute("SELECT COUNT(*) FROM sigs").fetchone()[0]
+        result["mode"] = self.mode
+        result["threshold"] = self.threshold
+
+        avg_ms = 0.0
+        try:
+            from ..monitoring.calibration_stats import get_calibration_stats
+            avg_ms = get_calibration_stats(self.queue_base).totals().get("avg_duration_ms", 0) or 0
+        except Exception:
+            pass
+        result["avg_job_duration_ms"] = avg_ms
+        result["saved_model_seconds"] = round(result["dropped"] * avg_ms / 1000, 1)
+        return result
+
+
+# ============================================================================
+# SHARED INSTANCES - eine pro Queue-Basis und Prozess
+# ============================================================================
+
+_dedups: Dict[str, PromptDeduplicator] = {}
+_dedups_lock = threading.Lock()
+
+
+def get_deduplicator(queue_base: Path = QUEUE_BASE) -> PromptDeduplicator:
+    key = str(Path(queue_base).resolve())
+    with _dedups_lock:
+        if key not in _dedups:
+            _dedups[key] = PromptDeduplicator(queue_base)
+        return _dedups[key]
+
+
+# === MAIN BLOCK ===
+if __name__ == "__main__":
+    import json
+    import sys
+
+    dedup = get_deduplicator()
+    if "--rebuild" in sys.argv:
+        print(f"Rebuilt from {dedup.rebuild()} prompts")
+
+    a = "Erkläre die Drift im Bildungssystem: welche Kräfte wirken auf Schulen und wie verändert sich das Feld?"
+    b = "Erkläre die Drift im Bildungssystem: welche Kräfte wirken auf Schulen und wie verändert sich das Feld heute?"
+    start = time.perf_counter()
+    sig_a, sig_b = minhash(a), minhash(b)
+    print(f"Similarity: {similarity(sig_a, sig_b):.2f} ({(time.perf_counter() - start) * 500:.3f}ms/Signatur)")
+    print(f"Stats: {json.dumps(dedup.stats(), indent=2)}")
@@ -10,22 +10,33 @@ from typing import Dict, Any, Union
 
 from ..config.queue_config import *
 
-# Job Type Hint (forward reference)
-try:
-    from .consumer import Job
-except ImportError:
-    Job = None
+# Job Type Hint
+from .job import Job
+from .queue_counters import get_counters
 
 
 class FileHandler:
     """[... KOMMENTARE BLEIBEN ...]"""
     
+    def _count_transition(self, from_dir: Path = None, to_dir: Path = None) -> None:
+        """
+        Queue-Zähler nachführen (queue/.counters.db)
+        
+        State = Ordnername (incoming/processing/processed/error)
+        Zähler-Fehler dürfen NIE eine Queue-Operation abbrechen -
+        die periodische Reconciliation korrigiert Abweichungen
+        """
+        try:
+            get_counters().transition(
+                from_dir.name if from_dir is not None else None,
+                to_dir.name if to_dir is not None else None
+            )
+        except Exception as e:
+            print(f"⚠️  Queue counter update failed: {e}")
+    
     def atomic_write(self, content: str, metadata: Dict[str, Any], target_dir: Path) -> Path:
         """[... BLEIBT GLEICH ...]"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
-        topic_slug = self._slugify(metadata.get('topic', 'unknown'))[:30]
-        style = metadata.get('style', 'unknown')
-        filename = f"{timestamp}__topic_{topic_slug}__style_{style}.txt"
+        filename = self.make_filename(metadata)
         
         temp_path = QUEUE_TMP / filename
         temp_path.parent.mkdir(parents=True, exist_ok=True)
@@ -45,8 +56,36 @@ class FileHandler:
         temp_path.rename(final_path)
         meta_path.rename(final_meta)
         
+        self._count_transition(to_dir=target_dir)
+        
         return final_path
     
+    def make_filename(self, metadata: Dict[str, Any]) -> str:
+        """Job-Filename: <timestamp>__topic_<slug>__style_<style>.txt (auch für SQLite Backend)"""
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        topic_slug = self._slugify(metadata.get('topic', 'unknown'))[:30]
+        style = metadata.get('style', 'unknown')
+        return f"{timestamp}__topic_{topic_slug}__style_{style}.txt"
+    
+    def move_to_processing(self, file_path: Path) -> Path:
+        """
+        Claim: incoming/job.txt → processing/job.txt (atomic rename = Lock)
+        
+        === RAISES ===
+        FileNotFoundError wenn anderer Worker schneller war
+        """
+        processing_path = QUEUE_PROCESSING / file_path.name
+        file_path.rename(processing_path)
+        
+        # === LOCK ACQUIRED! ===
+        meta_path_incoming = file_path.with_suffix('.json')
+        if meta_path_incoming.exists():
+            meta_path_incoming.rename(processing_path.with_suffix('.json'))
+        
+        self._count_transition(file_path.parent, QUEUE_PROCESSING)
+        
+        return processing_path
+    
     def move_to_processed(self, job) -> Path:
         """[... KOMMENTAR BLEIBT ...]"""
         # Handle both Job object and Path
@@ -78,6 +117,8 @@ class FileHandler:
         if meta_path.exists():
             meta_path.rename(target_meta)
         
+        self._count_transition(job_path.parent, QUEUE_PROCESSED)
+        
         return target
     
     def move_to_error(self, job, error_info: Dict[str, Any]) -> Path:
@@ -116,6 +157,8 @@ class FileHandler:
         job_path.rename(target)
         meta_path.rename(target_meta)
         
+        self._count_transition(job_path.parent, QUEUE_ERROR)
+        
         return target
     
     def _slugify(self, text: str) -> str:
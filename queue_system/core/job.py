@@ -0,0 +1,36 @@
+"""
+Job Container - Gemeinsamer Datentyp für alle Queue-Backends
+"""
+from pathlib import Path
+from typing import Optional
+from dataclasses import dataclass
+
+
+@dataclass
+class Job:
+    """
+    Job Container
+
+    === FIELDS ===
+    - file_path: Path zum .txt File in processing/ (None bei SQLite Backend)
+    - meta_path: Path zum .json File (None bei SQLite Backend)
+    - content: Meta-Prompt Text
+    - metadata: Job Metadata (topic, style, gpt_quality, etc.)
+    - filename: Original Filename
+    - job_id: Row-ID im SQLite Backend (None bei Directory Backend)
+
+    === UID ===
+    uid: stabile, backend-unabhängige Job-ID (metadata["job_uid"],
+    sonst Filename ohne .txt) - verbindet processed-Metadata mit dem
+    Eintrag im Calibration-Log
+    """
+    file_path: Optional[Path]
+    meta_path: Optional[Path]
+    content: str
+    metadata: dict
+    filename: str
+    job_id: Optional[int] = None
+
+    @property
+    def uid(self) -> str:
+        return self.metadata.get("job_uid") or Path(self.filename).stem
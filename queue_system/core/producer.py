@@ -4,19 +4,21 @@ Intelligent Producer - Queue-Aware GPT Prompt Generator
 === ZWECK ===
 Produziert Prompts NUR wenn Queue sie braucht
 Nutzt QueueManager für Entscheidung
-Nutzt FileHandler für Atomic Writes
+Nutzt QueueBackend für Atomic Writes
 
 === FLOW ===
 1. Check: Soll produziert werden? (QueueManager)
 2. Ja → Wähle Topics aus
-3. Generiere via GPT
-4. Schreibe in Queue (FileHandler)
-5. Log Production Event
+3. Generiere via GPT (parallel, RPM/TPM Token-Buckets)
+4. Near-Duplicate Check (PromptDeduplicator)
+5. Schreibe in Queue (QueueBackend)
+6. Log Production Event
 
 === KEIN BLIND PRODUCING ===
 Nicht: "Generiere immer 20"
 Sondern: "Frag Queue ob nötig, dann wie viel"
 """
+import random
 import sys
 from pathlib import Path
 from datetime import datetime
@@ -25,11 +27,12 @@ from typing import List, Tuple
 # Add parent to path für GPT Generator Import
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from gpt_generator.syntx_prompt_generator import generate_prompt
+from gpt_generator.parallel_generator import generate_parallel, GPT_CONCURRENCY
 from gpt_generator.topics_database import get_random_topics
 
 from .queue_manager import QueueManager
-from .file_handler import FileHandler
+from .queue_backend import get_backend
+from .dedup import get_deduplicator
 
 
 class IntelligentProducer:
@@ -41,17 +44,22 @@ class IntelligentProducer:
     
     === DEPENDENCIES ===
     - QueueManager: Für Decision Logic
-    - FileHandler: Für Atomic Writes
-    - GPT Generator: Für Prompt Creation
+    - QueueBackend: Für Atomic Writes (directory | sqlite)
+    - PromptDeduplicator: Near-Duplicates nicht nochmal durch Llama schicken
+    - GPT Generator: Für Prompt Creation (generate_parallel)
     - Topics Database: Für Topic Selection
     """
     
-    def __init__(self):
+    def __init__(self, concurrency: int = GPT_CONCURRENCY):
         """
         Initialisiert Producer mit Dependencies
+        
+        concurrency: parallele GPT Requests (1 = sequenziell wie früher)
         """
         self.queue_manager = QueueManager()
-        self.file_handler = FileHandler()
+        self.backend = get_backend()
+        self.dedup = get_deduplicator()
+        self.concurrency = concurrency
     
     def run(self, force: bool = False) -> dict:
         """
@@ -75,6 +83,7 @@ class IntelligentProducer:
         - should_produce: bool
         - requested_count: int
         - produced_count: int
+        - duplicate_count: int
         - skipped: bool
         - duration_seconds: float
         """
@@ -102,58 +111,30 @@ class IntelligentProducer:
         print(f"🔧 Producer aktiviert - Generiere {count} Prompts...")
         
         # === PRODUCTION PHASE ===
-        # Topics wählen
+        # Topics + Style (random wie in batch_generator) wählen
         topics = get_random_topics(count)
+        jobs = [
+            {
+                "prompt": topic,
+                "style": random.choice(['technisch', 'kreativ', 'akademisch', 'casual']),
+                "category": category,
+                "max_tokens": 400,
+                "max_refusal_retries": 3
+            }
+            for category, topic in topics
+        ]
         
-        success_count = 0
-        failed_count = 0
+        counts = {"success": 0, "failed": 0, "duplicates": 0, "done": 0}
         
-        # Für jeden Topic: GPT → Queue
-        for i, (category, topic) in enumerate(topics, 1):
-            print(f"[{i}/{count}] {category}: {topic}")
-            
-            # Style random wählen (wie in batch_generator)
-            import random
-            style = random.choice(['technisch', 'kreativ', 'akademisch', 'casual'])
-            
-            # GPT generieren
-            result = generate_prompt(
-                prompt=topic,
-                style=style,
-                category=category,
-                max_tokens=400,
-                max_refusal_retries=3
-            )
-            
-            if result['success']:
-                # In Queue schreiben (atomic)
-                meta_prompt = result['prompt_generated']
-                
-                metadata = {
-                    "topic": topic,
-                    "style": style,
-                    "category": category,
-                    "gpt_quality": result['quality_score'],
-                    "gpt_cost": result['cost'],
-                    "producer_run": datetime.now().isoformat()
-                }
-                
-                try:
-                    # Atomic write to queue
-                    from ..config.queue_config import QUEUE_INCOMING
-                    self.file_handler.atomic_write(
-                        content=meta_prompt,
-                        metadata=metadata,
-                        target_dir=QUEUE_INCOMING
-                    )
-                    success_count += 1
-                    print(f"   ✅ In Queue geschrieben")
-                except Exception as e:
-                    print(f"   ❌ Queue Write Failed: {e}")
-                    failed_count += 1
-            else:
-                print(f"   ❌ GPT Failed: {result.get('error')}")
-                failed_count += 1
+        # GPT parallel (Rate-Limit-aware) → jedes Ergebnis sofort in die Queue
+        generation = generate_parallel(
+            jobs,
+            on_result=lambda job, result: self._write_result(job, result, counts, len(jobs)),
+            concurrency=self.concurrency
+        )
+        success_count = counts["success"]
+        failed_count = counts["failed"]
+        duplicate_count = counts["duplicates"]
         
         # === STATS ===
         duration = (datetime.now() - start_time).total_seconds()
@@ -163,6 +144,9 @@ class IntelligentProducer:
             "requested_count": count,
             "produced_count": success_count,
             "failed_count": failed_count,
+            "duplicate_count": duplicate_count,
+            "concurrency": self.concurrency,
+            "rate_limited_seconds": generation["rate_limited_seconds"],
             "skipped": False,
             "duration_seconds": duration
         }
@@ -170,9 +154,61 @@ class IntelligentProducer:
         print(f"\n✅ Production Complete:")
         print(f"   Success: {success_count}/{count}")
         print(f"   Failed: {failed_count}")
+        print(f"   Duplicates: {duplicate_count}")
         print(f"   Duration: {duration:.1f}s")
         
         return stats
+    
+    def _write_result(self, job: dict, result: dict, counts: dict, total: int) -> None:
+        """
+        Ein GPT-Ergebnis → Dedup-Check → Queue (läuft im Producer-Thread)
+        """
+        counts["done"] += 1
+        print(f"[{counts['done']}/{total}] {job['category']}: {job['prompt']}")
+        
+        if not result['success']:
+            print(f"   ❌ GPT Failed: {result.get('error')}")
+            counts["failed"] += 1
+            return
+        
+        meta_prompt = result['prompt_generated']
+        metadata = {
+            "topic": job['prompt'],
+            "style": job['style'],
+            "category": job['category'],
+            "gpt_quality": result['quality_score'],
+            "gpt_cost": result['cost'],
+            "producer_run": datetime.now().isoformat()
+        }
+        
+        # Near-Duplicate? drop → nicht schreiben, flag → Metadata markiert
+        try:
+            verdict = self.dedup.screen(meta_prompt, metadata)
+        except Exception as e:
+            print(f"   ⚠️  Dedup check failed: {e}")
+            verdict = None
+        if verdict is not None and verdict.is_duplicate:
+            counts["duplicates"] += 1
+            print(f"   ♻️  Duplicate of {verdict.match} ({verdict.similarity:.2f}) → {verdict.action}")
+            if verdict.action == "drop":
+                return
+        
+        try:
+            # Atomic write to queue
+            filename = self.backend.enqueue(
+                content=meta_prompt,
+                metadata=metadata
+            )
+            if verdict is not None:
+                try:
+                    self.dedup.register(filename, verdict, job['prompt'])
+                except Exception as e:
+                    print(f"   ⚠️  Dedup register failed: {e}")
+            counts["success"] += 1
+            print(f"   ✅ In Queue geschrieben")
+        except Exception as e:
+            print(f"   ❌ Queue Write Failed: {e}")
+            counts["failed"] += 1
 
 
 # === MAIN BLOCK ===
@@ -22,11 +22,11 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from queue_system.core.language_rotation import rotator, Language
 from queue_system.core.queue_manager import QueueManager
-from queue_system.core.file_handler import FileHandler
+from queue_system.core.queue_backend import get_backend
 from gpt_generator.topics_database import get_random_topics
 
-# Import OpenAI for direct generation
-from openai import OpenAI
+# Geteilter OpenAI Client (ein Connection Pool pro Prozess)
+from gpt_generator.openai_client import get_openai_client
 
 
 class MultilingualProducer:
@@ -41,9 +41,9 @@ class MultilingualProducer:
     
     def __init__(self):
         self.queue_manager = QueueManager()
-        self.file_handler = FileHandler()
+        self.backend = get_backend()
         self.rotator = rotator
-        self.client = OpenAI()
+        self.client = get_openai_client()
         
     def run(self, force: bool = False, count: Optional[int] = None) -> Dict:
         """
@@ -110,10 +110,9 @@ class MultilingualProducer:
                         'multilingual': True
                     }
                     
-                    self.file_handler.atomic_write(
+                    self.backend.enqueue(
                         content=result['prompt_generated'],
-                        metadata=metadata,
-                        target_dir=Path('queue/incoming')
+                        metadata=metadata
                     )
                     
                     produced += 1
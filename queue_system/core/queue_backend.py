@@ -0,0 +1,205 @@
+"""
+Queue Backend - Pluggable Storage für Jobs
+
+=== ZWECK ===
+Trennt WIE Jobs gespeichert werden von WAS Consumer/Producer tun.
+Consumer und Producer reden nur noch mit einem QueueBackend.
+
+=== BACKENDS ===
+- DirectoryBackend (Default): .txt/.json Paare die zwischen Ordnern
+  wandern (incoming/ → processing/ → processed/ | error/)
+- SQLiteBackend: Eine WAL-Datenbank mit indexierter jobs-Tabelle
+  (siehe sqlite_backend.py)
+
+=== AUSWAHL ===
+QUEUE_BACKEND in queue_config (ENV: SYNTX_QUEUE_BACKEND)
+    "directory" | "sqlite"
+
+=== VERWENDUNG ===
+    backend = get_backend()
+    backend.enqueue(content, metadata)
+    job = backend.claim_next(worker_id)
+    backend.complete(job, response)   # oder backend.fail(job, error_info)
+"""
+import json
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from .file_handler import FileHandler
+from .job import Job
+from .queue_counters import get_counters
+from ..config.queue_config import *
+
+
+# Job-States - identisch mit den Ordnernamen
+QUEUE_STATES = ("incoming", "processing", "processed", "error")
+
+
+class QueueBackend(ABC):
+    """
+    Interface für Queue Storage
+
+    === GUARANTEES (jede Implementierung) ===
+    - claim_next() ist atomic: kein Job wird doppelt vergeben
+    - complete()/fail() verlieren keinen Job
+    - fail() erhöht retry_count
+    """
+
+    name = "abstract"
+
+    @abstractmethod
+    def enqueue(self, content: str, metadata: Dict[str, Any]) -> str:
+        """Neuer Job in incoming. Returns: Filename des Jobs"""
+
+    @abstractmethod
+    def claim_next(self, worker_id: Optional[str] = None) -> Optional[Job]:
+        """Ältesten incoming Job atomar locken. Returns: Job oder None (Queue leer)"""
+
+    @abstractmethod
+    def complete(self, job: Job, response: Optional[str] = None) -> None:
+        """Job erfolgreich → processed (inkl. Response)"""
+
+    @abstractmethod
+    def fail(self, job: Job, error_info: Dict[str, Any]) -> None:
+        """Job fehlgeschlagen → error (retry_count + 1)"""
+
+    @abstractmethod
+    def counts(self) -> Dict[str, int]:
+        """Anzahl Jobs pro State: {"incoming": n, "processing": n, ...}"""
+
+    @abstractmethod
+    def list_jobs(self, state: str, limit: int = 100) -> List[Dict[str, Any]]:
+        """Metadata der ältesten Jobs eines States"""
+
+    def count(self, state: str) -> int:
+        """Anzahl Jobs in einem State"""
+        return self.counts().get(state, 0)
+
+
+class DirectoryBackend(QueueBackend):
+    """
+    Klassisches File-Queue Backend (Default)
+
+    === LOCK PATTERN ===
+    File-Based Locking via Atomic Rename:
+    - incoming/job.txt → processing/job.txt = Lock acquired
+    - Wenn rename fails → Job bereits von anderem Worker gelocked
+    """
+
+    name = "directory"
+
+    _STATE_DIRS = {
+        "incoming": QUEUE_INCOMING,
+        "processing": QUEUE_PROCESSING,
+        "processed": QUEUE_PROCESSED,
+        "error": QUEUE_ERROR,
+    }
+
+    def __init__(self):
+        self.file_handler = FileHandler()
+
+    def enqueue(self, content: str, metadata: Dict[str, Any]) -> str:
+        path = self.file_handler.atomic_write(
+            content=content,
+            metadata=metadata,
+            target_dir=QUEUE_INCOMING
+        )
+        return path.name
+
+    def claim_next(self, worker_id: Optional[str] = None) -> Optional[Job]:
+        """
+        === LOCK MECHANISM ===
+        1. Liste alle .txt Files in incoming/ (sortiert nach Timestamp)
+        2. Versuche älteste Datei: incoming/ → processing/
+        3. Wenn rename() erfolgreich → Lock acquired, return Job
+        4. Wenn FileNotFoundError → anderer Worker war schneller, try next
+        5. Wenn keine Files mehr → return None (Queue leer)
+        """
+        # Get all .txt files EXCEPT _response.txt files!
+        all_txt_files = sorted(QUEUE_INCOMING.glob("*.txt"))
+        incoming_files = [f for f in all_txt_files if not f.name.endswith('_response.txt')]
+
+        for file_path in incoming_files:
+            try:
+                # Atomic rename = Lock (+ Zähler-Update)
+                processing_path = self.file_handler.move_to_processing(file_path)
+                return self._load_job(processing_path, processing_path.with_suffix('.json'))
+
+            except FileNotFoundError:
+                # Anderer Worker war schneller
+                continue
+            except Exception as e:
+                print(f"⚠️  Error locking {file_path.name}: {e}")
+                continue
+
+        return None
+
+    def _load_job(self, file_path: Path, meta_path: Path) -> Job:
+        """Lädt Job-Content + Metadata aus processing/"""
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        if meta_path.exists():
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+        else:
+            metadata = {}
+
+        return Job(
+            file_path=file_path,
+            meta_path=meta_path,
+            content=content,
+            metadata=metadata,
+            filename=file_path.name
+        )
+
+    def complete(self, job: Job, response: Optional[str] = None) -> None:
+        # Move zu processed/ FIRST!
+        self.file_handler.move_to_processed(job)
+
+        # THEN save response in processed/ (not processing/!)
+        if response:
+            response_file = QUEUE_PROCESSED / (job.filename.replace('.txt', '_response.txt'))
+            with open(response_file, 'w', encoding='utf-8') as f:
+                f.write(response)
+            print(f"  💾 Response saved to: {response_file}")
+
+    def fail(self, job: Job, error_info: Dict[str, Any]) -> None:
+        self.file_handler.move_to_error(job, error_info)
+
+    def count(self, state: str) -> int:
+        return self.counts()[state]
+
+    def counts(self) -> Dict[str, int]:
+        """O(1) aus queue/.counters.db (FileHandler führt die Zähler nach)"""
+        return get_counters().get()
+
+    def list_jobs(self, state: str, limit: int = 100) -> List[Dict[str, Any]]:
+        directory = self._STATE_DIRS[state]
+        jobs = []
+        for meta_path in sorted(directory.glob("*.json"))[:limit]:
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    jobs.append(json.load(f))
+            except Exception:
+                continue
+        return jobs
+
+
+def get_backend(name: Optional[str] = None) -> QueueBackend:
+    """
+    Factory für das konfigurierte Backend
+
+    === ARGS ===
+    name: "directory" | "sqlite" (default: QUEUE_BACKEND aus Config)
+    """
+    name = (name or QUEUE_BACKEND).lower()
+
+    if name == "directory":
+        return DirectoryBackend()
+    if name == "sqlite":
+        from .sqlite_backend import SQLiteBackend
+        return SQLiteBackend()
+
+    raise ValueError(f"Unknown queue backend: {name} (expected: directory | sqlite)")
@@ -0,0 +1,182 @@
+"""
+Queue Counters - O(1) Queue-Tiefe ohne Directory-Scans
+
+=== ZWECK ===
+QueueMonitor, QueueManager und /resonanz/queue brauchen die Anzahl
+Jobs pro Ordner. Statt bei jedem Aufruf incoming/, processing/,
+processed/ und error/ zu globben, führt FileHandler bei JEDEM
+State-Übergang einen Zähler in queue/.counters.db mit.
+
+=== SCHEMA ===
+counters(state PRIMARY KEY, n)   → ein Zähler pro Queue-Ordner
+meta(key PRIMARY KEY, value)     → last_reconcile Timestamp
+
+=== ATOMIC ===
+transition("incoming", "processing") = -1/+1 in EINER Transaktion
+(WAL Mode, busy_timeout → parallele Worker warten statt zu failen)
+
+=== RECONCILIATION ===
+Wer an FileHandler vorbei schreibt (manuelles mv, Cleanup-Scripts,
+abgestürzter Worker) verfälscht die Zähler. Deshalb scannt get()
+spätestens alle COUNTERS_RECONCILE_SECONDS einmal die Ordner und
+überschreibt die Zähler mit den echten Werten.
+
+=== WAS WIRD GEZÄHLT ===
+Jobs = .txt Files OHNE *_response.txt (Responses sind keine Jobs)
+
+=== VERWENDUNG ===
+    counters = get_counters()
+    counters.transition("incoming", "processing")
+    counters.get()   # → {"incoming": 12, "processing": 2, ...}
+"""
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from ..config.queue_config import *
+
+
+# Queue-Ordner mit Zählern
+COUNTED_STATES = ("incoming", "processing", "processed", "error")
+
+
+class QueueCounters:
+    """
+    Persistente Job-Zähler pro Queue-Ordner
+
+    === THREAD-SAFETY ===
+    Eine SQLite Connection pro Thread
+    """
+
+    def __init__(self, queue_base: Path = QUEUE_BASE, reconcile_seconds: int = COUNTERS_RECONCILE_SECONDS):
+        self.queue_base = Path(queue_base)
+        self.db_path = self.queue_base / ".counters.db"
+        self.reconcile_seconds = reconcile_seconds
+        self._local = threading.local()
+
+    # ========================================================================
+    # CONNECTION
+    # ========================================================================
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.queue_base.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS counters (state TEXT PRIMARY KEY, n INTEGER NOT NULL DEFAULT 0);
+                CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            """)
+            conn.executemany(
+                "INSERT OR IGNORE INTO counters (state, n) VALUES (?, 0)",
+                [(s,) for s in COUNTED_STATES]
+            )
+            self._local.conn = conn
+        return conn
+
+    # ========================================================================
+    # UPDATES (FileHandler)
+    # ========================================================================
+
+    def adjust(self, state: str, delta: int) -> None:
+        """Zähler eines Ordners um delta ändern (unbekannte Ordner → ignoriert)"""
+        if state not in COUNTED_STATES:
+            return
+        self._connect().execute("UPDATE counters SET n = MAX(n + ?, 0) WHERE state = ?", (delta, state))
+
+    def transition(self, from_state: Optional[str], to_state: Optional[str]) -> None:
+        """Job wechselt Ordner: from -1, to +1 in einer Transaktion"""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if from_state in COUNTED_STATES:
+                conn.execute("UPDATE counters SET n = MAX(n - 1, 0) WHERE state = ?", (from_state,))
+            if to_state in COUNTED_STATES:
+                conn.execute("UPDATE counters SET n = n + 1 WHERE state = ?", (to_state,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    # ========================================================================
+    # READS (Monitor, Manager, API)
+    # ========================================================================
+
+    def get(self) -> Dict[str, int]:
+        """
+        Aktuelle Zähler - O(1)
+
+        Reconciliation-Scan nur wenn der letzte länger als
+        reconcile_seconds her ist (oder noch nie lief)
+        """
+        conn = self._connect()
+        row = conn.execute("SELECT value FROM meta WHERE key = 'last_reconcile'").fetchone()
+        if row is None or time.time() - float(row[0]) > self.reconcile_seconds:
+            return self.reconcile()
+
+        counts = {state: 0 for state in COUNTED_STATES}
+        for state, n in conn.execute("SELECT state, n FROM counters"):
+            counts[state] = n
+        return counts
+
+    def reconcile(self) -> Dict[str, int]:
+        """Ordner scannen und Zähler mit echten Werten überschreiben"""
+        counts = {state: self._scan(self.queue_base / state) for state in COUNTED_STATES}
+
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "UPDATE counters SET n = ? WHERE state = ?",
+                [(n, state) for state, n in counts.items()]
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('last_reconcile', ?)",
+                (str(time.time()),)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return counts
+
+    @staticmethod
+    def _scan(directory: Path) -> int:
+        """Jobs in einem Ordner zählen (scandir, kein stat pro File)"""
+        if not directory.exists():
+            return 0
+        with os.scandir(directory) as it:
+            return sum(
+                1 for e in it
+                if e.name.endswith('.txt') and not e.name.endswith('_response.txt')
+            )
+
+
+# ============================================================================
+# SHARED INSTANCES - eine pro Queue-Basis und Prozess
+# ============================================================================
+
+_counters: Dict[str, QueueCounters] = {}
+_counters_lock = threading.Lock()
+
+
+def get_counters(queue_base: Path = QUEUE_BASE) -> QueueCounters:
+    """Shared QueueCounters für eine Queue-Basis"""
+    key = str(Path(queue_base).resolve())
+    with _counters_lock:
+        if key not in _counters:
+            _counters[key] = QueueCounters(queue_base)
+        return _counters[key]
+
+
+# === MAIN BLOCK ===
+if __name__ == "__main__":
+    # Quick Test - Zähler vs. echter Scan
+    counters = get_counters()
+    print(f"Counters:  {counters.get()}")
+    print(f"Reconcile: {counters.reconcile()}")
@@ -19,7 +19,7 @@ State-basiert:
 - OVERFLOW → Produziere nichts + Alert
 """
 from datetime import datetime, timedelta
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, Optional
 
 # Imports
 from ..monitoring.queue_monitor import QueueMonitor
@@ -53,7 +53,7 @@ class QueueManager:
         """
         self.monitor = QueueMonitor()
     
-    def should_produce(self) -> Tuple[bool, int]:
+    def should_produce(self, status: Optional[Dict[str, Any]] = None) -> Tuple[bool, int]:
         """
         Entscheidet ob produziert werden soll
         
@@ -84,6 +84,9 @@ class QueueManager:
             → Consumer kommt nicht hinterher
             → Monitoring sollte Alert senden
         
+        === ARGS ===
+        status: Optional bereits geholter Monitor-Status
+        
         === RETURNS ===
         (should_produce, how_many)
         - should_produce: bool - Soll GPT aktiviert werden?
@@ -96,8 +99,9 @@ class QueueManager:
         Queue hat 30 → (False, 0)
         Queue hat 100 → (False, 0)
         """
-        # Status vom Monitor holen
-        status = self.monitor.get_status()
+        # Status vom Monitor holen (wenn nicht schon übergeben)
+        if status is None:
+            status = self.monitor.get_status()
         queue_count = status['queue']['incoming']
         state = status['state']
         
@@ -160,8 +164,8 @@ class QueueManager:
         # Queue Status vom Monitor
         status = self.monitor.get_status()
         
-        # Producer Decision
-        should_run, batch_size = self.should_produce()
+        # Producer Decision (gleicher Snapshot - kein zweiter Monitor-Call)
+        should_run, batch_size = self.should_produce(status)
         
         # Health Check
         health = self._determine_health(status)
@@ -0,0 +1,328 @@
+"""
+Rescorer - Historische Scores mit aktuellem Scorer neu berechnen
+
+=== ZWECK ===
+Nach Änderungen an SYNTX_SCORER_V2, Feld-Definitionen oder
+scorer_v2.WEIGHTS sind die Scores in processed/ und archive/ nicht
+mehr vergleichbar. Der Rescorer berechnet sie für alle Jobs neu.
+
+=== FLOW ===
+1. processed/ + archive/ streamen (scandir, keine komplette File-Liste)
+2. Pro Job: Metadata (.json) + Response (_response.txt, Fallback:
+   syntex_result.response_text - archive/ hat keine _response.txt)
+3. Jobs in Chunks an einen ProcessPool
+4. Worker: SyntexParser → alle Feld-Texte des Chunks in EINEM
+   Encoder-Call (füllt den Embedding-Cache) → Scorer pro Job
+5. Ergebnis nach queue/rescored/<scorer_version>/<job>.json
+
+=== NICHT-BLOCKIEREND ===
+- Liest nur, verschiebt/überschreibt keine Queue-Files
+  (Jobs die währenddessen archiviert werden → einfach übersprungen)
+- Worker laufen mit nice +10 → Live-Consumer hat Vorrang
+- Scores liegen NEBEN den Originalen, versioniert pro Scorer
+
+=== SCORER VERSION ===
+v2-<hash>     = sha1 über WEIGHTS + Feld-Definitionen aller Formate
+legacy-<hash> = sha1 über die Feld-Weights des Legacy-Scorers
+Gleiche Version → bereits gescorte Jobs werden übersprungen (resumable)
+
+=== VERWENDUNG ===
+    python3 -m queue_system.core.rescorer
+    python3 -m queue_system.core.rescorer --scorer v2 --workers 4 --limit 100
+    python3 -m queue_system.core.rescorer --source archive --force
+"""
+import hashlib
+import itertools
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+# Add parent for SYNTX imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ..config.queue_config import *
+
+
+RESCORE_FORMATS = ("SYNTEX_SYSTEM", "HUMAN", "SIGMA")
+
+
+# ============================================================================
+# SCORER VERSION
+# ============================================================================
+
+def scorer_version(scorer: str) -> str:
+    """
+    Stabile Version des Scorers: ändern sich Weights oder Definitionen,
+    ändert sich die Version → neuer Output-Ordner
+    """
+    if scorer == "v2":
+        from syntex_injector.syntex.analysis.scorer_v2 import WEIGHTS
+        from syntex_injector.syntex.analysis.field_definitions import get_fields_for_format
+        state = {
+            "weights": WEIGHTS,
+            "definitions": {fmt: get_fields_for_format(fmt) for fmt in RESCORE_FORMATS},
+        }
+    else:
+        from syntex_injector.syntex.analysis.scorer import SyntexScorer
+        legacy = SyntexScorer()
+        state = {k: v for k, v in vars(legacy).items() if k.endswith("_weights")}
+
+    digest = hashlib.sha1(json.dumps(state, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    return f"{scorer}-{digest[:10]}"
+
+
+# ============================================================================
+# JOB DISCOVERY (Main-Prozess)
+# ============================================================================
+
+def iter_job_files(sources: List[Path]) -> Iterator[Path]:
+    """Alle Job-Metadaten (.json) in den Quell-Ordnern - gestreamt"""
+    for source in sources:
+        if not source.exists():
+            continue
+        with os.scandir(source) as it:
+            for entry in it:
+                if entry.name.endswith(".json") and entry.is_file():
+                    yield Path(entry.path)
+
+
+def _chunks(items: Iterator[Path], size: int) -> Iterator[List[str]]:
+    chunk = []
+    for item in items:
+        chunk.append(str(item))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ============================================================================
+# WORKER (ProcessPool)
+# ============================================================================
+
+_worker: Dict = {}
+
+
+def _init_worker(scorer: str, nice: int) -> None:
+    """Einmal pro Worker-Prozess: Priorität senken, Parser/Scorer laden"""
+    if nice:
+        try:
+            os.nice(nice)
+        except OSError:
+            pass
+
+    from syntex_injector.syntex.core.parser import SyntexParser
+    _worker["scorer"] = scorer
+    _worker["parser"] = SyntexParser()
+    if scorer == "legacy":
+        from syntex_injector.syntex.analysis.scorer import SyntexScorer
+        _worker["legacy"] = SyntexScorer()
+
+
+def _load_job(meta_path: Path) -> Optional[Dict]:
+    """Metadata + Response eines Jobs (None = nicht mehr da / keine Response)"""
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            metadata = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+    response = None
+    response_path = meta_path.with_name(f"{meta_path.stem}_response.txt")
+    if not response_path.exists():
+        # archive/: _response.txt bleibt in processed/ zurück
+        response_path = meta_path.parent.parent / "processed" / response_path.name
+    try:
+        response = response_path.read_text(encoding="utf-8")
+    except OSError:
+        response = (metadata.get("syntex_result") or {}).get("response_text")
+
+    if not response or not response.strip():
+        return None
+    return {"metadata": metadata, "response": response}
+
+
+def _rescore_chunk(meta_paths: List[str], output_dir: str, version: str, force: bool) -> Dict:
+    """
+    Einen Chunk Jobs neu scoren
+
+    Alle Feld-Texte des Chunks gehen vorab in EINEM Batch durch den
+    Encoder → score_all_fields() findet sie danach im Embedding-Cache
+    """
+    output = Path(output_dir)
+    stats = {"rescored": 0, "skipped": 0, "failed": 0}
+    pending = []
+
+    for raw in meta_paths:
+        meta_path = Path(raw)
+        out_path = output / f"{meta_path.stem}.json"
+        if not force and out_path.exists():
+            stats["skipped"] += 1
+            continue
+        job = _load_job(meta_path)
+        if job is None:
+            stats["skipped"] += 1
+            continue
+        try:
+            job["fields"] = _worker["parser"].parse(job["response"])
+        except Exception:
+            stats["failed"] += 1
+            continue
+        job["meta_path"] = meta_path
+        job["out_path"] = out_path
+        pending.append(job)
+
+    if _worker["scorer"] == "v2" and pending:
+        from syntex_injector.syntex.analysis.embeddings import get_embeddings
+        texts = [v for job in pending for v in job["fields"].to_dict().values() if v]
+        get_embeddings(texts)
+
+    for job in pending:
+        try:
+            fields = job["fields"]
+            if _worker["scorer"] == "v2":
+                from syntex_injector.syntex.analysis.scorer_v2 import score_all_fields
+                fields_dict = {k: v for k, v in fields.to_dict().items() if v}
+                quality = score_all_fields(fields_dict, fields.get_format())
+            else:
+                quality = _worker["legacy"].score(fields, job["response"])
+
+            previous = (job["metadata"].get("syntex_result") or {}).get("quality_score") or {}
+            result = {
+                "filename": job["meta_path"].with_suffix(".txt").name,
+                "source": job["meta_path"].parent.name,
+                "scorer_version": version,
+                "rescored_at": datetime.now().isoformat(),
+                "format": fields.get_format(),
+                "previous_total_score": previous.get("total_score"),
+                "quality_score": quality.to_dict(),
+            }
+            tmp_path = job["out_path"].with_suffix(".json.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(result, f, indent=2, ensure_ascii=False)
+            tmp_path.rename(job["out_path"])
+            stats["rescored"] += 1
+        except Exception:
+            stats["failed"] += 1
+
+    return stats
+
+
+# ============================================================================
+# ORCHESTRIERUNG
+# ============================================================================
+
+def rescore(
+    sources: List[Path],
+    scorer: str = "v2",
+    workers: int = 2,
+    chunk_size: int = 32,
+    limit: Optional[int] = None,
+    force: bool = False,
+    nice: int = 10,
+    output_base: Path = QUEUE_BASE / "rescored"
+) -> Dict:
+    """
+    Alle Jobs der Quell-Ordner neu scoren
+
+    === RETURNS ===
+    dict mit Stats (rescored, skipped, failed, scorer_version, output, duration_seconds)
+    """
+    start_time = datetime.now()
+    version = scorer_version(scorer)
+    output_dir = Path(output_base) / version
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    stats = {"rescored": 0, "skipped": 0, "failed": 0}
+    jobs = iter_job_files(sources)
+    if limit:
+        jobs = itertools.islice(jobs, limit)
+    chunks = _chunks(jobs, chunk_size)
+
+    print(f"🔁 Rescoring {', '.join(str(s) for s in sources)}")
+    print(f"Scorer: {version} → {output_dir}")
+    print(f"Workers: {workers}, chunk size: {chunk_size}\n")
+
+    # Max. 2 Chunks pro Worker in Flight → File-Liste wird nie komplett materialisiert
+    max_in_flight = workers * 2
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(scorer, nice)) as pool:
+        in_flight = set()
+        for chunk in chunks:
+            in_flight.add(pool.submit(_rescore_chunk, chunk, str(output_dir), version, force))
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                _merge(stats, done)
+        _merge(stats, in_flight)
+
+    stats["scorer_version"] = version
+    stats["output"] = str(output_dir)
+    stats["duration_seconds"] = (datetime.now() - start_time).total_seconds()
+
+    with open(output_dir / "_summary.json", "w", encoding="utf-8") as f:
+        json.dump({**stats, "finished_at": datetime.now().isoformat()}, f, indent=2)
+
+    print(f"\n{'='*60}")
+    print(f"RESCORE COMPLETE")
+    print(f"{'='*60}")
+    print(f"Rescored: {stats['rescored']}")
+    print(f"Skipped: {stats['skipped']}")
+    print(f"Failed: {stats['failed']}")
+    print(f"Duration: {stats['duration_seconds']:.1f}s")
+    print(f"{'='*60}\n")
+
+    return stats
+
+
+def _merge(stats: Dict, futures) -> None:
+    for future in futures:
+        try:
+            chunk_stats = future.result()
+        except Exception as e:
+            print(f"❌ Chunk failed: {e}")
+            continue
+        for key, value in chunk_stats.items():
+            stats[key] += value
+        print(f"   … {stats['rescored']} rescored, {stats['skipped']} skipped, {stats['failed']} failed")
+
+
+# === MAIN BLOCK ===
+if __name__ == "__main__":
+    import argparse
+
+    default_scorer = "v2" if os.getenv("SYNTX_SCORER_V2", "false").lower() == "true" else "legacy"
+
+    parser = argparse.ArgumentParser(description="SYNTX Rescorer - processed/ + archive/ neu scoren")
+    parser.add_argument("--scorer", choices=["v2", "legacy"], default=default_scorer,
+                        help="Scorer (default: aus SYNTX_SCORER_V2)")
+    parser.add_argument("--source", choices=["all", "processed", "archive"], default="all")
+    parser.add_argument("--workers", type=int, default=2, help="Worker-Prozesse")
+    parser.add_argument("--chunk-size", type=int, default=32, help="Jobs pro Encoder-Batch")
+    parser.add_argument("--limit", type=int, default=None, help="Max. Jobs (Test)")
+    parser.add_argument("--force", action="store_true", help="Bereits gescorte Jobs erneut scoren")
+    parser.add_argument("--nice", type=int, default=10, help="Nice-Wert der Worker (0 = aus)")
+
+    args = parser.parse_args()
+
+    sources = {
+        "all": [QUEUE_PROCESSED, QUEUE_ARCHIVE],
+        "processed": [QUEUE_PROCESSED],
+        "archive": [QUEUE_ARCHIVE],
+    }[args.source]
+
+    stats = rescore(
+        sources,
+        scorer=args.scorer,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        limit=args.limit,
+        force=args.force,
+        nice=args.nice
+    )
+
+    print("=== FINAL STATS ===")
+    print(json.dumps(stats, indent=2))
@@ -0,0 +1,261 @@
+"""
+SQLite Queue Backend - Job-Store in einer WAL-Datenbank
+
+=== ZWECK ===
+Ersetzt die O(n) Directory-Scans (glob + sort + rename) durch
+indexierte Queries:
+- claim_next(): EIN atomic UPDATE ... RETURNING
+- counts():     GROUP BY state über Index
+- list_jobs():  ORDER BY id LIMIT n über Index
+
+=== SCHEMA ===
+jobs(id, filename, state, content, metadata, response,
+     retry_count, worker_id, created_at, claimed_at, finished_at)
+INDEX (state, id) → "ältester Job in State X" ist ein Index-Lookup
+
+=== CONCURRENCY ===
+- journal_mode=WAL: Reader blockieren Writer nicht
+- busy_timeout: parallele Worker warten statt "database is locked"
+- Eine Connection pro Thread (sqlite3 Connections nicht thread-safe)
+
+=== API KOMPATIBILITÄT ===
+Die API-Endpoints lesen queue/processed/*.json. Erfolgreiche Jobs
+werden deshalb zusätzlich nach processed/ exportiert (tmp + rename),
+solange QUEUE_SQLITE_EXPORT_PROCESSED aktiv ist.
+"""
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from .file_handler import FileHandler
+from .job import Job
+from .queue_backend import QueueBackend, QUEUE_STATES
+from ..config.queue_config import *
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    filename    TEXT NOT NULL UNIQUE,
+    state       TEXT NOT NULL DEFAULT 'incoming',
+    content     TEXT NOT NULL,
+    metadata    TEXT NOT NULL DEFAULT '{}',
+    response    TEXT,
+    retry_count INTEGER NOT NULL DEFAULT 0,
+    worker_id   TEXT,
+    created_at  TEXT NOT NULL,
+    claimed_at  TEXT,
+    finished_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_state_id ON jobs(state, id);
+"""
+
+
+class SQLiteBackend(QueueBackend):
+    """
+    Queue Backend auf SQLite (WAL Mode)
+
+    === CLAIM ===
+    UPDATE jobs SET state='processing', ...
+    WHERE id = (SELECT id FROM jobs WHERE state='incoming' ORDER BY id LIMIT 1)
+      AND state = 'incoming'
+    RETURNING ...
+
+    Ein Statement = eine Write-Transaktion → zwei Worker können
+    niemals denselben Job bekommen.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, db_path: Optional[Path] = None, export_processed: Optional[bool] = None):
+        self.db_path = Path(db_path or QUEUE_SQLITE_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.export_processed = QUEUE_SQLITE_EXPORT_PROCESSED if export_processed is None else export_processed
+        self.file_handler = FileHandler()
+        self._local = threading.local()
+
+        self._connect().executescript(SCHEMA)
+
+    # ========================================================================
+    # CONNECTION
+    # ========================================================================
+
+    def _connect(self) -> sqlite3.Connection:
+        """Eine Connection pro Thread (autocommit, WAL)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                str(self.db_path),
+                timeout=QUEUE_SQLITE_BUSY_TIMEOUT_MS / 1000,
+                isolation_level=None
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={QUEUE_SQLITE_BUSY_TIMEOUT_MS}")
+            self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # ========================================================================
+    # QUEUE OPERATIONS
+    # ========================================================================
+
+    def enqueue(self, content: str, metadata: Dict[str, Any]) -> str:
+        filename = self.file_handler.make_filename(metadata)
+        now = datetime.now().isoformat()
+        metadata['created_at'] = now
+        metadata['filename'] = filename
+
+        self._connect().execute(
+            "INSERT INTO jobs (filename, state, content, metadata, created_at) "
+            "VALUES (?, 'incoming', ?, ?, ?)",
+            (filename, content, json.dumps(metadata, ensure_ascii=False), now)
+        )
+        return filename
+
+    def claim_next(self, worker_id: Optional[str] = None) -> Optional[Job]:
+        row = self._connect().execute(
+            """
+            UPDATE jobs
+               SET state = 'processing', worker_id = ?, claimed_at = ?
+             WHERE id = (SELECT id FROM jobs WHERE state = 'incoming' ORDER BY id LIMIT 1)
+               AND state = 'incoming'
+            RETURNING id, filename, content, metadata
+            """,
+            (worker_id, datetime.now().isoformat())
+        ).fetchone()
+
+        if row is None:
+            return None  # Queue leer
+
+        return Job(
+            file_path=None,
+            meta_path=None,
+            content=row["content"],
+            metadata=json.loads(row["metadata"] or "{}"),
+            filename=row["filename"],
+            job_id=row["id"]
+        )
+
+    def complete(self, job: Job, response: Optional[str] = None) -> None:
+        now = datetime.now().isoformat()
+        job.metadata['processed_at'] = now
+        job.metadata['status'] = 'success'
+
+        self._connect().execute(
+            "UPDATE jobs SET state = 'processed', metadata = ?, response = ?, finished_at = ? "
+            "WHERE id = ?",
+            (json.dumps(job.metadata, ensure_ascii=False), response, now, job.job_id)
+        )
+
+        if self.export_processed:
+            self._export_processed(job, response)
+
+    def fail(self, job: Job, error_info: Dict[str, Any]) -> None:
+        now = datetime.now().isoformat()
+        metadata = job.metadata.copy()
+        retry_count = metadata.get('retry_count', 0) + 1
+        metadata['retry_count'] = retry_count
+        metadata['last_error'] = error_info
+        metadata['failed_at'] = now
+        metadata['status'] = 'error'
+
+        self._connect().execute(
+            "UPDATE jobs SET state = 'error', metadata = ?, retry_count = ?, finished_at = ? "
+            "WHERE id = ?",
+            (json.dumps(metadata, ensure_ascii=False), retry_count, now, job.job_id)
+        )
+
+    def requeue(self, job_id: int) -> bool:
+        """Error-Job zurück nach incoming (Retry)"""
+        cur = self._connect().execute(
+            "UPDATE jobs SET state = 'incoming', worker_id = NULL, claimed_at = NULL, finished_at = NULL "
+            "WHERE id = ? AND state = 'error'",
+            (job_id,)
+        )
+        return cur.rowcount == 1
+
+    def counts(self) -> Dict[str, int]:
+        result = {state: 0 for state in QUEUE_STATES}
+        for row in self._connect().execute("SELECT state, COUNT(*) AS n FROM jobs GROUP BY state"):
+            result[row["state"]] = row["n"]
+        return result
+
+    def list_jobs(self, state: str, limit: int = 100) -> List[Dict[str, Any]]:
+        rows = self._connect().execute(
+            "SELECT metadata FROM jobs WHERE state = ? ORDER BY id LIMIT ?",
+            (state, limit)
+        ).fetchall()
+        return [json.loads(r["metadata"] or "{}") for r in rows]
+
+    # ========================================================================
+    # EXPORT → processed/ (Read-Model für die API)
+    # ========================================================================
+
+    def _export_processed(self, job: Job, response: Optional[str]) -> None:
+        """Schreibt .txt/.json (+ _response.txt) atomar nach processed/"""
+        QUEUE_TMP.mkdir(parents=True, exist_ok=True)
+        QUEUE_PROCESSED.mkdir(parents=True, exist_ok=True)
+
+        files = {
+            job.filename: job.content,
+            Path(job.filename).with_suffix('.json').name: json.dumps(job.metadata, indent=2, ensure_ascii=False),
+        }
+        if response:
+            files[job.filename.replace('.txt', '_response.txt')] = response
+
+        for name, data in files.items():
+            tmp = QUEUE_TMP / name
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.write(data)
+            tmp.rename(QUEUE_PROCESSED / name)
+
+
+# === MAIN BLOCK ===
+if __name__ == "__main__":
+    import tempfile
+    from concurrent.futures import ThreadPoolExecutor
+
+    print("=== SQLITE BACKEND TEST ===\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = SQLiteBackend(db_path=Path(tmp) / "queue.db", export_processed=False)
+
+        for i in range(50):
+            backend.enqueue(f"Meta-Prompt {i}", {"topic": f"Topic {i}", "style": "technisch"})
+        print(f"Enqueued: {backend.counts()}")
+
+        # Parallel claimen - kein Job darf doppelt vergeben werden
+        def worker(n):
+            claimed = []
+            while True:
+                job = backend.claim_next(f"worker_{n}")
+                if not job:
+                    return claimed
+                claimed.append(job)
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            jobs = [j for batch in pool.map(worker, range(4)) for j in batch]
+
+        ids = [j.job_id for j in jobs]
+        assert len(ids) == len(set(ids)) == 50, "Doppelter Claim!"
+        print(f"Claimed: {len(ids)} unique jobs")
+
+        for job in jobs[:45]:
+            backend.complete(job, response=f"Response {job.job_id}")
+        for job in jobs[45:]:
+            backend.fail(job, {"error": "test"})
+
+        counts = backend.counts()
+        print(f"Final:   {counts}")
+        assert counts["processed"] == 45 and counts["error"] == 5
+        print("\n✅ OK")
@@ -0,0 +1,511 @@
+"""
+Calibration Stats - Rollende Aggregate über alle Kalibrierungen
+
+=== ZWECK ===
+/analytics/success-rate*, /analytics/scores/distribution und
+/resonanz/system haben bei jedem Aufruf alle processed-Files gelesen
+und Zähler/Durchschnitte neu berechnet. Stattdessen führt der Consumer
+bei JEDEM abgeschlossenen Job die Aggregate nach - die Endpoints lesen
+nur noch ein paar Zeilen aus queue/.stats.db.
+
+=== SCHEMA ===
+agg(dim, key, ...)         → Zähler pro Dimension + Wert
+    dim = total | wrapper | topic | style | hour
+    key = ''    | sigma   | KI     | kreativ | 2025-12-10T14
+    jobs, success, failed, scored, score_sum, perfect,
+    duration_sum, duration_n, time_sum
+    + Momente: score_m2, duration_m2, time_m2, time_score_c
+hist(dim, key, score, n)   → Score-Histogramm (abgerundete Scores 0-100)
+                              → beliebige Buckets, Median, Mode exakt
+meta(key, value)           → backfilled_at, rebuild_started, score_buckets
+journal(seq, rows, hist)   → Deltas die während eines rebuild() ankommen
+
+=== MOMENTE (Welford / Chan et al.) ===
+Varianz und Score-Trend werden pro Job in O(1) nachgeführt, ohne die
+Einzelwerte zu kennen. Jede Zeile ist ein Teil-Aggregat (n, Summen, M2);
+Upsert und rebuild() kombinieren per parallelem Merge:
+
+    M2 = M2_a + M2_b + (mean_b - mean_a)² · n_a·n_b / (n_a + n_b)
+
+→ reihenfolgeunabhängig, gleiche Rekurrenz wie RunningStats.merge /
+OnlineRegression.merge in api-core/utils/algorithms.py.
+time = Stunden seit Epoch → time_score_c / time_m2 = Score-Steigung pro Stunde
+
+=== BACKFILL ===
+Leere DB → einmalig processed/ + archive/ + error/ Metadata einlesen
+(rebuild()). Danach nur noch inkrementell via record_job().
+
+rebuild() setzt VOR dem Listing rebuild_started (High-Water-Mark):
+- Scan zählt nur Jobs die vorher abgeschlossen wurden (processed_at/failed_at)
+- record_job() für später abgeschlossene Jobs schreibt zusätzlich ins journal
+- Ersetzen = DELETE + Scan + journal in EINER Transaktion
+→ kein Consumer-Update geht verloren, keins wird doppelt gezählt
+
+=== ZEITRAUM ===
+Aggregate sind all-time: archivierte Jobs bleiben enthalten.
+
+=== VERWENDUNG ===
+    stats = get_calibration_stats()
+    stats.record_job(job.metadata, success=True, score=92, duration_ms=8400)
+    stats.get("wrapper")      # → {"sigma": {"jobs": 120, ...}, ...}
+    stats.histogram()         # → {92: 14, 100: 30, ...}
+"""
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..config.queue_config import *
+
+
+STATS_DIMENSIONS = ("total", "wrapper", "topic", "style", "hour")
+
+_AGG_COLUMNS = ("jobs", "success", "failed", "scored", "score_sum", "perfect", "duration_sum", "duration_n", "time_sum")
+
+# (Spalte, n, Summe a, Summe b) → Co-Moment Σ(a - ā)(b - b̄) über n Werte
+_MOMENTS = (
+    ("score_m2", "scored", "score_sum", "score_sum"),
+    ("duration_m2", "duration_n", "duration_sum", "duration_sum"),
+    ("time_m2", "scored", "time_sum", "time_sum"),
+    ("time_score_c", "scored", "time_sum", "score_sum"),
+)
+
+_ALL_COLUMNS = _AGG_COLUMNS + tuple(m[0] for m in _MOMENTS)
+_COLUMN_INDEX = {c: i for i, c in enumerate(_ALL_COLUMNS)}
+
+
+def _score_value(raw) -> Optional[float]:
+    """quality_score.total_score → float, ungerundet (None = kein Score)"""
+    if raw is None:
+        return None
+    try:
+        return float(raw)
+    except (TypeError, ValueError):
+        return None
+
+
+def _score_bucket(score: float) -> int:
+    """Histogramm-Bucket 0-100 - abgerundet wie die Bereiche 80-99 / 50-79 (99.6 → 99)"""
+    return max(0, min(100, math.floor(score)))
+
+
+def _hour_key(timestamp: Optional[str]) -> str:
+    """ISO Timestamp → "YYYY-MM-DDTHH" (unbekannt → jetzt)"""
+    if timestamp and len(timestamp) >= 13:
+        return timestamp[:13]
+    return datetime.now().strftime("%Y-%m-%dT%H")
+
+
+def _time_value(timestamp: Optional[str]) -> float:
+    """ISO Timestamp → Stunden seit Epoch (unbekannt → jetzt)"""
+    try:
+        return datetime.fromisoformat(timestamp).timestamp() / 3600
+    except (TypeError, ValueError):
+        return time.time() / 3600
+
+
+def _merge_moments(totals: List[float], delta: Tuple) -> None:
+    """delta (Spalten wie _ALL_COLUMNS) in totals einrechnen - Python-Pendant zum Upsert"""
+    col = _COLUMN_INDEX
+    for moment, n, a, b in _MOMENTS:
+        n_a, n_b = totals[col[n]], delta[col[n]]
+        if n_a and n_b:
+            da = delta[col[a]] / n_b - totals[col[a]] / n_a
+            db = delta[col[b]] / n_b - totals[col[b]] / n_a
+            totals[col[moment]] += delta[col[moment]] + da * db * n_a * n_b / (n_a + n_b)
+        else:
+            totals[col[moment]] += delta[col[moment]]
+    for c in _AGG_COLUMNS:
+        totals[col[c]] += delta[col[c]]
+
+
+def _merge_moment_sql(moment: str, n: str, a: str, b: str) -> str:
+    """SET-Ausdruck für den Upsert (alte Werte = Spaltenname, neue = excluded.*)"""
+    return (
+        f"{moment} = {moment} + excluded.{moment} + CASE WHEN {n} > 0 AND excluded.{n} > 0 THEN "
+        f"(excluded.{a} / excluded.{n} - {a} / {n}) * (excluded.{b} / excluded.{n} - {b} / {n}) "
+        f"* {n} * excluded.{n} / ({n} + excluded.{n}) ELSE 0 END"
+    )
+
+
+def _dimension_keys(metadata: Dict, wrapper: Optional[str], timestamp: Optional[str]) -> List[Tuple[str, str]]:
+    return [
+        ("total", ""),
+        ("wrapper", wrapper or "unknown"),
+        ("topic", metadata.get("topic") or "unknown"),
+        ("style", metadata.get("style") or "unknown"),
+        ("hour", _hour_key(timestamp)),
+    ]
+
+
+class CalibrationStats:
+    """
+    Persistente Aggregate pro Wrapper / Topic / Style / Stunde
+
+    === THREAD-SAFETY ===
+    Eine SQLite Connection pro Thread, Updates in EINER Transaktion
+    """
+
+    def __init__(self, queue_base: Path = QUEUE_BASE):
+        self.queue_base = Path(queue_base)
+        self.db_path = self.queue_base / ".stats.db"
+        self._local = threading.local()
+        self._rebuild_lock = threading.Lock()
+
+    # ========================================================================
+    # CONNECTION
+    # ========================================================================
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.queue_base.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(f"""
+                CREATE TABLE IF NOT EXISTS agg (
+                    dim TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    {", ".join(f"{c} REAL NOT NULL DEFAULT 0" for c in _ALL_COLUMNS)},
+                    PRIMARY KEY (dim, key)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS hist (
+                    dim TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    score INTEGER NOT NULL,
+                    n INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (dim, key, score)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+                CREATE TABLE IF NOT EXISTS journal (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    rows TEXT NOT NULL,
+                    hist TEXT NOT NULL
+                );
+            """)
+            self._migrate(conn)
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection) -> None:
+        """
+        Ältere DBs: fehlende Spalten anlegen, Momente per Backfill neu berechnen lassen
+
+        score_buckets != floor → Aggregate stammen aus gerundeten Scores
+        (99.6 zählte als perfekt) → ebenfalls neu aufbauen
+        """
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(agg)")}
+        missing = [c for c in _ALL_COLUMNS if c not in existing]
+        for column in missing:
+            try:
+                conn.execute(f"ALTER TABLE agg ADD COLUMN {column} REAL NOT NULL DEFAULT 0")
+            except sqlite3.OperationalError:
+                pass  # parallel von anderem Prozess angelegt
+        buckets = conn.execute("SELECT value FROM meta WHERE key = 'score_buckets'").fetchone()
+        if missing or buckets is None or buckets[0] != "floor":
+            conn.execute("DELETE FROM meta WHERE key = 'backfilled_at'")
+
+    # ========================================================================
+    # UPDATES (Consumer)
+    # ========================================================================
+
+    @staticmethod
+    def _job_rows(metadata: Dict, success: bool, score: Optional[float], duration_ms: Optional[float],
+                  wrapper: Optional[str], timestamp: Optional[str]) -> Iterable[Tuple]:
+        """(dim, key, delta-Spalten...) pro Dimension - Spalten wie _ALL_COLUMNS"""
+        delta = (
+            1,
+            1 if success else 0,
+            0 if success else 1,
+            1 if score is not None else 0,
+            score or 0,
+            1 if score is not None and score >= 100 else 0,
+            float(duration_ms or 0),
+            1 if duration_ms else 0,
+            _time_value(timestamp) if score is not None else 0.0,
+        ) + (0.0,) * len(_MOMENTS)
+        for dim, key in _dimension_keys(metadata, wrapper, timestamp):
+            yield (dim, key) + delta
+
+    def _apply(self, conn: sqlite3.Connection, rows: List[Tuple], hist_rows: List[Tuple]) -> None:
+        placeholders = ", ".join("?" * (2 + len(_ALL_COLUMNS)))
+        # Alle SET-Ausdrücke sehen die ALTEN Zeilenwerte → Momente vor den Summen korrekt
+        updates = ", ".join(
+            [_merge_moment_sql(*m) for m in _MOMENTS] + [f"{c} = {c} + excluded.{c}" for c in _AGG_COLUMNS]
+        )
+        conn.executemany(
+            f"INSERT INTO agg (dim, key, {', '.join(_ALL_COLUMNS)}) VALUES ({placeholders}) "
+            f"ON CONFLICT (dim, key) DO UPDATE SET {updates}",
+            rows
+        )
+        conn.executemany(
+            "INSERT INTO hist (dim, key, score, n) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (dim, key, score) DO UPDATE SET n = n + excluded.n",
+            hist_rows
+        )
+
+    def record_job(self, metadata: Dict, success: bool, score=None, duration_ms: Optional[float] = None,
+                   wrapper: Optional[str] = None, timestamp: Optional[str] = None) -> None:
+        """
+        Einen abgeschlossenen Job (success oder error) einrechnen
+
+        === ARGS ===
+        metadata: Job-Metadata (topic, style)
+        success: processed (True) oder error (False)
+        score: quality_score.total_score (nur bei success sinnvoll)
+        duration_ms: Dauer der Kalibrierung
+        wrapper: Wrapper-Name
+        timestamp: ISO Timestamp (default: jetzt)
+        """
+        score = _score_value(score) if success else None
+        timestamp = timestamp or datetime.now().isoformat()
+        rows = list(self._job_rows(metadata, success, score, duration_ms, wrapper, timestamp))
+        hist_rows = [(r[0], r[1], _score_bucket(score), 1) for r in rows] if score is not None else []
+        # Abschlusszeit wie rebuild() sie liest - processed_at setzt das Backend frisch, sonst jetzt
+        completed = _time_value(metadata.get("processed_at") if success else None)
+
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._apply(conn, rows, hist_rows)
+            started = conn.execute("SELECT value FROM meta WHERE key = 'rebuild_started'").fetchone()
+            if started is not None and completed >= float(started[0]):
+                conn.execute(
+                    "INSERT INTO journal (rows, hist) VALUES (?, ?)",
+                    (json.dumps(rows), json.dumps(hist_rows))
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    # ========================================================================
+    # BACKFILL
+    # ========================================================================
+
+    def ensure_backfilled(self, sources: Optional[List[Path]] = None) -> None:
+        """Leere DB → einmal rebuild() aus processed/ + archive/"""
+        conn = self._connect()
+        if conn.execute("SELECT 1 FROM meta WHERE key = 'backfilled_at'").fetchone():
+            return
+        with self._rebuild_lock:
+            if not conn.execute("SELECT 1 FROM meta WHERE key = 'backfilled_at'").fetchone():
+                self.rebuild(sources)
+
+    def rebuild(self, sources: Optional[List[Path]] = None) -> int:
+        """
+        Aggregate komplett aus den processed-Metadaten neu berechnen
+
+        Scan läuft OHNE Lock, nur das Ersetzen ist eine Transaktion
+        → Consumer werden nicht blockiert. Jobs die nach rebuild_started
+        abgeschlossen werden, kommen aus dem journal statt aus dem Scan.
+
+        === RETURNS ===
+        Anzahl eingerechneter Jobs
+        """
+        sources = sources or [self.queue_base / d for d in ("processed", "archive", "error")]
+        agg: Dict[Tuple[str, str], List[float]] = {}
+        hist: Dict[Tuple[str, str, int], int] = {}
+        count = 0
+
+        # High-Water-Mark VOR dem Listing - ab jetzt journalt record_job()
+        conn = self._connect()
+        started = time.time() / 3600
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('rebuild_started', ?)", (repr(started),))
+
+        try:
+            for source in sources:
+                if not source.exists():
+                    continue
+                with os.scandir(source) as it:
+                    for entry in it:
+                        if not entry.name.endswith(".json"):
+                            continue
+                        try:
+                            with open(entry.path, "r", encoding="utf-8") as f:
+                                data = json.load(f)
+                        except (OSError, json.JSONDecodeError):
+                            continue
+                        if data.get("status") == "error":
+                            error = data.get("last_error") or {}
+                            success, score, result = False, None, {
+                                "duration_ms": error.get("duration_ms"), "wrapper": error.get("wrapper")
+                            }
+                        else:
+                            result = data.get("syntex_result")
+                            if not isinstance(result, dict):
+                                continue
+                            success = True
+                            score = _score_value((result.get("quality_score") or {}).get("total_score"))
+                        completed = data.get("failed_at") if not success else data.get("processed_at")
+                        if completed and _time_value(completed) >= started:
+                            continue  # kommt über das journal
+                        rows = self._job_rows(
+                            data, success, score, result.get("duration_ms"), result.get("wrapper"),
+                            data.get("processed_at") or data.get("failed_at") or data.get("created_at")
+                        )
+                        for row in rows:
+                            totals = agg.setdefault(row[:2], [0.0] * len(_ALL_COLUMNS))
+                            _merge_moments(totals, row[2:])
+                            if score is not None:
+                                bucket = row[:2] + (_score_bucket(score),)
+                                hist[bucket] = hist.get(bucket, 0) + 1
+                        count += 1
+        except BaseException:
+            # Abgebrochener Scan → record_job() hat alles schon in agg, journal verwerfen
+            conn.execute("DELETE FROM meta WHERE key = 'rebuild_started'")
+            conn.execute("DELETE FROM journal")
+            raise
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM agg")
+            conn.execute("DELETE FROM hist")
+            self._apply(
+                conn,
+                [k + tuple(v) for k, v in agg.items()],
+                [k + (n,) for k, n in hist.items()]
+            )
+            for rows, hist_rows in conn.execute("SELECT rows, hist FROM journal ORDER BY seq").fetchall():
+                self._apply(conn, [tuple(r) for r in json.loads(rows)], [tuple(h) for h in json.loads(hist_rows)])
+            conn.execute("DELETE FROM journal")
+            conn.execute("DELETE FROM meta WHERE key = 'rebuild_started'")
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('score_buckets', 'floor')")
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('backfilled_at', ?)",
+                (str(time.time()),)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return count
+
+    # ========================================================================
+    # READS (API)
+    # ========================================================================
+
+    def get(self, dim: str = "total") -> Dict[str, Dict]:
+        """
+        Aggregate einer Dimension: {key: {jobs, success, failed, scored,
+        avg_score, perfect, success_rate, avg_duration_ms, score_stdev,
+        duration_stdev_ms, score_trend_per_day}}
+        """
+        rows = self._connect().execute(
+            f"SELECT key, {', '.join(_ALL_COLUMNS)} FROM agg WHERE dim = ?", (dim,)
+        ).fetchall()
+        result = {}
+        for key, *values in rows:
+            v = dict(zip(_ALL_COLUMNS, values))
+            result[key] = {
+                "jobs": int(v["jobs"]),
+                "success": int(v["success"]),
+                "failed": int(v["failed"]),
+                "scored": int(v["scored"]),
+                "perfect": int(v["perfect"]),
+                "avg_score": round(v["score_sum"] / v["scored"], 2) if v["scored"] else 0,
+                "success_rate": round(v["perfect"] / v["scored"] * 100, 2) if v["scored"] else 0,
+                "avg_duration_ms": round(v["duration_sum"] / v["duration_n"], 1) if v["duration_n"] else 0,
+                # Stichproben-Stdev (ddof=1) wie statistics.stdev
+                "score_stdev": round(math.sqrt(max(v["score_m2"], 0) / (v["scored"] - 1)), 2) if v["scored"] > 1 else 0,
+                "duration_stdev_ms": round(math.sqrt(max(v["duration_m2"], 0) / (v["duration_n"] - 1)), 1) if v["duration_n"] > 1 else 0,
+                "score_trend_per_day": round(v["time_score_c"] / v["time_m2"] * 24, 3) if v["time_m2"] > 0 else 0,
+            }
+        return result
+
+    def totals(self) -> Dict:
+        """Aggregate über alle Jobs"""
+        return self.get("total").get("", {
+            "jobs": 0, "success": 0, "failed": 0, "scored": 0, "perfect": 0,
+            "avg_score": 0, "success_rate": 0, "avg_duration_ms": 0,
+            "score_stdev": 0, "duration_stdev_ms": 0, "score_trend_per_day": 0
+        })
+
+    def histogram(self, dim: str = "total", key: str = "") -> Dict[int, int]:
+        """Score-Histogramm {score: anzahl} (aufsteigend)"""
+        rows = self._connect().execute(
+            "SELECT score, n FROM hist WHERE dim = ? AND key = ? AND n > 0 ORDER BY score", (dim, key)
+        ).fetchall()
+        return {score: n for score, n in rows}
+
+    def recent_average(self, min_scored: int = 100) -> float:
+        """
+        Durchschnitts-Score der jüngsten Stunden, bis mindestens
+        min_scored Jobs beisammen sind (≈ "letzte N Jobs")
+        """
+        scored = 0
+        score_sum = 0.0
+        for n, s in self._connect().execute(
+            "SELECT scored, score_sum FROM agg WHERE dim = 'hour' ORDER BY key DESC"
+        ):
+            scored += n
+            score_sum += s
+            if scored >= min_scored:
+                break
+        return score_sum / scored if scored else 0.0
+
+
+# ============================================================================
+# HISTOGRAM HELPERS
+# ============================================================================
+
+def histogram_count(hist: Dict[int, int], low: float = 0, high: float = 101) -> int:
+    """Anzahl Scores mit low <= score < high"""
+    return sum(n for score, n in hist.items() if low <= score < high)
+
+
+def histogram_median(hist: Dict[int, int]):
+    """Median wie sorted(scores)[len // 2]"""
+    total = sum(hist.values())
+    if not total:
+        return 0
+    target = total // 2
+    seen = 0
+    for score in sorted(hist):
+        seen += hist[score]
+        if seen > target:
+            return score
+    return max(hist)
+
+
+def histogram_mode(hist: Dict[int, int]):
+    return max(hist.items(), key=lambda item: item[1])[0] if hist else 0
+
+
+# ============================================================================
+# SHARED INSTANCES - eine pro Queue-Basis und Prozess
+# ============================================================================
+
+_stats: Dict[str, CalibrationStats] = {}
+_stats_lock = threading.Lock()
+
+
+def get_calibration_stats(queue_base: Path = QUEUE_BASE) -> CalibrationStats:
+    """Shared CalibrationStats für eine Queue-Basis"""
+    key = str(Path(queue_base).resolve())
+    with _stats_lock:
+        if key not in _stats:
+            _stats[key] = CalibrationStats(queue_base)
+        return _stats[key]
+
+
+# === MAIN BLOCK ===
+if __name__ == "__main__":
+    import sys
+
+    stats = get_calibration_stats()
+    if "--rebuild" in sys.argv:
+        print(f"Rebuilt from {stats.rebuild()} jobs")
+    else:
+        stats.ensure_backfilled()
+    print(f"Totals:   {stats.totals()}")
+    print(f"Wrappers: {json.dumps(stats.get('wrapper'), indent=2)}")
+    hist = stats.histogram()
+    print(f"Median:   {histogram_median(hist)}  Mode: {histogram_mode(hist)}")
@@ -7,7 +7,8 @@ Es zählt Jobs in allen Queue-Ordnern und bestimmt den System-Zustand.
 
 === ARCHITEKTUR ===
 - Keine State-Speicherung (stateless)
-- Jeder Aufruf liest direkt vom Filesystem
+- Counts kommen vom QueueBackend (Directory: queue/.counters.db,
+  SQLite: jobs-Tabelle) - O(1) statt Directory-Scan
 - Pure Functions - nur Zählen und Analysieren
 - Kein Locking nötig (nur lesend)
 
@@ -22,6 +23,7 @@ from datetime import datetime
 
 # Config importieren (Pfade + Thresholds)
 from ..config.queue_config import *
+from ..core.queue_backend import QueueBackend, get_backend
 
 
 class QueueMonitor:
@@ -36,10 +38,17 @@ class QueueMonitor:
     Mehrere Monitor-Instanzen können parallel laufen
     
     === PERFORMANCE ===
-    O(n) pro count Operation wo n = Anzahl Dateien im Ordner
-    Bei 1000 Dateien: ~1-2ms pro Operation
+    O(1) pro count Operation (persistente Zähler, siehe queue_counters.py)
+    Reconciliation-Scan höchstens alle COUNTERS_RECONCILE_SECONDS
     """
     
+    def __init__(self, backend: QueueBackend = None):
+        """
+        === ARGS ===
+        backend: Optional QueueBackend (default: get_backend() aus Config)
+        """
+        self.backend = backend or get_backend()
+    
     def count_incoming(self) -> int:
         """
         Zählt wartende Jobs in incoming/
@@ -63,10 +72,9 @@ class QueueMonitor:
         
         → count = 3
         """
-        # glob("*.txt") findet alle .txt Dateien
-        # list() konvertiert Generator zu Liste
-        # len() zählt Liste
-        return len(list(QUEUE_INCOMING.glob("*.txt")))
+        # Directory Backend: Zähler aus queue/.counters.db
+        # SQLite Backend: COUNT über Index (state, id)
+        return self.backend.count("incoming")
     
     def count_processing(self) -> int:
         """
@@ -92,7 +100,7 @@ class QueueMonitor:
         """
         # Gleiche Logik wie count_incoming
         # Aber anderer Ordner
-        return len(list(QUEUE_PROCESSING.glob("*.txt")))
+        return self.backend.count("processing")
     
     def count_processed(self) -> int:
         """
@@ -116,7 +124,7 @@ class QueueMonitor:
         === RETURNS ===
         int: Anzahl erfolgreicher Jobs (lifetime seit letztem cleanup)
         """
-        return len(list(QUEUE_PROCESSED.glob("*.txt")))
+        return self.backend.count("processed")
     
     def count_error(self) -> int:
         """
@@ -142,7 +150,7 @@ class QueueMonitor:
         === RETURNS ===
         int: Anzahl fehlgeschlagener Jobs
         """
-        return len(list(QUEUE_ERROR.glob("*.txt")))
+        return self.backend.count("error")
     
     def get_status(self) -> dict:
         """
@@ -177,9 +185,12 @@ class QueueMonitor:
         === RETURNS ===
         dict: Status-Snapshot mit allen Metriken
         """
-        # Incoming Count holen für State-Bestimmung
+        # Alle Counts in EINEM Backend-Call (O(1) Zähler statt 4 Scans)
+        counts = self.backend.counts()
+        
+        # Incoming Count für State-Bestimmung
         # Dieser Wert ist der wichtigste für Producer-Entscheidung
-        incoming = self.count_incoming()
+        incoming = counts["incoming"]
         
         # Status-Dict bauen
         return {
@@ -188,10 +199,10 @@ class QueueMonitor:
             
             # Queue Counts - alle Ordner
             "queue": {
-                "incoming": incoming,           # Wie viel Arbeit wartet
-                "processing": self.count_processing(),  # Wie viel läuft gerade
-                "processed": self.count_processed(),    # Wie viel erfolgreich
-                "error": self.count_error()             # Wie viel fehlgeschlagen
+                "incoming": incoming,                   # Wie viel Arbeit wartet
+                "processing": counts["processing"],     # Wie viel läuft gerade
+                "processed": counts["processed"],       # Wie viel erfolgreich
+                "error": counts["error"]                # Wie viel fehlgeschlagen
             },
             
             # System-Zustand basierend auf incoming count
@@ -0,0 +1,138 @@
+#!/bin/bash
+# ============================================================================
+# SYNTX ALGORITHMS BENCHMARK - Pure Python (alt) vs NumPy vs Streaming
+# ============================================================================
+#
+# ./scripts/benchmark_algorithms.sh                 # 10^3 .. 10^6 Punkte
+# ./scripts/benchmark_algorithms.sh 1000 50000      # eigene Größen
+#
+# "alt" = die Pure-Python Versionen vor der NumPy-Umstellung
+# (unten 1:1 eingebettet), "numpy" = api-core/utils/algorithms.py,
+# "stream" = RunningStats / OnlineRegression / StreamingMovingAverage
+# (Gesamtzeit für alle n Updates).
+# ============================================================================
+
+PURPLE='\033[0;35m'
+WHITE='\033[1;37m'
+NC='\033[0m'
+
+REPO_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+
+echo ""
+echo -e "${PURPLE}╔══════════════════════════════════════════════════════════════════╗${NC}"
+echo -e "${PURPLE}║${WHITE}        📐 SYNTX ALGORITHMS BENCHMARK                             ${PURPLE}║${NC}"
+echo -e "${PURPLE}╚══════════════════════════════════════════════════════════════════╝${NC}"
+echo ""
+
+SYNTX_API_CORE="$REPO_DIR/api-core" python3 - "$@" << 'PYTHON'
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.environ["SYNTX_API_CORE"])
+from utils import algorithms as fast
+
+GREEN = '\033[0;32m'
+CYAN = '\033[0;36m'
+NC = '\033[0m'
+
+# === ALT (Pure Python) ===
+
+def old_moving_average(values, window=5):
+    if len(values) < window:
+        return values
+    result = []
+    for i in range(len(values)):
+        if i < window - 1:
+            result.append(values[i])
+        else:
+            window_values = values[i - window + 1:i + 1]
+            result.append(sum(window_values) / window)
+    return result
+
+def old_detect_outliers(values, threshold=2.0):
+    if len(values) < 3:
+        return []
+    mean = statistics.mean(values)
+    stdev = statistics.stdev(values)
+    outliers = []
+    for i, value in enumerate(values):
+        z_score = abs((value - mean) / stdev) if stdev > 0 else 0
+        if z_score > threshold:
+            outliers.append(i)
+    return outliers
+
+def old_trend(values):
+    n = len(values)
+    x = list(range(n))
+    x_mean = sum(x) / n
+    y_mean = sum(values) / n
+    numerator = sum((x[i] - x_mean) * (values[i] - y_mean) for i in range(n))
+    denominator = sum((x[i] - x_mean) ** 2 for i in range(n))
+    slope = numerator / denominator
+    return "STEIGEND" if slope > 0.5 else "FALLEND" if slope < -0.5 else "STABIL"
+
+def old_correlation(x, y):
+    n = len(x)
+    x_mean = sum(x) / n
+    y_mean = sum(y) / n
+    numerator = sum((x[i] - x_mean) * (y[i] - y_mean) for i in range(n))
+    x_var = sum((x[i] - x_mean) ** 2 for i in range(n))
+    y_var = sum((y[i] - y_mean) ** 2 for i in range(n))
+    return numerator / (x_var * y_var) ** 0.5
+
+# === STREAMING (alle n Updates) ===
+
+def stream_moving_average(values):
+    avg = fast.StreamingMovingAverage(5)
+    for v in values:
+        avg.update(v)
+
+def stream_outliers(values):
+    stats = fast.RunningStats()
+    for v in values:
+        stats.update(v)
+    return stats.stdev
+
+def stream_trend(values):
+    reg = fast.OnlineRegression()
+    for v in values:
+        reg.update(v)
+    return reg.trend()
+
+def stream_correlation(x, y):
+    reg = fast.OnlineRegression()
+    for a, b in zip(x, y):
+        reg.update(b, a)
+    return reg.correlation
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+sizes = [int(a) for a in sys.argv[1:]] or [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+random.seed(42)
+
+cases = [
+    ("moving_average", old_moving_average, fast.calculate_moving_average, stream_moving_average, 1),
+    ("detect_outliers", old_detect_outliers, fast.detect_outliers, stream_outliers, 1),
+    ("trend", old_trend, fast.calculate_trend, stream_trend, 1),
+    ("correlation", old_correlation, fast.calculate_correlation, stream_correlation, 2),
+]
+
+print(f"{'Funktion':<18} {'n':>9} {'alt ms':>10} {'numpy ms':>10} {'stream ms':>10} {'speedup':>9}")
+for n in sizes:
+    values = [random.gauss(70, 15) for _ in range(n)]
+    other = [v * 0.5 + random.gauss(0, 5) for v in values]
+    print(f"{CYAN}{'─' * 70}{NC}")
+    for name, old, new, stream, arity in cases:
+        args = (values, other) if arity == 2 else (values,)
+        t_old, t_new, t_stream = timed(old, *args), timed(new, *args), timed(stream, *args)
+        speedup = t_old / t_new if t_new else float("inf")
+        print(f"{name:<18} {n:>9} {t_old:>10.1f} {t_new:>10.1f} {t_stream:>10.1f} {GREEN}{speedup:>8.1f}x{NC}")
+PYTHON
@@ -0,0 +1,75 @@
+#!/bin/bash
+# ============================================================================
+# SYNTX OPENAI CLIENT BENCHMARK - neuer Client pro Call vs. geteilter Pool
+# ============================================================================
+#
+# ./scripts/benchmark_openai_client.sh            # 10 Calls pro Variante
+# ./scripts/benchmark_openai_client.sh 30         # 30 Calls pro Variante
+#
+# "neu"    = OpenAI() pro Call (altes Verhalten in generate_prompt)
+# "shared" = gpt_generator/openai_client.get_openai_client()
+#
+# Gemessen wird GET /v1/models (kostenlos, keine Tokens) - der Unterschied
+# ist der Verbindungsaufbau (TCP + TLS), der bei jedem Prompt anfällt.
+# Braucht OPENAI_API_KEY (Environment oder .env).
+# ============================================================================
+
+PURPLE='\033[0;35m'
+WHITE='\033[1;37m'
+NC='\033[0m'
+
+REPO_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+
+echo ""
+echo -e "${PURPLE}╔══════════════════════════════════════════════════════════════════╗${NC}"
+echo -e "${PURPLE}║${WHITE}        🔌 SYNTX OPENAI CLIENT BENCHMARK                          ${PURPLE}║${NC}"
+echo -e "${PURPLE}╚══════════════════════════════════════════════════════════════════╝${NC}"
+echo ""
+
+cd "$REPO_DIR" && python3 - "$@" << 'PYTHON'
+import statistics
+import sys
+import time
+
+from dotenv import load_dotenv
+from openai import OpenAI
+
+load_dotenv(override=True)
+from gpt_generator.openai_client import OPENAI_TIMEOUT, get_openai_client
+
+GREEN = '\033[0;32m'
+CYAN = '\033[0;36m'
+NC = '\033[0m'
+
+calls = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+
+def fresh():
+    OpenAI(timeout=OPENAI_TIMEOUT).models.list()
+
+
+def shared():
+    get_openai_client().models.list()
+
+
+def measure(fn):
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+shared()  # Pool aufwärmen - erster Call zahlt den Handshake einmal
+results = {"neu": measure(fresh), "shared": measure(shared)}
+
+print(f"{'Variante':<10} {'calls':>6} {'p50 ms':>9} {'mean ms':>9} {'max ms':>9}")
+print(f"{CYAN}{'─' * 46}{NC}")
+for name, timings in results.items():
+    print(f"{name:<10} {calls:>6} {statistics.median(timings):>9.1f} "
+          f"{statistics.mean(timings):>9.1f} {max(timings):>9.1f}")
+
+saved = statistics.mean(results["neu"]) - statistics.mean(results["shared"])
+print(f"\n{GREEN}→ ~{saved:.0f} ms gespart pro Request{NC}")
+PYTHON
@@ -0,0 +1,131 @@
+#!/bin/bash
+# ============================================================================
+# SYNTX API LOAD TEST - Latenz unter parallelen Requests
+# ============================================================================
+#
+# Feuert N parallele Clients auf die schweren Lese-Endpoints und misst
+# p50 / p95 / max Latenz pro Endpoint + Gesamt-Durchsatz.
+#
+# Vorher/Nachher Vergleich (z.B. async def → def Handler):
+#   ./scripts/load_test_api.sh --label before --save /tmp/lt_before.json
+#   ... deploy ...
+#   ./scripts/load_test_api.sh --label after --compare /tmp/lt_before.json
+#
+# Optionen:
+#   --url URL          API Base (default: http://localhost:8020)
+#   --clients N        parallele Clients (default: 20)
+#   --requests N       Requests pro Client (default: 10)
+#   --no-cache         ETag/304 Cache umgehen (Header Cache-Control: no-cache
+#                      reicht nicht - es wird ein eindeutiger Query-Param angehängt)
+# ============================================================================
+
+PURPLE='\033[0;35m'
+WHITE='\033[1;37m'
+NC='\033[0m'
+
+echo ""
+echo -e "${PURPLE}╔══════════════════════════════════════════════════════════════════╗${NC}"
+echo -e "${PURPLE}║${WHITE}        ⏱️  SYNTX API LOAD TEST                                    ${PURPLE}║${NC}"
+echo -e "${PURPLE}╚══════════════════════════════════════════════════════════════════╝${NC}"
+echo ""
+
+python3 - "$@" << 'PYTHON'
+import argparse
+import json
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+GREEN = '\033[0;32m'
+RED = '\033[0;31m'
+YELLOW = '\033[1;33m'
+NC = '\033[0m'
+
+ENDPOINTS = [
+    "/feld/drift?limit=50",
+    "/resonanz/system",
+    "/analytics/dashboard",
+    "/analytics/scores/distribution",
+    "/prompts/complete-export?page=1&page_size=50",
+    "/evolution/syntx-vs-normal",
+    "/monitoring/live-queue",
+    "/health",
+]
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--url", default="http://localhost:8020")
+parser.add_argument("--clients", type=int, default=20)
+parser.add_argument("--requests", type=int, default=10)
+parser.add_argument("--label", default="run")
+parser.add_argument("--save", default=None)
+parser.add_argument("--compare", default=None)
+parser.add_argument("--no-cache", action="store_true")
+args = parser.parse_args()
+
+
+def fetch(path, i):
+    url = args.url + path
+    if args.no_cache:
+        url += ("&" if "?" in path else "?") + f"_lt={time.time_ns()}_{i}"
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=120) as r:
+            r.read()
+            ok = r.status == 200
+    except Exception:
+        ok = False
+    return path, (time.perf_counter() - start) * 1000, ok
+
+
+def percentile(values, p):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+jobs = [ENDPOINTS[i % len(ENDPOINTS)] for i in range(args.clients * args.requests)]
+print(f"🎯 {args.url} · {args.clients} Clients · {len(jobs)} Requests · label={args.label}\n")
+
+start = time.perf_counter()
+with ThreadPoolExecutor(max_workers=args.clients) as pool:
+    results = list(pool.map(lambda ij: fetch(ij[1], ij[0]), enumerate(jobs)))
+wall = time.perf_counter() - start
+
+report = {"label": args.label, "clients": args.clients, "requests": len(jobs),
+          "wall_seconds": round(wall, 2), "rps": round(len(jobs) / wall, 1), "endpoints": {}}
+
+print(f"{'Endpoint':<48} {'p50':>8} {'p95':>8} {'max':>8} {'err':>5}")
+for path in ENDPOINTS:
+    lat = [ms for p, ms, ok in results if p == path]
+    errors = sum(1 for p, _, ok in results if p == path and not ok)
+    stats = {"p50": round(percentile(lat, 0.50), 1), "p95": round(percentile(lat, 0.95), 1),
+             "max": round(max(lat) if lat else 0, 1), "errors": errors}
+    report["endpoints"][path] = stats
+    color = RED if errors else NC
+    print(f"{color}{path:<48} {stats['p50']:>8} {stats['p95']:>8} {stats['max']:>8} {errors:>5}{NC}")
+
+all_lat = [ms for _, ms, _ in results]
+report["p50"] = round(percentile(all_lat, 0.50), 1)
+report["p95"] = round(percentile(all_lat, 0.95), 1)
+print(f"\n⏱️  Gesamt: p50={report['p50']}ms p95={report['p95']}ms · {report['rps']} req/s · {report['wall_seconds']}s")
+
+if args.save:
+    with open(args.save, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Gespeichert: {args.save}")
+
+if args.compare:
+    with open(args.compare) as f:
+        before = json.load(f)
+    print(f"\n📊 Vergleich {before['label']} → {args.label}")
+    for key in ("p50", "p95", "rps"):
+        old, new = before[key], report[key]
+        better = new > old if key == "rps" else new < old
+        color = GREEN if better else YELLOW
+        print(f"   {key:<4} {old:>10} → {color}{new:>10}{NC}")
+    for path, stats in report["endpoints"].items():
+        old = before["endpoints"].get(path)
+        if old:
+            print(f"   {path:<48} p95 {old['p95']:>8} → {stats['p95']:>8}")
+PYTHON
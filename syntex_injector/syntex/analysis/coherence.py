@@ -5,7 +5,7 @@ SYNTX Coherence Analyzer - Cross-Field Kohärenz Bewertung
 import logging
 from typing import Dict, List, Tuple, Optional
 
-from .embeddings import semantic_similarity, get_embedding
+from .embeddings import get_embedding, SimilarityMatrix
 
 logger = logging.getLogger("SYNTX.Coherence")
 
@@ -27,9 +27,17 @@ COHERENCE_PAIRS = {
     ]
 }
 
-def analyze_pairwise_coherence(fields: Dict[str, str], format_type: str = "SYNTEX_SYSTEM") -> Dict:
-    """Analysiert Kohärenz zwischen Feldpaaren"""
+def analyze_pairwise_coherence(fields: Dict[str, str], format_type: str = "SYNTEX_SYSTEM",
+                               sims: Optional[SimilarityMatrix] = None) -> Dict:
+    """
+    Analysiert Kohärenz zwischen Feldpaaren
+    
+    sims: Optional vorberechnete SimilarityMatrix (z.B. vom Scorer) -
+          sonst werden alle Feldtexte in einem Batch encodiert
+    """
     pairs = COHERENCE_PAIRS.get(format_type, [])
+    if sims is None:
+        sims = SimilarityMatrix([fields.get(f, "") for pair in pairs for f in pair[:2]])
     results = []
     total_score = 0.0
     valid_pairs = 0
@@ -39,7 +47,7 @@ def analyze_pairwise_coherence(fields: Dict[str, str], format_type: str = "SYNTE
         text2 = fields.get(field2, "")
         
         if text1 and text2:
-            sim = semantic_similarity(text1, text2)
+            sim = sims.similarity(text1, text2)
             passed = sim >= min_expected
             results.append({
                 "pair": f"{field1} <-> {field2}",
@@ -59,9 +67,10 @@ def analyze_pairwise_coherence(fields: Dict[str, str], format_type: str = "SYNTE
         "details": results
     }
 
-def calculate_coherence_score(fields: Dict[str, str], format_type: str = "SYNTEX_SYSTEM") -> float:
+def calculate_coherence_score(fields: Dict[str, str], format_type: str = "SYNTEX_SYSTEM",
+                              sims: Optional[SimilarityMatrix] = None) -> float:
     """Berechnet einen einzelnen Kohärenz-Score (0.0 - 1.0)"""
-    result = analyze_pairwise_coherence(fields, format_type)
+    result = analyze_pairwise_coherence(fields, format_type, sims)
     return result["average_coherence"]
 
 def detect_incoherence(fields: Dict[str, str], format_type: str = "SYNTEX_SYSTEM") -> List[str]:
@@ -0,0 +1,193 @@
+"""
+SYNTX Definition Embedding Cache - Feld-Definitionen nur EINMAL embedden
+
+=== ZWECK ===
+description + ideal_response der Felder (field_definitions.py bzw.
+Format-JSONs) sind konstant. Statt sie bei jeder Response neu zu
+encodieren, werden ihre Vektoren einmal pro Format-Version berechnet
+und als .npy auf Disk gelegt (memory-mapped geladen).
+
+=== KEY ===
+<cache_dir>/<model>/<format>.<digest>.npy   (Vektoren, eine Zeile pro Text)
+<cache_dir>/<model>/<format>.<digest>.json  (sha1 pro Zeile + Texte)
+
+digest = sha1 über alle Definition-Texte → ändert sich ein Text,
+ändert sich der Key → automatisch neu berechnet (auch in Prozessen
+die von einem Format-Update nichts mitbekommen haben).
+
+=== INVALIDIERUNG ===
+formats_api ruft invalidate_definition_embeddings(name) bei
+create/update/delete → Files des Formats werden gelöscht.
+
+=== VERWENDUNG ===
+    vectors = get_definition_vectors("SYNTEX_SYSTEM")
+    # → {definition_text: np.ndarray}
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger("SYNTX.DefinitionCache")
+
+DEFINITION_CACHE_DIR = Path(os.getenv(
+    "SYNTX_DEFINITION_CACHE_DIR",
+    "/opt/syntx-config/embeddings/definitions"
+))
+
+# In-Memory: (model, format, digest) → {text: vector}
+_memory: Dict[tuple, Dict[str, "np.ndarray"]] = {}
+_lock = threading.Lock()
+
+
+def _sha1(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _slug(name: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+
+
+def _definition_texts(format_type: str) -> List[str]:
+    """Alle description + ideal_response Texte eines Formats (dedupliziert, stabile Reihenfolge)"""
+    from .field_definitions import get_fields_for_format
+
+    texts = []
+    for field_def in get_fields_for_format(format_type).values():
+        for key in ("description", "ideal_response"):
+            text = field_def.get(key, "")
+            if text and text.strip():
+                texts.append(text)
+    return list(dict.fromkeys(texts))
+
+
+def get_definition_vectors(format_type: str) -> Dict[str, "np.ndarray"]:
+    """
+    Definition-Vektoren für ein Format: {text: vector}
+
+    Reihenfolge: Memory → Disk (.npy mmap) → Encoder (+ auf Disk speichern)
+    Fehler → {} (Scorer encodiert dann einfach alles selbst)
+    """
+    if np is None:
+        return {}
+
+    from .embeddings import get_embeddings, get_model_name
+
+    texts = _definition_texts(format_type)
+    if not texts:
+        return {}
+
+    model = _slug(get_model_name())
+    format_name = _slug(format_type.lower())
+    hashes = [_sha1(t) for t in texts]
+    digest = _sha1("\n".join(hashes))[:16]
+    key = (model, format_name, digest)
+
+    with _lock:
+        if key in _memory:
+            return _memory[key]
+
+        base = DEFINITION_CACHE_DIR / model / f"{format_name}.{digest}"
+        vectors = _load(base, hashes)
+
+        if vectors is None:
+            embedded = get_embeddings(texts)
+            if any(v is None for v in embedded):
+                return {}  # Model nicht verfügbar - nicht cachen
+            vectors = np.stack(embedded).astype(np.float32)
+            _save(base, vectors, hashes, texts)
+            logger.info(f"🧮 Definition-Embeddings berechnet: {format_type} ({len(texts)} Texte)")
+
+        result = {text: vectors[i] for i, text in enumerate(texts)}
+        _memory[key] = result
+        return result
+
+
+def _load(base: Path, hashes: List[str]) -> Optional["np.ndarray"]:
+    """Lädt .npy memory-mapped wenn Manifest zu den aktuellen Texten passt"""
+    npy_path = base.with_suffix(base.suffix + ".npy")
+    manifest_path = base.with_suffix(base.suffix + ".json")
+    if not npy_path.exists() or not manifest_path.exists():
+        return None
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("hashes") != hashes:
+            return None
+        vectors = np.load(npy_path, mmap_mode="r")
+        if vectors.shape[0] != len(hashes):
+            return None
+        return vectors
+    except Exception as e:
+        logger.warning(f"⚠️ Definition-Cache unlesbar ({npy_path.name}): {e}")
+        return None
+
+
+def _save(base: Path, vectors: "np.ndarray", hashes: List[str], texts: List[str]) -> None:
+    """Atomar speichern (tmp + rename), alte Versionen des Formats entfernen"""
+    try:
+        base.parent.mkdir(parents=True, exist_ok=True)
+        format_name = base.name.rsplit(".", 1)[0]
+        for old in base.parent.glob(f"{format_name}.*"):
+            old.unlink(missing_ok=True)
+
+        npy_path = base.with_suffix(base.suffix + ".npy")
+        manifest_path = base.with_suffix(base.suffix + ".json")
+
+        tmp_npy = npy_path.with_suffix(".npy.tmp")
+        with open(tmp_npy, "wb") as f:
+            np.save(f, vectors)
+        tmp_npy.rename(npy_path)
+
+        tmp_manifest = manifest_path.with_suffix(".json.tmp")
+        with open(tmp_manifest, "w", encoding="utf-8") as f:
+            json.dump({"hashes": hashes, "texts": texts}, f, ensure_ascii=False, indent=2)
+        tmp_manifest.rename(manifest_path)
+    except Exception as e:
+        logger.warning(f"⚠️ Definition-Cache nicht gespeichert: {e}")
+
+
+def invalidate_definition_embeddings(format_name: Optional[str] = None) -> int:
+    """
+    Cache für ein Format (oder alle) löschen - Memory + Disk
+
+    Returns:
+        Anzahl gelöschter Files
+    """
+    with _lock:
+        if format_name is None:
+            _memory.clear()
+        else:
+            slug = _slug(format_name.lower())
+            for key in [k for k in _memory if k[1] == slug]:
+                del _memory[key]
+
+        if not DEFINITION_CACHE_DIR.exists():
+            return 0
+
+        pattern = "*" if format_name is None else f"{_slug(format_name.lower())}.*"
+        deleted = 0
+        for path in DEFINITION_CACHE_DIR.glob(f"*/{pattern}"):
+            try:
+                path.unlink()
+                deleted += 1
+            except OSError:
+                continue
+        return deleted
+
+
+if __name__ == "__main__":
+    print("=== SYNTX DEFINITION CACHE TEST ===")
+    for fmt in ["SYNTEX_SYSTEM", "HUMAN", "SIGMA"]:
+        vectors = get_definition_vectors(fmt)
+        print(f"{fmt}: {len(vectors)} Definition-Vektoren")
+    print(f"Cache: {DEFINITION_CACHE_DIR}")
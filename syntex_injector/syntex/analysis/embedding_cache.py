@@ -0,0 +1,300 @@
+"""
+SYNTX Embedding Cache - Content-Addressed LRU mit Disk-Spillover
+
+=== ZWECK ===
+Scorer, Coherence-Analyzer und Rescoring encodieren immer wieder die
+gleichen Texte (gleiche Felder, gleiche Prompts, Retries). Jeder Vektor
+wird deshalb unter (model, sha1(text)) gemerkt:
+
+1. Memory: OrderedDict LRU, max. EMBEDDING_CACHE_SIZE Vektoren (float32)
+2. Disk:   SQLite, Vektor als float16 Blob (optional, halber Platz)
+
+Nur Texte die in BEIDEN fehlen gehen in den Encoder.
+
+=== KEY ===
+(model_name, sha1(text)) → anderes Model = anderer Key, kein Mischen
+
+=== STATS ===
+hits / disk_hits / misses / evictions / encode_seconds
+→ get_cache_stats() zeigt wie viel Encoder-Zeit ein Batch gespart hat
+
+=== CONFIG ===
+SYNTX_EMBEDDING_CACHE_SIZE   Vektoren im Memory (default 4096, 0 = aus)
+SYNTX_EMBEDDING_CACHE_DB     SQLite File (default /opt/syntx-config/embeddings/embedding_cache.db)
+SYNTX_EMBEDDING_DISK_CACHE   "false" → kein Disk-Store
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger("SYNTX.EmbeddingCache")
+
+EMBEDDING_CACHE_SIZE = int(os.getenv("SYNTX_EMBEDDING_CACHE_SIZE", "4096"))
+EMBEDDING_CACHE_DB = Path(os.getenv(
+    "SYNTX_EMBEDDING_CACHE_DB",
+    "/opt/syntx-config/embeddings/embedding_cache.db"
+))
+EMBEDDING_DISK_CACHE = os.getenv("SYNTX_EMBEDDING_DISK_CACHE", "true").lower() == "true"
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Bounded LRU (Memory) + optionaler float16 SQLite Store (Disk)
+
+    === THREAD-SAFETY ===
+    Ein Lock für LRU + Stats, eine SQLite Connection pro Thread
+    """
+
+    def __init__(self, max_size: int = EMBEDDING_CACHE_SIZE, db_path: Optional[Path] = None):
+        self.max_size = max_size
+        self.db_path = Path(db_path) if db_path else None
+        self._lru: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._disk_ok = self.db_path is not None
+        self.reset_stats()
+
+    # ========================================================================
+    # STATS
+    # ========================================================================
+
+    def reset_stats(self) -> None:
+        self._stats = {
+            "hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "encoded": 0,
+            "encode_seconds": 0.0,
+        }
+
+    def record_encode(self, count: int, seconds: float) -> None:
+        """Vom Encoder-Aufrufer: wie viele Texte in wie vielen Sekunden"""
+        with self._lock:
+            self._stats["encoded"] += count
+            self._stats["encode_seconds"] += seconds
+
+    def stats(self) -> Dict:
+        """
+        Counter + geschätzte gesparte Encoder-Zeit
+
+        saved_seconds = (hits + disk_hits) × Ø Encoder-Zeit pro Text
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._lru)
+        lookups = stats["hits"] + stats["disk_hits"] + stats["misses"]
+        per_text = stats["encode_seconds"] / stats["encoded"] if stats["encoded"] else 0.0
+        stats["hit_rate"] = round((stats["hits"] + stats["disk_hits"]) / lookups, 4) if lookups else 0.0
+        stats["saved_seconds"] = round((stats["hits"] + stats["disk_hits"]) * per_text, 3)
+        stats["encode_seconds"] = round(stats["encode_seconds"], 3)
+        stats["disk"] = str(self.db_path) if self._disk_ok else None
+        return stats
+
+    # ========================================================================
+    # DISK (SQLite, float16)
+    # ========================================================================
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if not self._disk_ok:
+            return None
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            try:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(str(self.db_path), timeout=5.0)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS embeddings (
+                        model TEXT NOT NULL,
+                        hash TEXT NOT NULL,
+                        dim INTEGER NOT NULL,
+                        vec BLOB NOT NULL,
+                        PRIMARY KEY (model, hash)
+                    ) WITHOUT ROWID
+                """)
+                conn.commit()
+            except Exception as e:
+                # Kein Schreibrecht o.ä. → nur Memory, nicht bei jedem Call neu versuchen
+                logger.warning(f"⚠️ Embedding Disk-Cache deaktiviert ({self.db_path}): {e}")
+                self._disk_ok = False
+                return None
+            self._local.conn = conn
+        return conn
+
+    def _disk_get(self, model: str, hashes: List[str]) -> Dict[str, "np.ndarray"]:
+        conn = self._connect()
+        if conn is None or not hashes:
+            return {}
+        found = {}
+        try:
+            # SQLite Variablen-Limit → in Chunks abfragen
+            for i in range(0, len(hashes), 500):
+                chunk = hashes[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT hash, dim, vec FROM embeddings WHERE model = ? AND hash IN ({placeholders})",
+                    [model, *chunk]
+                )
+                for h, dim, blob in rows:
+                    vec = np.frombuffer(blob, dtype=np.float16)
+                    if vec.shape[0] == dim:
+                        found[h] = vec.astype(np.float32)
+        except Exception as e:
+            logger.warning(f"⚠️ Embedding Disk-Cache Lesefehler: {e}")
+        return found
+
+    def _disk_put(self, model: str, items: List[Tuple[str, "np.ndarray"]]) -> None:
+        conn = self._connect()
+        if conn is None or not items:
+            return
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, hash, dim, vec) VALUES (?, ?, ?, ?)",
+                [(model, h, int(v.shape[0]), np.asarray(v, dtype=np.float16).tobytes()) for h, v in items]
+            )
+            conn.commit()
+        except Exception as e:
+            logger.warning(f"⚠️ Embedding Disk-Cache Schreibfehler: {e}")
+
+    # ========================================================================
+    # LOOKUP / STORE
+    # ========================================================================
+
+    def get_many(self, model: str, texts: Iterable[str]) -> Dict[str, "np.ndarray"]:
+        """
+        Bekannte Vektoren für texts: {text: vector}
+
+        Reihenfolge: Memory LRU → Disk. Disk-Treffer wandern ins LRU.
+        Fehlende Texte sind nicht im Ergebnis (= misses)
+        """
+        texts = list(dict.fromkeys(texts))
+        hashes = {t: text_hash(t) for t in texts}
+        result: Dict[str, "np.ndarray"] = {}
+        missing: List[str] = []
+
+        with self._lock:
+            for t in texts:
+                key = (model, hashes[t])
+                vec = self._lru.get(key)
+                if vec is not None:
+                    self._lru.move_to_end(key)
+                    result[t] = vec
+                else:
+                    missing.append(t)
+            self._stats["hits"] += len(result)
+
+        if missing and self._disk_ok:
+            from_disk = self._disk_get(model, [hashes[t] for t in missing])
+            if from_disk:
+                with self._lock:
+                    for t in missing:
+                        vec = from_disk.get(hashes[t])
+                        if vec is not None:
+                            result[t] = vec
+                            self._remember((model, hashes[t]), vec)
+                            self._stats["disk_hits"] += 1
+
+        with self._lock:
+            self._stats["misses"] += len(texts) - len(result)
+        return result
+
+    def put_many(self, model: str, vectors: Dict[str, "np.ndarray"]) -> None:
+        """Neu encodierte Vektoren merken (Memory + Disk write-through)"""
+        items = [(text_hash(t), np.asarray(v, dtype=np.float32)) for t, v in vectors.items() if v is not None]
+        with self._lock:
+            for h, v in items:
+                self._remember((model, h), v)
+        self._disk_put(model, items)
+
+    def _remember(self, key: Tuple[str, str], vec: "np.ndarray") -> None:
+        """LRU insert (Lock muss gehalten werden)"""
+        if self.max_size <= 0:
+            return
+        self._lru[key] = vec
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_size:
+            self._lru.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def clear(self, disk: bool = False) -> None:
+        """Memory leeren (disk=True → auch SQLite Store)"""
+        with self._lock:
+            self._lru.clear()
+        if disk:
+            conn = self._connect()
+            if conn is not None:
+                conn.execute("DELETE FROM embeddings")
+                conn.commit()
+
+
+# ============================================================================
+# SHARED INSTANCE
+# ============================================================================
+
+_cache: Optional[EmbeddingCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """Prozessweiter Cache (None wenn numpy fehlt)"""
+    global _cache
+    if np is None:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = EmbeddingCache(
+                max_size=EMBEDDING_CACHE_SIZE,
+                db_path=EMBEDDING_CACHE_DB if EMBEDDING_DISK_CACHE else None
+            )
+        return _cache
+
+
+def get_cache_stats() -> Dict:
+    """Hit/Miss/Eviction Counter des prozessweiten Caches"""
+    cache = get_embedding_cache()
+    return cache.stats() if cache else {}
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    print("=== SYNTX EMBEDDING CACHE TEST ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "cache.db"
+        cache = EmbeddingCache(max_size=2, db_path=db)
+        vecs = {f"text {i}": np.random.rand(8).astype(np.float32) for i in range(3)}
+
+        start = time.perf_counter()
+        cache.put_many("test-model", vecs)
+        cache.record_encode(len(vecs), time.perf_counter() - start)
+
+        got = cache.get_many("test-model", list(vecs) + ["unbekannt"])
+        assert set(got) == set(vecs), got.keys()
+        assert np.allclose(got["text 0"], vecs["text 0"], atol=1e-3)
+
+        # Neuer Prozess = leeres LRU, Disk liefert
+        fresh = EmbeddingCache(max_size=2, db_path=db)
+        assert len(fresh.get_many("test-model", list(vecs))) == 3
+        assert fresh.get_many("other-model", ["text 0"]) == {}
+
+        print(f"Stats:       {cache.stats()}")
+        print(f"Stats fresh: {fresh.stats()}")
+    print("✅ Embedding Cache OK")
@@ -3,12 +3,14 @@ SYNTX Semantic Embeddings - Sentence Transformers mit Caching
 """
 
 import os
+import time
 import logging
-from typing import Optional, List, Tuple
-from functools import lru_cache
+from typing import Optional, List, Tuple, Dict
 
 import numpy as np
 
+from .embedding_cache import get_embedding_cache
+
 # Logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("SYNTX.Embeddings")
@@ -17,6 +19,13 @@ logger = logging.getLogger("SYNTX.Embeddings")
 _model = None
 _model_name = None
 
+# Texte pro Forward-Pass bei Batch-Encoding
+EMBEDDING_BATCH_SIZE = int(os.getenv("SYNTX_EMBEDDING_BATCH_SIZE", "32"))
+
+def get_model_name() -> str:
+    """Name des Embedding-Models (ohne es zu laden) - Teil aller Cache-Keys"""
+    return os.getenv("SYNTX_EMBEDDING_MODEL", "paraphrase-multilingual-MiniLM-L12-v2")
+
 def _get_model():
     """Lazy Load des Sentence Transformer Models"""
     global _model, _model_name
@@ -24,7 +33,7 @@ def _get_model():
         try:
             from sentence_transformers import SentenceTransformer
             # Multilingual für Deutsch!
-            _model_name = os.getenv("SYNTX_EMBEDDING_MODEL", "paraphrase-multilingual-MiniLM-L12-v2")
+            _model_name = get_model_name()
             logger.info(f"Loading embedding model: {_model_name}")
             _model = SentenceTransformer(_model_name)
             logger.info("✅ Embedding model loaded")
@@ -39,15 +48,87 @@ def _get_model():
 
 
 def get_embedding(text: str) -> Optional[np.ndarray]:
-    """Berechnet Embedding für einen Text"""
-    model = _get_model()
-    if model is None or not text or not text.strip():
-        return None
-    try:
-        return model.encode(text, convert_to_numpy=True)
-    except Exception as e:
-        logger.error(f"Embedding error: {e}")
-        return None
+    """Berechnet Embedding für einen Text (über den Embedding-Cache)"""
+    return get_embeddings([text])[0]
+
+def get_embeddings(texts: List[str]) -> List[Optional[np.ndarray]]:
+    """
+    Berechnet Embeddings für viele Texte in EINEM model.encode(list) Call
+    
+    Leere Texte → None
+    Doppelte Texte werden nur einmal encodiert
+    Bereits gecachte Texte (embedding_cache: LRU + Disk) gar nicht
+    """
+    results: List[Optional[np.ndarray]] = [None] * len(texts)
+    unique = list(dict.fromkeys(t for t in texts if t and t.strip()))
+    if not unique:
+        return results
+    
+    model_name = get_model_name()
+    cache = get_embedding_cache()
+    by_text = cache.get_many(model_name, unique) if cache else {}
+    missing = [t for t in unique if t not in by_text]
+    
+    if missing:
+        model = _get_model()
+        if model is None:
+            return [by_text.get(t) for t in texts]
+        try:
+            start = time.perf_counter()
+            matrix = model.encode(missing, convert_to_numpy=True, batch_size=EMBEDDING_BATCH_SIZE)
+            elapsed = time.perf_counter() - start
+        except Exception as e:
+            logger.error(f"Batch embedding error: {e}")
+            return [by_text.get(t) for t in texts]
+        
+        encoded = {t: matrix[i] for i, t in enumerate(missing)}
+        if cache:
+            cache.record_encode(len(missing), elapsed)
+            cache.put_many(model_name, encoded)
+        by_text.update(encoded)
+    
+    return [by_text.get(t) for t in texts]
+
+
+class SimilarityMatrix:
+    """
+    Alle paarweisen Similarities einer Text-Menge aus EINEM Encoder-Call
+    
+    === VERWENDUNG ===
+        sims = SimilarityMatrix([feld1, feld2, definition, ideal])
+        sims.similarity(feld1, definition)   # → 0.0 - 1.0
+    
+    Gleiche Semantik wie semantic_similarity(): unbekannte/leere Texte → 0.0,
+    Ergebnis auf [0, 1] geclippt
+    
+    known: bereits bekannte Vektoren {text: vector} (z.B. Definition-Cache)
+           → nur die restlichen Texte gehen in den Encoder
+    """
+    
+    def __init__(self, texts: List[str], known: Optional[Dict[str, np.ndarray]] = None):
+        known = known or {}
+        unique = list(dict.fromkeys(t for t in texts if t and t.strip()))
+        missing = [t for t in unique if t not in known]
+        encoded = dict(zip(missing, get_embeddings(missing)))
+        vectors = [known[t] if t in known else encoded.get(t) for t in unique]
+        kept = [(t, v) for t, v in zip(unique, vectors) if v is not None]
+        
+        self._index = {t: i for i, (t, _) in enumerate(kept)}
+        self._matrix = None
+        if kept:
+            m = np.stack([v for _, v in kept]).astype(np.float32)
+            norms = np.linalg.norm(m, axis=1, keepdims=True)
+            # Null-Vektoren bleiben 0 → Similarity 0.0 (wie cosine_similarity)
+            m = np.divide(m, norms, out=np.zeros_like(m), where=norms > 0)
+            self._matrix = m @ m.T
+    
+    def similarity(self, text1: str, text2: str) -> float:
+        i = self._index.get(text1)
+        j = self._index.get(text2)
+        if i is None or j is None:
+            return 0.0
+        return max(0.0, min(1.0, float(self._matrix[i, j])))
+
 
 def cosine_similarity(vec1: np.ndarray, vec2: np.ndarray) -> float:
     """Berechnet Cosine Similarity zwischen zwei Vektoren"""
@@ -72,7 +153,8 @@ def batch_similarity(text: str, references: List[str]) -> float:
     """Berechnet durchschnittliche Similarity gegen mehrere Referenzen"""
     if not references:
         return 0.0
-    scores = [semantic_similarity(text, ref) for ref in references]
+    sims = SimilarityMatrix([text] + list(references))
+    scores = [sims.similarity(text, ref) for ref in references]
     return sum(scores) / len(scores)
 
 def keyword_coverage(text: str, keywords: List[str]) -> float:
@@ -93,3 +175,5 @@ if __name__ == "__main__":
     print(f"Similarity (related): {sim12:.3f}")
     print(f"Similarity (unrelated): {sim13:.3f}")
     print("✅ Embeddings OK" if sim12 > sim13 else "❌ Test failed")
+    from .embedding_cache import get_cache_stats
+    print(f"Cache: {get_cache_stats()}")
@@ -15,8 +15,9 @@ from typing import Dict, List, Optional
 from dataclasses import dataclass, field
 
 from .field_definitions import get_field_definition, get_all_field_names
-from .embeddings import semantic_similarity, keyword_coverage
+from .embeddings import semantic_similarity, keyword_coverage, SimilarityMatrix
 from .coherence import calculate_coherence_score
+from .definition_cache import get_definition_vectors
 
 logger = logging.getLogger("SYNTX.ScorerV2")
 
@@ -176,11 +177,13 @@ def _score_structure(text: str) -> float:
     
     return min(1.0, score)
 
-def _score_similarity(text: str, field_def: Dict) -> float:
+def _score_similarity(text: str, field_def: Dict, sims: Optional[SimilarityMatrix] = None) -> float:
     """
     Semantische Ähnlichkeit zur Feld-Definition
     Das Herz des V2 Scorers! ❤️
     Hier passiert die MAGIE mit Embeddings!
+    
+    sims: vorberechnete Matrix aus score_all_fields() - sonst Einzel-Calls
     """
     if not text:
         return 0.0
@@ -192,20 +195,36 @@ def _score_similarity(text: str, field_def: Dict) -> float:
         return 0.5  # Keine Definition? Dann neutral.
     
     # Embeddings go BRRRRR 🚀
+    similarity = sims.similarity if sims is not None else semantic_similarity
     scores = []
     if description:
-        scores.append(semantic_similarity(text, description))
+        scores.append(similarity(text, description))
     if ideal:
-        scores.append(semantic_similarity(text, ideal))
+        scores.append(similarity(text, ideal))
     
     return sum(scores) / len(scores) if scores else 0.5
 
+def _collect_texts(fields: Dict[str, str], expected_fields: List[str]) -> List[str]:
+    """
+    Alle Texte die für eine Response embedded werden müssen
+    Ein Einkaufszettel für den Encoder 🛒
+    """
+    texts = list(v for v in fields.values() if v)
+    for field_name in expected_fields:
+        if not fields.get(field_name):
+            continue  # Leeres Feld → keine Similarity nötig
+        field_def = get_field_definition(field_name) or {}
+        texts.append(field_def.get("description", ""))
+        texts.append(field_def.get("ideal_response", ""))
+    return texts
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # 🚀 MAIN FUNCTIONS - Hier wird der Rubel gemacht!
 # ═══════════════════════════════════════════════════════════════════════════════
 
 def score_field(field_name: str, field_value: str, all_fields: Dict[str, str], 
-                format_type: str = "SYNTEX_SYSTEM") -> FieldScore:
+                format_type: str = "SYNTEX_SYSTEM",
+                sims: Optional[SimilarityMatrix] = None) -> FieldScore:
     """
     Bewertet ein einzelnes Feld semantisch
     Der Micro-Manager unter den Scorern 🔍
@@ -221,7 +240,7 @@ def score_field(field_name: str, field_value: str, all_fields: Dict[str, str],
     result.presence_score = _score_presence(field_value)
     
     # 2. Similarity (35%) - Redest du auch über das richtige Thema?
-    result.similarity_score = _score_similarity(field_value, field_def)
+    result.similarity_score = _score_similarity(field_value, field_def, sims)
     
     # 3. Coherence (25%) - Placeholder, wird später befüllt
     result.coherence_score = 0.0
@@ -265,14 +284,22 @@ def score_all_fields(fields: Dict[str, str], format_type: str = "SYNTEX_SYSTEM")
         result.warnings.append(f"Unknown format: {format_type}")
         return result  # Unbekanntes Format? Raus hier!
     
+    # Alle Texte sammeln (Felder + Definitionen + Ideale) und in EINEM
+    # Batch encodieren - statt ~20 einzelner Forward-Passes 🚀
+    # Definitionen kommen vorberechnet aus dem Cache → nur Felder encodieren
+    sims = SimilarityMatrix(
+        _collect_texts(fields, expected_fields),
+        known=get_definition_vectors(format_type)
+    )
+    
     # Score jedes einzelne Feld - die Fleißarbeit
     for field_name in expected_fields:
         field_value = fields.get(field_name, "")
-        field_score = score_field(field_name, field_value, fields, format_type)
+        field_score = score_field(field_name, field_value, fields, format_type, sims)
         result.field_scores[field_name] = field_score
     
     # Coherence Score (global) - Passen die Felder zusammen? 🤝
-    result.coherence_score = calculate_coherence_score(fields, format_type)
+    result.coherence_score = calculate_coherence_score(fields, format_type, sims)
     
     # Update Coherence in allen Field Scores
     for fs in result.field_scores.values():
@@ -0,0 +1,281 @@
+"""
+SYNTX Vector Index - Semantische Ähnlichkeitssuche über processed Meta-Prompts
+
+=== ZWECK ===
+"Zeig mir Prompts wie diesen, die gut gescored haben" - ohne bei jeder
+Anfrage alle Prompts neu zu encodieren.
+
+=== SPEICHER ===
+SQLite (WAL): vectors(id, job_uid, model, dim, vec)
+vec = L2-normalisierter Vektor als float16 Blob (halber Platz, Cosine = Dot)
+Der Consumer schreibt (add_text nach jedem erfolgreichen Job),
+die API liest - mehrere Prozesse, keine Koordination nötig.
+
+=== SUCHE ===
+Brute Force: Matrix (n × dim) im Speicher, inkrementell nachgeladen
+(nur id > letzte bekannte id). Im Speicher float32 - float16 matmul hat
+kein BLAS, die Konvertierung pro Query würde die Suche ~10x bremsen.
+Skalarprodukt + argpartition für top-k.
+Neue Zeilen landen in einem Puffer mit Verdopplung der Kapazität →
+ein neuer Job kopiert nicht die ganze Matrix.
+→ 100k Prompts × 384 dim ≈ 150 MB RAM (77 MB auf Disk), ~30 ms pro Query
+
+=== MODEL ===
+Nur Vektoren des aktuellen Embedding-Models (get_model_name()) zählen -
+Model-Wechsel → --backfill baut mit dem neuen Model neu auf.
+
+=== CONFIG ===
+SYNTX_VECTOR_INDEX_DB   SQLite File (default /opt/syntx-config/embeddings/prompt_vectors.db)
+SYNTX_VECTOR_INDEX      "false" → Consumer indexiert nicht
+
+=== CLI ===
+python3 -m syntex_injector.syntex.analysis.vector_index --backfill [queue_dir]
+python3 -m syntex_injector.syntex.analysis.vector_index "suchtext"
+"""
+
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .embeddings import get_embedding, get_embeddings, get_model_name
+
+VECTOR_INDEX_DB = Path(os.getenv(
+    "SYNTX_VECTOR_INDEX_DB",
+    "/opt/syntx-config/embeddings/prompt_vectors.db"
+))
+VECTOR_INDEX_ENABLED = os.getenv("SYNTX_VECTOR_INDEX", "true").lower() == "true"
+
+
+def normalize(vector: np.ndarray) -> Optional[np.ndarray]:
+    """L2-Normalisierung (Null-Vektor → None)"""
+    vector = np.asarray(vector, dtype=np.float32).ravel()
+    norm = np.linalg.norm(vector)
+    if norm == 0 or not np.isfinite(norm):
+        return None
+    return vector / norm
+
+
+class VectorIndex:
+    """
+    Persistenter Vektor-Store + Brute-Force Suche im Speicher
+
+    === THREAD-SAFETY ===
+    Eine SQLite Connection pro Thread, Matrix-Refresh unter Lock
+    """
+
+    def __init__(self, db_path: Path = VECTOR_INDEX_DB):
+        self.db_path = Path(db_path)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._model: Optional[str] = None
+        self._last_id = 0
+        self._uids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._buffer: Optional[np.ndarray] = None
+        self._count = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=10.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS vectors (
+                    id INTEGER PRIMARY KEY,
+                    job_uid TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    dim INTEGER NOT NULL,
+                    vec BLOB NOT NULL,
+                    UNIQUE (model, job_uid)
+                )
+            """)
+            self._local.conn = conn
+        return conn
+
+    # ========================================================================
+    # WRITE (Consumer / Backfill)
+    # ========================================================================
+
+    def add_vectors(self, items: Iterable[Tuple[str, np.ndarray]]) -> int:
+        """(job_uid, vector) Paare speichern - bekannte job_uids bleiben unverändert"""
+        model = get_model_name()
+        rows = []
+        for job_uid, vector in items:
+            unit = normalize(vector) if vector is not None else None
+            if unit is not None:
+                rows.append((job_uid, model, unit.shape[0], unit.astype(np.float16).tobytes()))
+        if not rows:
+            return 0
+        conn = self._connect()
+        before = conn.total_changes
+        conn.executemany(
+            "INSERT OR IGNORE INTO vectors (job_uid, model, dim, vec) VALUES (?, ?, ?, ?)", rows
+        )
+        return conn.total_changes - before
+
+    def add_text(self, job_uid: str, text: str) -> bool:
+        """Meta-Prompt eines Jobs encodieren (über Embedding-Cache) und speichern"""
+        if self.contains(job_uid):
+            return False
+        vector = get_embedding(text)
+        return self.add_vectors([(job_uid, vector)]) > 0
+
+    def add_texts(self, items: List[Tuple[str, str]]) -> int:
+        """Batch-Variante: ein Encoder-Call für alle (job_uid, text) Paare"""
+        items = [(uid, text) for uid, text in items if not self.contains(uid)]
+        if not items:
+            return 0
+        vectors = get_embeddings([text for _, text in items])
+        return self.add_vectors((uid, v) for (uid, _), v in zip(items, vectors))
+
+    def contains(self, job_uid: str) -> bool:
+        return self._connect().execute(
+            "SELECT 1 FROM vectors WHERE model = ? AND job_uid = ?", (get_model_name(), job_uid)
+        ).fetchone() is not None
+
+    # ========================================================================
+    # READ (API)
+    # ========================================================================
+
+    def refresh(self) -> int:
+        """Neue Zeilen (id > letzte bekannte) in die Matrix laden → Anzahl Vektoren"""
+        model = get_model_name()
+        with self._lock:
+            if model != self._model:
+                self._model, self._last_id = model, 0
+                self._uids, self._positions = [], {}
+                self._buffer, self._count = None, 0
+
+            rows = self._connect().execute(
+                "SELECT id, job_uid, dim, vec FROM vectors WHERE model = ? AND id > ? ORDER BY id",
+                (model, self._last_id)
+            ).fetchall()
+            if rows:
+                dim = self._buffer.shape[1] if self._buffer is not None else rows[0][2]
+                fresh = [(uid, np.frombuffer(vec, dtype=np.float16)) for _, uid, d, vec in rows if d == dim]
+                needed = self._count + len(fresh)
+                if self._buffer is None or needed > self._buffer.shape[0]:
+                    capacity = max(needed, 2 * (self._buffer.shape[0] if self._buffer is not None else 512))
+                    grown = np.empty((capacity, dim), dtype=np.float32)
+                    if self._buffer is not None:
+                        grown[:self._count] = self._buffer[:self._count]
+                    self._buffer = grown
+                for uid, vec in fresh:
+                    self._buffer[self._count] = vec
+                    self._positions[uid] = self._count
+                    self._uids.append(uid)
+                    self._count += 1
+                self._last_id = rows[-1][0]
+            return self._count
+
+    def vector(self, job_uid: str) -> Optional[np.ndarray]:
+        """Gespeicherter (normalisierter) Vektor eines Jobs"""
+        self.refresh()
+        pos = self._positions.get(job_uid)
+        if pos is None:
+            return None
+        return self._buffer[pos].copy()
+
+    def search(self, vector: np.ndarray, k: int = 10, exclude: Iterable[str] = ()) -> List[Tuple[str, float]]:
+        """
+        Top-k nach Cosine Similarity
+
+        === RETURNS ===
+        [(job_uid, similarity)] absteigend, similarity in [-1, 1]
+        """
+        query = normalize(vector)
+        if query is None or self.refresh() == 0:
+            return []
+        matrix, uids = self._buffer[:self._count], self._uids
+        excluded = {self._positions[u] for u in exclude if u in self._positions}
+
+        sims = matrix @ query
+        if excluded:
+            sims[list(excluded)] = -np.inf
+
+        k = min(k, len(sims) - len(excluded))
+        if k <= 0:
+            return []
+        top = np.argpartition(-sims, k - 1)[:k]
+        top = top[np.argsort(-sims[top])]
+        return [(uids[i], float(sims[i])) for i in top]
+
+    @staticmethod
+    def embed(text: str) -> Optional[np.ndarray]:
+        """Query-Vektor für Freitext (lädt das Embedding-Model falls nötig)"""
+        return get_embedding(text)
+
+    def search_text(self, text: str, k: int = 10) -> List[Tuple[str, float]]:
+        vector = self.embed(text)
+        return self.search(vector, k) if vector is not None else []
+
+    def __len__(self) -> int:
+        return self.refresh()
+
+    # ========================================================================
+    # BACKFILL
+    # ========================================================================
+
+    def backfill(self, directories: Iterable[Path], batch_size: int = 64) -> int:
+        """Alle Meta-Prompts (*.txt ohne _response) aus den Verzeichnissen indexieren"""
+        added = 0
+        batch: List[Tuple[str, str]] = []
+        for directory in directories:
+            directory = Path(directory)
+            if not directory.exists():
+                continue
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if not entry.name.endswith(".txt") or entry.name.endswith("_response.txt"):
+                        continue
+                    try:
+                        with open(entry.path, encoding="utf-8") as f:
+                            batch.append((Path(entry.name).stem, f.read()))
+                    except OSError:
+                        continue
+                    if len(batch) >= batch_size:
+                        added += self.add_texts(batch)
+                        batch = []
+        if batch:
+            added += self.add_texts(batch)
+        return added
+
+
+_index: Optional[VectorIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_vector_index() -> VectorIndex:
+    """Shared VectorIndex (ein Prozess = eine Matrix)"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = VectorIndex()
+        return _index
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    index = get_vector_index()
+    if len(sys.argv) > 1 and sys.argv[1] == "--backfill":
+        queue = Path(sys.argv[2]) if len(sys.argv) > 2 else Path("/opt/syntx-workflow-api-get-prompts/queue")
+        start = time.perf_counter()
+        added = index.backfill([queue / "processed", queue / "archive"])
+        print(f"✅ {added} Prompts indexiert in {time.perf_counter() - start:.1f}s · gesamt {len(index)}")
+    elif len(sys.argv) > 1:
+        query = " ".join(sys.argv[1:])
+        start = time.perf_counter()
+        hits = index.search_text(query, k=10)
+        print(f"🔎 '{query}' ({len(index)} Vektoren, {(time.perf_counter() - start) * 1000:.1f}ms)")
+        for uid, sim in hits:
+            print(f"   {sim:.3f}  {uid}")
+    else:
+        print(f"📊 {len(index)} Vektoren · Model {get_model_name()} · {index.db_path}")
@@ -1,98 +1,438 @@
 """
 API Client für 7B Model Communication
+
+=== CONNECTION POOLING ===
+- sync:  EINE requests.Session pro Prozess (Keep-Alive, HTTPAdapter Pool)
+         → TCP+TLS Handshake zu API_ENDPOINT nur einmal pro Connection
+- async: ein httpx.AsyncClient pro APIClient UND laufendem Event Loop
+         (WeakKeyDictionary - jeder asyncio.run() bekommt einen eigenen)
+         Keep-Alive, HTTP/2 wenn "h2" installiert → send_async() kann
+         vom Calibrator awaited werden
+
+=== STREAMING ===
+send_stream() liest die Response inkrementell (SSE "data:" Lines oder
+chunked Plain-Text) und ruft pro Chunk on_token(). on_token() → False
+bricht die Generation ab (Connection wird geschlossen).
+
+=== RETRY ===
+Timeout / Connection Error → Retry mit exponentiellem Backoff + Jitter
+(RETRY_DELAYS als Basis, ±RETRY_JITTER). HTTP/Format-Fehler → kein Retry.
 """
 
+import asyncio
+import json
+import random
 import requests
+import threading
 import time
 import sys
-from typing import Optional, Tuple
+import weakref
+from typing import Callable, Iterator, Optional, Tuple
+
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import h2  # noqa: F401 - nur Verfügbarkeits-Check für HTTP/2
+    H2_AVAILABLE = True
+except ImportError:
+    H2_AVAILABLE = False
 
 from .config import (
     API_ENDPOINT,
     MODEL_PARAMS,
     MAX_RETRIES,
     RETRY_DELAYS,
+    RETRY_JITTER,
     CONNECT_TIMEOUT,
-    READ_TIMEOUT
+    READ_TIMEOUT,
+    HTTP_POOL_MAXSIZE,
+    HTTP2_ENABLED
 )
 
 
+# ============================================================================
+# SHARED SESSION - ein Connection Pool pro Prozess
+# ============================================================================
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Shared requests.Session mit Keep-Alive Pool (thread-safe lazy init)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_MAXSIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({"Content-Type": "application/json"})
+                _session = session
+    return _session
+
+
+def backoff_delay(attempt: int) -> float:
+    """
+    Wartezeit vor Retry Nr. attempt+1
+
+    RETRY_DELAYS[attempt] als Basis (danach verdoppelt), ±RETRY_JITTER
+    → parallele Worker hämmern nicht gleichzeitig auf den Endpoint
+    """
+    if attempt < len(RETRY_DELAYS):
+        base = RETRY_DELAYS[attempt]
+    else:
+        base = RETRY_DELAYS[-1] * 2 ** (attempt - len(RETRY_DELAYS) + 1)
+    return base * random.uniform(1 - RETRY_JITTER, 1 + RETRY_JITTER)
+
+
 class APIClient:
-    """Client für 7B Model API mit Retry-Logik"""
-    
-    def __init__(self):
-        self.endpoint = API_ENDPOINT
+    """Client für 7B Model API mit Retry-Logik und Connection Pooling"""
+
+    def __init__(self, endpoint: Optional[str] = None):
+        self.endpoint = endpoint or API_ENDPOINT
         self.params = MODEL_PARAMS
-    
+        # Ein AsyncClient pro Event Loop - jeder asyncio.run() hat einen neuen Loop
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = \
+            weakref.WeakKeyDictionary()
+        self._async_lock = threading.Lock()
+
+    def _payload(self, prompt: str) -> dict:
+        return {
+            "prompt": prompt,
+            **self.params
+        }
+
+    def _log_retry(self, attempt: int, error_msg: str, delay: float) -> None:
+        print(
+            f"⚠️  Versuch {attempt + 1}/{MAX_RETRIES} fehlgeschlagen: "
+            f"{error_msg}. Retry in {delay:.1f}s...",
+            file=sys.stderr
+        )
+
+    # ========================================================================
+    # SYNC
+    # ========================================================================
+
     def send(self, prompt: str) -> Tuple[Optional[str], Optional[str], int]:
         """
-        Sendet Prompt an 7B Model.
-        
+        Sendet Prompt an 7B Model (pooled Session).
+
         Args:
             prompt: Vollständiger SYNTEX-kalibrierter Prompt
-        
+
         Returns:
             (response_text, error_message, retry_count)
         """
-        payload = {
-            "prompt": prompt,
-            **self.params
-        }
-        
+        payload = self._payload(prompt)
+        session = get_session()
+
         for attempt in range(MAX_RETRIES):
             try:
-                response = requests.post(
+                response = session.post(
                     self.endpoint,
                     json=payload,
-                    headers={"Content-Type": "application/json"},
                     timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)
                 )
-                
+
                 # Server Errors
                 if response.status_code >= 500:
                     raise requests.HTTPError(
                         f"Server Error {response.status_code}"
                     )
-                
+
                 response.raise_for_status()
                 result = response.json()
-                
+
                 # Response validieren
                 if "response" not in result:
                     raise ValueError(f"Invalid response format")
-                
+
                 return result["response"], None, attempt
-                
-            except requests.Timeout:
-                error_msg = f"Timeout after {READ_TIMEOUT}s"
-                if attempt < MAX_RETRIES - 1:
-                    print(
-                        f"⚠️  Versuch {attempt + 1}/{MAX_RETRIES} fehlgeschlagen: "
-                        f"{error_msg}. Retry in {RETRY_DELAYS[attempt]}s...",
-                        file=sys.stderr
-                    )
-                    time.sleep(RETRY_DELAYS[attempt])
+
+            except (requests.Timeout, requests.ConnectionError) as e:
+                if isinstance(e, requests.Timeout):
+                    error_msg = f"Timeout after {READ_TIMEOUT}s"
                 else:
-                    return None, error_msg, attempt
-                    
-            except requests.ConnectionError as e:
-                error_msg = f"Connection failed: {str(e)}"
+                    error_msg = f"Connection failed: {str(e)}"
                 if attempt < MAX_RETRIES - 1:
-                    print(
-                        f"⚠️  Versuch {attempt + 1}/{MAX_RETRIES} fehlgeschlagen: "
-                        f"{error_msg}. Retry in {RETRY_DELAYS[attempt]}s...",
-                        file=sys.stderr
-                    )
-                    time.sleep(RETRY_DELAYS[attempt])
+                    delay = backoff_delay(attempt)
+                    self._log_retry(attempt, error_msg, delay)
+                    time.sleep(delay)
                 else:
                     return None, error_msg, attempt
-                    
+
             except (requests.HTTPError, ValueError) as e:
                 error_msg = f"{type(e).__name__}: {str(e)}"
                 return None, error_msg, attempt
-                
+
             except Exception as e:
                 error_msg = f"Unexpected error: {type(e).__name__}: {str(e)}"
                 return None, error_msg, attempt
-        
+
         return None, "Max retries exceeded", MAX_RETRIES - 1
+
+    # ========================================================================
+    # STREAMING
+    # ========================================================================
+
+    def send_stream(
+        self,
+        prompt: str,
+        on_token: Callable[[str], bool]
+    ) -> Tuple[Optional[str], Optional[str], int]:
+        """
+        Sendet Prompt mit "stream": true und liefert Tokens live an on_token.
+
+        Args:
+            prompt: Vollständiger SYNTEX-kalibrierter Prompt
+            on_token: Callback pro Chunk - return False → Abort
+
+        Returns:
+            (response_text, error_message, retry_count)
+            Bei Abort: (bisheriger Text, "Aborted: ...", retry_count)
+
+        Retry nur solange noch KEIN Token angekommen ist.
+        """
+        payload = {**self._payload(prompt), "stream": True}
+        session = get_session()
+
+        for attempt in range(MAX_RETRIES):
+            received = []
+            try:
+                with session.post(
+                    self.endpoint,
+                    json=payload,
+                    timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+                    stream=True
+                ) as response:
+                    if response.status_code >= 500:
+                        raise requests.HTTPError(f"Server Error {response.status_code}")
+                    response.raise_for_status()
+
+                    for chunk in self._iter_stream(response):
+                        received.append(chunk)
+                        if on_token(chunk) is False:
+                            return "".join(received), "Aborted: stopped by stream consumer", attempt
+
+                text = "".join(received)
+                if not text:
+                    raise ValueError("Empty stream")
+                return text, None, attempt
+
+            except (requests.Timeout, requests.ConnectionError) as e:
+                if isinstance(e, requests.Timeout):
+                    error_msg = f"Timeout after {READ_TIMEOUT}s"
+                else:
+                    error_msg = f"Connection failed: {str(e)}"
+                if not received and attempt < MAX_RETRIES - 1:
+                    delay = backoff_delay(attempt)
+                    self._log_retry(attempt, error_msg, delay)
+                    time.sleep(delay)
+                else:
+                    return ("".join(received) or None), error_msg, attempt
+
+            except (requests.HTTPError, ValueError) as e:
+                return None, f"{type(e).__name__}: {str(e)}", attempt
+
+            except Exception as e:
+                return None, f"Unexpected error: {type(e).__name__}: {str(e)}", attempt
+
+        return None, "Max retries exceeded", MAX_RETRIES - 1
+
+    @staticmethod
+    def _iter_stream(response) -> Iterator[str]:
+        """
+        Tokens aus Streaming Response
+
+        - text/event-stream: "data: {...}" Lines, Token in "token" | "text"
+          | "response", Ende bei "data: [DONE]"
+        - sonst: chunked Plain-Text
+        """
+        content_type = response.headers.get("Content-Type", "")
+
+        if "text/event-stream" in content_type:
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    return
+                try:
+                    event = json.loads(data)
+                except ValueError:
+                    yield data
+                    continue
+                if isinstance(event, dict):
+                    token = event.get("token") or event.get("text") or event.get("response") or ""
+                    if token:
+                        yield token
+                    if event.get("done"):
+                        return
+        else:
+            response.encoding = response.encoding or "utf-8"
+            for chunk in response.iter_content(chunk_size=None, decode_unicode=True):
+                if chunk:
+                    yield chunk
+
+    # ========================================================================
+    # ASYNC
+    # ========================================================================
+
+    def _get_async_client(self):
+        """httpx.AsyncClient für den laufenden Event Loop (lazy) - Keep-Alive + HTTP/2 wenn verfügbar"""
+        if httpx is None:
+            raise RuntimeError("httpx nicht installiert - pip install httpx[http2]")
+        loop = asyncio.get_running_loop()
+        with self._async_lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = httpx.AsyncClient(
+                    http2=HTTP2_ENABLED and H2_AVAILABLE,
+                    timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+                    limits=httpx.Limits(
+                        max_connections=HTTP_POOL_MAXSIZE,
+                        max_keepalive_connections=HTTP_POOL_MAXSIZE
+                    ),
+                    headers={"Content-Type": "application/json"}
+                )
+                self._async_clients[loop] = client
+            return client
+
+    async def send_async(self, prompt: str) -> Tuple[Optional[str], Optional[str], int]:
+        """
+        Async Variante von send() - blockiert keinen Worker-Thread,
+        Backoff via asyncio.sleep.
+
+        Returns:
+            (response_text, error_message, retry_count)
+        """
+        payload = self._payload(prompt)
+        client = self._get_async_client()
+
+        for attempt in range(MAX_RETRIES):
+            try:
+                response = await client.post(self.endpoint, json=payload)
+
+                # Server Errors
+                if response.status_code >= 500:
+                    return None, f"HTTPError: Server Error {response.status_code}", attempt
+                if response.status_code >= 400:
+                    return None, f"HTTPError: {response.status_code} Client Error for url: {self.endpoint}", attempt
+
+                result = response.json()
+
+                # Response validieren
+                if "response" not in result:
+                    return None, "ValueError: Invalid response format", attempt
+
+                return result["response"], None, attempt
+
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                if isinstance(e, httpx.TimeoutException):
+                    error_msg = f"Timeout after {READ_TIMEOUT}s"
+                else:
+                    error_msg = f"Connection failed: {str(e)}"
+                if attempt < MAX_RETRIES - 1:
+                    delay = backoff_delay(attempt)
+                    self._log_retry(attempt, error_msg, delay)
+                    await asyncio.sleep(delay)
+                else:
+                    return None, error_msg, attempt
+
+            except ValueError as e:
+                return None, f"{type(e).__name__}: {str(e)}", attempt
+
+            except Exception as e:
+                return None, f"Unexpected error: {type(e).__name__}: {str(e)}", attempt
+
+        return None, "Max retries exceeded", MAX_RETRIES - 1
+
+    async def aclose(self) -> None:
+        """Async Connection Pool des laufenden Loops schließen"""
+        with self._async_lock:
+            client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+# === MAIN BLOCK ===
+# Test gegen lokalen Stub-Server: python3 -m syntex.api.client
+if __name__ == "__main__":
+    import json
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    connections = set()
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-Alive
+
+        def do_POST(self):
+            connections.add(self.client_address)
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            if body.get("stream"):
+                # SSE: ein Event pro Wort, dann [DONE]
+                events = [f"data: {json.dumps({'token': w + ' '})}\n\n" for w in body["prompt"].split()]
+                data = ("".join(events) + "data: [DONE]\n\n").encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+                return
+            data = json.dumps({"response": f"echo: {body['prompt']}"}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    endpoint = f"http://127.0.0.1:{server.server_port}/api/chat"
+
+    print("=== API CLIENT STUB TEST ===\n")
+
+    # Sync: 10 Requests → 1 Connection (Keep-Alive)
+    client = APIClient(endpoint=endpoint)
+    for i in range(10):
+        text, error, retries = client.send(f"prompt {i}")
+        assert text == f"echo: prompt {i}" and error is None
+    print(f"✅ sync:  10 requests, {len(connections)} connection(s)")
+
+    # Async: 10 parallele Requests
+    if httpx is not None:
+        connections.clear()
+
+        async def run_async():
+            results = await asyncio.gather(*(client.send_async(f"prompt {i}") for i in range(10)))
+            await client.aclose()
+            return results
+
+        results = asyncio.run(run_async())
+        assert all(error is None for _, error, _ in results)
+        print(f"✅ async: 10 requests, {len(connections)} connection(s)")
+    else:
+        print("⏭️  async: httpx nicht installiert - übersprungen")
+
+    # Streaming: Tokens kommen einzeln, Abort nach 3 Tokens
+    tokens = []
+    text, error, _ = client.send_stream("eins zwei drei vier fünf", lambda t: tokens.append(t) or len(tokens) < 3)
+    assert tokens[:3] == ["eins ", "zwei ", "drei "] and error.startswith("Aborted")
+    print(f"✅ stream: {len(tokens)} tokens, abort → {error}")
+
+    # Connection Refused → Retries mit Backoff
+    server.shutdown()
+    server.server_close()
+    start = time.time()
+    text, error, retries = APIClient(endpoint=endpoint).send("x")
+    print(f"✅ refused: {error[:40]}... ({retries + 1} Versuche, {time.time() - start:.1f}s)")
@@ -1,6 +1,7 @@
 """
 SYNTEX API Configuration
 """
+import os
 
 # API Endpoint
 API_ENDPOINT = "https://dev.syntx-system.com/api/chat"
@@ -11,7 +12,23 @@ READ_TIMEOUT = 3600  # 60 MINUTEN - Llama hat alle Zeit der Welt!
 
 # Retry Configuration
 MAX_RETRIES = 3
-RETRY_DELAYS = [1, 3, 7]  # Sekunden zwischen Retries
+RETRY_DELAYS = [1, 3, 7]  # Sekunden zwischen Retries (Basis, danach x2)
+RETRY_JITTER = 0.5        # ±50% Jitter - parallele Worker retryen nicht synchron
+
+# Connection Pool (Keep-Alive zu API_ENDPOINT)
+HTTP_POOL_MAXSIZE = 10    # >= CONSUMER_MAX_WORKERS
+HTTP2_ENABLED = True      # Nur async Client, nur wenn "h2" installiert ist
+
+# Streaming (chunked / SSE) - ENV Toggle, Default aus
+STREAM_ENABLED = os.getenv("SYNTX_STREAM", "false").lower() == "true"
+STREAM_DETECT_CHARS = 1500  # Ohne Feld-Header nach N Zeichen → Abort
+
+# Erwartetes Response-Format pro Wrapper (Early Abort bei falschem Format)
+WRAPPER_EXPECTED_FORMAT = {
+    "sigma": "SIGMA",
+    "syntex_system": "SYNTEX_SYSTEM",
+    "human": "HUMAN",
+}
 
 # Model Parameters
 MODEL_PARAMS = {
@@ -0,0 +1,446 @@
+"""
+SYNTEX Calibration Index - Byte-Offset Sidecar für syntex_calibrations.jsonl
+
+=== ZWECK ===
+Jede Zeile im Calibration-Log enthält komplette Prompts + Responses →
+die Datei wird Gigabytes groß. Statt sie für "letzte N" oder Stats
+komplett zu lesen, führt CalibrationLogger einen Index daneben:
+
+    syntex_calibrations.jsonl       ← Log (unverändert)
+    syntex_calibrations.jsonl.idx   ← ein fixer Record pro Zeile
+
+=== RECORD (31 Bytes, little endian) ===
+offset    Q   Byte-Offset der Zeile im Log
+length    I   Länge der Zeile inkl. Newline
+timestamp d   Unix-Timestamp (aus "timestamp")
+success   B   0/1
+score     h   quality_score.total_score (-1 = keiner)
+job       Q   erste 8 Bytes von sha1(job_uid) (0 = kein job_uid)
+
+=== HEADER (16 Bytes) ===
+magic "SXCI" + Version + Inode des Logs
+→ anderes Inode (Log ersetzt) oder Log kleiner als indexiert
+  (truncate) = Index wird neu aufgebaut
+
+=== SYNC ===
+Wer am Logger vorbei ins Log schreibt, wird beim nächsten sync()
+nachindexiert (Scan ab dem letzten indexierten Byte, nicht ab 0).
+
+=== JOB LOOKUP ===
+Der Consumer schreibt job_uid in Log-Eintrag UND processed-Metadata.
+find_job(job_uid) → Hash-Map {job-hash: record} (inkrementell aus dem
+Index aufgebaut) → ein Seek ins Log. Mehrere Einträge pro Job
+(Retries) → der neueste gewinnt.
+
+=== VERWENDUNG ===
+    index = get_calibration_index(log_file)
+    index.tail_entries(20)   # letzte 20 Einträge (nur 20 Seeks)
+    index.stats()            # total/completed/failed - ohne das Log zu lesen
+    index.find_job("20251206_002605_123456__topic_x__style_y")  # O(1)
+"""
+
+import hashlib
+import json
+import os
+import struct
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+try:
+    import fcntl
+except ImportError:  # Nicht-POSIX: kein Cross-Prozess Lock
+    fcntl = None
+
+
+HEADER = struct.Struct("<4sHxxQ")
+RECORD = struct.Struct("<QIdBhQ")
+MAGIC = b"SXCI"
+VERSION = 2
+
+
+class IndexRecord(NamedTuple):
+    offset: int
+    length: int
+    timestamp: float
+    success: bool
+    score: Optional[int]
+    job: int
+
+
+def job_hash(job_uid: Optional[str]) -> int:
+    """job_uid → 64-bit Hash (0 = kein job_uid)"""
+    if not job_uid:
+        return 0
+    return int.from_bytes(hashlib.sha1(str(job_uid).encode("utf-8")).digest()[:8], "little") or 1
+
+
+def parse_timestamp(value: Optional[str]) -> float:
+    """ISO Timestamp ("2025-12-10T00:19:55.093607Z") → Unix-Timestamp (0.0 = unbekannt)"""
+    if not value:
+        return 0.0
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if dt.tzinfo is None:
+            # Logger schreibt utcnow() + "Z" - naive Timestamps ebenfalls als UTC
+            return (dt - datetime(1970, 1, 1)).total_seconds()
+        return dt.timestamp()
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def _record_values(entry: Dict, offset: int, length: int) -> tuple:
+    score = (entry.get("quality_score") or {}).get("total_score")
+    try:
+        score = max(-1, min(32767, int(round(float(score))))) if score is not None else -1
+    except (TypeError, ValueError):
+        score = -1
+    return (
+        offset, length, parse_timestamp(entry.get("timestamp")),
+        1 if entry.get("success") else 0, score, job_hash(entry.get("job_uid"))
+    )
+
+
+class CalibrationIndex:
+    """
+    Sidecar-Index für ein Calibration-Log
+
+    === THREAD-SAFETY ===
+    Ein Lock pro Instanz; Schreiben (append) zusätzlich flock auf dem
+    Log → mehrere Consumer-Prozesse können parallel loggen
+    """
+
+    def __init__(self, log_file: Path):
+        self.log_file = Path(log_file)
+        self.index_file = self.log_file.with_name(self.log_file.name + ".idx")
+        self._lock = threading.Lock()
+        # Inkrementelle Stats: gelten für die ersten _stats_count Records
+        self._stats_count = 0
+        self._stats = self._empty_stats()
+        # Job-Lookup: job-hash → Record-Nummer, gilt für die ersten _jobs_count Records
+        self._jobs_count = 0
+        self._jobs: Dict[int, int] = {}
+        # Inode des Index-Files zu dem die Caches gehören - _reset() (auch in
+        # einem anderen Prozess) ersetzt das File per os.replace → neues Inode
+        self._cache_inode = 0
+
+    # ========================================================================
+    # INDEX FILE
+    # ========================================================================
+
+    def _count(self) -> int:
+        try:
+            size = self.index_file.stat().st_size
+        except FileNotFoundError:
+            return 0
+        return max(0, (size - HEADER.size) // RECORD.size)
+
+    def _indexed_end(self) -> int:
+        """Erstes Byte im Log das noch nicht indexiert ist"""
+        count = self._count()
+        if count == 0:
+            return 0
+        with open(self.index_file, "rb") as f:
+            f.seek(HEADER.size + (count - 1) * RECORD.size)
+            offset, length, *_ = RECORD.unpack(f.read(RECORD.size))
+        return offset + length
+
+    def _header_valid(self, inode: int) -> bool:
+        try:
+            with open(self.index_file, "rb") as f:
+                magic, version, stored_inode = HEADER.unpack(f.read(HEADER.size))
+        except (OSError, struct.error):
+            return False
+        return magic == MAGIC and version == VERSION and stored_inode == inode
+
+    def _reset(self, inode: int) -> None:
+        tmp = self.index_file.with_name(self.index_file.name + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, inode))
+        os.replace(tmp, self.index_file)
+        self._clear_caches()
+
+    def _clear_caches(self) -> None:
+        self._stats_count = 0
+        self._stats = self._empty_stats()
+        self._jobs_count = 0
+        self._jobs = {}
+
+    def _check_caches(self, count: int) -> None:
+        """Caches verwerfen wenn der Index neu aufgebaut wurde - egal von welchem Prozess"""
+        try:
+            inode = self.index_file.stat().st_ino
+        except FileNotFoundError:
+            inode = 0
+        if inode != self._cache_inode or count < self._stats_count or count < self._jobs_count:
+            self._clear_caches()
+            self._cache_inode = inode
+
+    def _sync_locked(self, flocked: bool = False) -> int:
+        """
+        Index auf Stand des Logs bringen (Lock muss gehalten werden)
+
+        Nachindexieren nur unter flock auf dem Log - sonst könnte ein
+        Reader die Zeile eines Writers indexieren, bevor der Writer
+        seinen eigenen Record anhängt (→ doppelter Record)
+        """
+        try:
+            stat = self.log_file.stat()
+        except FileNotFoundError:
+            return 0
+
+        if self._header_valid(stat.st_ino) and self._indexed_end() == stat.st_size:
+            return self._count()  # Fast Path: nichts Neues
+
+        with open(self.log_file, "rb") as log:
+            if fcntl and not flocked:
+                fcntl.flock(log.fileno(), fcntl.LOCK_EX)
+            try:
+                size = os.fstat(log.fileno()).st_size
+                # Log ersetzt (anderes Inode) oder gekürzt → Index komplett neu aufbauen
+                if not self._header_valid(stat.st_ino) or self._indexed_end() > size:
+                    self._reset(stat.st_ino)
+
+                start = self._indexed_end()
+                records = []
+                log.seek(start)
+                offset = start
+                for line in log:
+                    if not line.endswith(b"\n"):
+                        break  # Zeile wird gerade geschrieben
+                    try:
+                        entry = json.loads(line)
+                        records.append(RECORD.pack(*_record_values(entry, offset, len(line))))
+                    except (ValueError, AttributeError):
+                        pass  # Kaputte Zeile - wird übersprungen wie bisher
+                    offset += len(line)
+
+                if records:
+                    with open(self.index_file, "ab") as f:
+                        f.write(b"".join(records))
+            finally:
+                if fcntl and not flocked:
+                    fcntl.flock(log.fileno(), fcntl.LOCK_UN)
+        return self._count()
+
+    def sync(self) -> int:
+        """Neue Log-Zeilen nachindexieren → Anzahl Records"""
+        with self._lock:
+            return self._sync_locked()
+
+    # ========================================================================
+    # WRITE (CalibrationLogger)
+    # ========================================================================
+
+    def append_entry(self, entry: Dict) -> None:
+        """Eintrag ans Log anhängen UND indexieren (atomar gegenüber anderen Prozessen)"""
+        line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            with open(self.log_file, "ab") as log:
+                if fcntl:
+                    fcntl.flock(log.fileno(), fcntl.LOCK_EX)
+                try:
+                    # Zeilen anderer Writer zuerst indexieren → Offsets bleiben lückenlos
+                    self._sync_locked(flocked=True)
+                    log.seek(0, os.SEEK_END)
+                    offset = log.tell()
+                    log.write(line)
+                    log.flush()
+                    with open(self.index_file, "ab") as f:
+                        f.write(RECORD.pack(*_record_values(entry, offset, len(line))))
+                finally:
+                    if fcntl:
+                        fcntl.flock(log.fileno(), fcntl.LOCK_UN)
+
+    # ========================================================================
+    # READ
+    # ========================================================================
+
+    def records(self, start: int = 0, stop: Optional[int] = None) -> List[IndexRecord]:
+        """Records [start:stop] (nach sync) - ohne das Log anzufassen"""
+        with self._lock:
+            count = self._sync_locked()
+            return self._read_records(start, count if stop is None else min(stop, count))
+
+    def _read_records(self, start: int, stop: int) -> List[IndexRecord]:
+        if stop <= start:
+            return []
+        with open(self.index_file, "rb") as f:
+            f.seek(HEADER.size + start * RECORD.size)
+            data = f.read((stop - start) * RECORD.size)
+        return [
+            IndexRecord(o, l, t, bool(s), None if sc < 0 else sc, j)
+            for o, l, t, s, sc, j in RECORD.iter_unpack(data[:len(data) - len(data) % RECORD.size])
+        ]
+
+    def tail(self, n: int) -> List[IndexRecord]:
+        """Letzte n Records (chronologisch)"""
+        with self._lock:
+            count = self._sync_locked()
+            return self._read_records(max(0, count - n), count)
+
+    def read_entries(self, records: List[IndexRecord]) -> List[Dict]:
+        """Log-Einträge zu Records laden (ein Seek pro Record)"""
+        entries = []
+        if not records:
+            return entries
+        with open(self.log_file, "rb") as log:
+            for rec in records:
+                log.seek(rec.offset)
+                try:
+                    entries.append(json.loads(log.read(rec.length)))
+                except ValueError:
+                    continue
+        return entries
+
+    def tail_entries(self, n: int) -> List[Dict]:
+        """Letzte n Log-Einträge (chronologisch) - liest nur diese n Zeilen"""
+        return self.read_entries(self.tail(n))
+
+    def entries_between(self, start_ts: float, end_ts: float) -> List[Dict]:
+        """
+        Einträge mit start_ts <= timestamp <= end_ts
+
+        Binary Search direkt im Index-File (O(log n) Seeks) - das Log ist
+        append-only, Timestamps also aufsteigend
+        """
+        with self._lock:
+            count = self._sync_locked()
+            lo = self._bisect(start_ts, 0, count, right=False)
+            hi = self._bisect(end_ts, lo, count, right=True)
+            records = self._read_records(lo, hi)
+        return self.read_entries(records)
+
+    def _bisect(self, ts: float, lo: int, hi: int, right: bool) -> int:
+        with open(self.index_file, "rb") as f:
+            while lo < hi:
+                mid = (lo + hi) // 2
+                f.seek(HEADER.size + mid * RECORD.size)
+                mid_ts = RECORD.unpack(f.read(RECORD.size))[2]
+                if mid_ts < ts or (right and mid_ts == ts):
+                    lo = mid + 1
+                else:
+                    hi = mid
+        return lo
+
+    def find_job(self, job_uid: str) -> Optional[Dict]:
+        """
+        Neuester Log-Eintrag eines Jobs - O(1) nach dem ersten Aufbau
+
+        Hash-Kollision (64 Bit) wird über job_uid im Eintrag abgesichert
+        """
+        key = job_hash(job_uid)
+        if not key:
+            return None
+        with self._lock:
+            count = self._sync_locked()
+            self._check_caches(count)
+            start = self._jobs_count
+            for i, rec in enumerate(self._read_records(start, count), start):
+                if rec.job:
+                    self._jobs[rec.job] = i
+            self._jobs_count = count
+            recno = self._jobs.get(key)
+            if recno is None:
+                return None
+            records = self._read_records(recno, recno + 1)
+        entries = self.read_entries(records)
+        if entries and entries[0].get("job_uid") == job_uid:
+            return entries[0]
+        return None
+
+    # ========================================================================
+    # STATS - nur aus dem Index
+    # ========================================================================
+
+    @staticmethod
+    def _empty_stats() -> Dict:
+        return {"total": 0, "completed": 0, "failed": 0, "scored": 0, "score_sum": 0,
+                "first_timestamp": None, "last_timestamp": None}
+
+    def stats(self) -> Dict:
+        """
+        total / completed / failed / avg_score / first + last Timestamp
+
+        Inkrementell: nur Records seit dem letzten Aufruf werden gelesen
+        """
+        with self._lock:
+            count = self._sync_locked()
+            self._check_caches(count)
+            s = self._stats
+            for rec in self._read_records(self._stats_count, count):
+                s["total"] += 1
+                s["completed" if rec.success else "failed"] += 1
+                if rec.score is not None:
+                    s["scored"] += 1
+                    s["score_sum"] += rec.score
+                if rec.timestamp:
+                    if s["first_timestamp"] is None:
+                        s["first_timestamp"] = rec.timestamp
+                    s["last_timestamp"] = rec.timestamp
+            self._stats_count = count
+
+            result = {k: v for k, v in s.items() if k not in ("scored", "score_sum")}
+            result["avg_score"] = round(s["score_sum"] / s["scored"], 2) if s["scored"] else 0.0
+            return result
+
+
+# ============================================================================
+# SHARED INSTANCES - eine pro Log-File und Prozess
+# ============================================================================
+
+_indexes: Dict[str, CalibrationIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_calibration_index(log_file: Path) -> CalibrationIndex:
+    """Shared CalibrationIndex für ein Log-File"""
+    key = str(Path(log_file).resolve())
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = CalibrationIndex(Path(log_file))
+        return _indexes[key]
+
+
+if __name__ == "__main__":
+    import sys
+    import tempfile
+    import time
+
+    print("=== SYNTEX CALIBRATION INDEX TEST ===")
+    if len(sys.argv) > 1:
+        # Echtes Log: Index bauen + Stats
+        index = get_calibration_index(Path(sys.argv[1]))
+        start = time.perf_counter()
+        print(f"Records: {index.sync()} ({time.perf_counter() - start:.2f}s)")
+        print(f"Stats: {index.stats()}")
+        sys.exit(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log = Path(tmp) / "calibrations.jsonl"
+        index = CalibrationIndex(log)
+        for i in range(5):
+            index.append_entry({
+                "timestamp": f"2025-12-10T00:0{i}:00.000000Z",
+                "success": i != 2,
+                "quality_score": {"total_score": 80 + i} if i != 2 else None,
+                "response": "x" * 1000,
+            })
+        # Fremder Writer am Index vorbei
+        with open(log, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"timestamp": "2025-12-10T00:09:00Z", "success": True}) + "\n")
+
+        assert [e["timestamp"][:16] for e in index.tail_entries(2)] == ["2025-12-10T00:04", "2025-12-10T00:09"]
+        stats = index.stats()
+        assert stats["total"] == 6 and stats["failed"] == 1, stats
+        window = index.entries_between(parse_timestamp("2025-12-10T00:01:00Z"), parse_timestamp("2025-12-10T00:03:00Z"))
+        assert len(window) == 3, window
+        index.append_entry({"timestamp": "2025-12-10T00:10:00Z", "success": True, "job_uid": "job_a", "response": "A1"})
+        index.append_entry({"timestamp": "2025-12-10T00:11:00Z", "success": True, "job_uid": "job_b", "response": "B"})
+        index.append_entry({"timestamp": "2025-12-10T00:12:00Z", "success": True, "job_uid": "job_a", "response": "A2"})
+        assert index.find_job("job_a")["response"] == "A2"
+        assert index.find_job("job_b")["response"] == "B"
+        assert index.find_job("job_c") is None
+        print(f"Stats: {stats}")
+    print("✅ Calibration Index OK")
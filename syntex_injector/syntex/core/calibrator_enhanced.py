@@ -10,9 +10,9 @@ from typing import Optional, Tuple, Dict
 
 from .wrapper import SyntexWrapper
 from .logger import CalibrationLogger
-from .parser import SyntexParser
+from .parser import SyntexParser, StreamingSyntexParser
 from ..api.client import APIClient
-from ..api.config import MODEL_PARAMS
+from ..api.config import MODEL_PARAMS, STREAM_ENABLED, STREAM_DETECT_CHARS, WRAPPER_EXPECTED_FORMAT
 import os
 from ..analysis.scorer import SyntexScorer
 from ..analysis.scorer_v2 import score_all_fields, QualityScoreV2
@@ -36,6 +36,7 @@ class EnhancedSyntexCalibrator:
         log_file: Optional[Path] = None,
         progress_file: Optional[Path] = None
     ):
+        self.wrapper_name = wrapper_name
         self.wrapper = SyntexWrapper(wrapper_name)
         self.client = APIClient()
         self.logger = CalibrationLogger(log_file)
@@ -49,7 +50,9 @@ class EnhancedSyntexCalibrator:
         meta_prompt: str,
         verbose: bool = True,
         show_quality: bool = True,
-        gpt_user_prompt: Optional[str] = None  # 🔥 NEU!
+        gpt_user_prompt: Optional[str] = None,  # 🔥 NEU!
+        stream: Optional[bool] = None,
+        job_uid: Optional[str] = None
     ) -> Tuple[bool, Optional[str], Dict]:
         """
         Führt Enhanced SYNTEX-Kalibrierung durch.
@@ -58,6 +61,8 @@ class EnhancedSyntexCalibrator:
             meta_prompt: Der zu analysierende Meta-Prompt
             verbose: Ausgabe im Terminal
             show_quality: Zeige Quality Score
+            stream: Streaming-Modus (default: SYNTX_STREAM ENV)
+            job_uid: Queue-Job ID → landet im Calibration-Log (Join mit processed/)
         
         Returns:
             (success, response, metadata)
@@ -79,9 +84,122 @@ class EnhancedSyntexCalibrator:
         
         # 2. An Model senden
         start_time = time.time()
-        response, error, retry_count = self.client.send(full_prompt)
+        stream_metrics = None
+        if STREAM_ENABLED if stream is None else stream:
+            response, error, retry_count, stream_metrics = self._send_streaming(full_prompt, verbose)
+        else:
+            response, error, retry_count = self.client.send(full_prompt)
         duration_ms = int((time.time() - start_time) * 1000)
         
+        return self._finish(
+            meta_prompt, full_prompt, response, error, retry_count,
+            duration_ms, verbose, show_quality, gpt_user_prompt, stream_metrics, job_uid
+        )
+    
+    def _send_streaming(self, full_prompt: str, verbose: bool) -> Tuple[Optional[str], Optional[str], int, Dict]:
+        """
+        Streaming-Call mit inkrementellem Parsing
+        
+        === METRIKEN ===
+        - time_to_first_token_ms
+        - time_to_first_field_ms: erstes komplett empfangenes Feld
+        - fields_streamed: Felder in Reihenfolge ihrer Fertigstellung
+        - aborted: Abort-Grund (falsches Format → GPU-Zeit gespart)
+        
+        Returns:
+            (response, error, retry_count, stream_metrics)
+        """
+        parser = StreamingSyntexParser(
+            expected_format=WRAPPER_EXPECTED_FORMAT.get(self.wrapper_name),
+            detect_chars=STREAM_DETECT_CHARS
+        )
+        metrics = {
+            "time_to_first_token_ms": None,
+            "time_to_first_field_ms": None,
+            "fields_streamed": [],
+            "format": None,
+            "aborted": None
+        }
+        start_time = time.time()
+        
+        def on_token(chunk: str) -> bool:
+            elapsed_ms = int((time.time() - start_time) * 1000)
+            if metrics["time_to_first_token_ms"] is None:
+                metrics["time_to_first_token_ms"] = elapsed_ms
+            
+            completed = parser.feed(chunk)
+            if completed:
+                if metrics["time_to_first_field_ms"] is None:
+                    metrics["time_to_first_field_ms"] = elapsed_ms
+                metrics["fields_streamed"].extend(completed)
+                if verbose:
+                    print(f"  🌊 Feld komplett: {', '.join(completed)} ({elapsed_ms}ms)")
+            
+            reason = parser.abort_reason()
+            if reason:
+                metrics["aborted"] = reason
+                return False
+            return True
+        
+        response, error, retry_count = self.client.send_stream(full_prompt, on_token)
+        metrics["format"] = parser.format
+        
+        if metrics["aborted"]:
+            error = f"Aborted: {metrics['aborted']}"
+            if verbose:
+                print(f"🛑 Stream abgebrochen: {metrics['aborted']}")
+        
+        return response, error, retry_count, metrics
+    
+    async def acalibrate(
+        self,
+        meta_prompt: str,
+        verbose: bool = True,
+        show_quality: bool = True,
+        gpt_user_prompt: Optional[str] = None,
+        job_uid: Optional[str] = None
+    ) -> Tuple[bool, Optional[str], Dict]:
+        """
+        Async Variante von calibrate() - awaited APIClient.send_async().
+        
+        Parse/Score/Logging identisch zu calibrate().
+        
+        Returns:
+            (success, response, metadata)
+        """
+        try:
+            full_prompt = self.wrapper.build_prompt(meta_prompt)
+        except FileNotFoundError as e:
+            print(f"❌ {e}")
+            return False, None, {"error": str(e)}
+        
+        if verbose:
+            print(f"📤 Sende an Model async (Session: {self.session_id})...")
+        
+        start_time = time.time()
+        response, error, retry_count = await self.client.send_async(full_prompt)
+        duration_ms = int((time.time() - start_time) * 1000)
+        
+        return self._finish(
+            meta_prompt, full_prompt, response, error, retry_count,
+            duration_ms, verbose, show_quality, gpt_user_prompt, job_uid=job_uid
+        )
+    
+    def _finish(
+        self,
+        meta_prompt: str,
+        full_prompt: str,
+        response: Optional[str],
+        error: Optional[str],
+        retry_count: int,
+        duration_ms: int,
+        verbose: bool,
+        show_quality: bool,
+        gpt_user_prompt: Optional[str],
+        stream_metrics: Optional[Dict] = None,
+        job_uid: Optional[str] = None
+    ) -> Tuple[bool, Optional[str], Dict]:
+        """Response parsen, scoren, loggen (gemeinsam für sync + async)"""
         success = (error is None)
         
         # 3. Response analysieren
@@ -135,6 +253,12 @@ class EnhancedSyntexCalibrator:
         if parsed_fields:
             log_data["parsed_fields"] = parsed_fields.to_dict()
         
+        if stream_metrics:
+            log_data["stream_metrics"] = stream_metrics
+        
+        if job_uid:
+            log_data["job_uid"] = job_uid
+        
         self.logger.log_calibration(**log_data)
         
         # 5. Output
@@ -162,4 +286,7 @@ class EnhancedSyntexCalibrator:
             "session_id": self.session_id
         }
         
+        if stream_metrics:
+            metadata["stream"] = stream_metrics
+        
         return success, response, metadata
@@ -1,17 +1,22 @@
 """
 SYNTEX Calibration Logging System
+
+Jeder Eintrag wird zusätzlich im Byte-Offset Index
+(<log>.idx, siehe calibration_index.py) registriert
 """
-import json
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Dict, Any
 
+from .calibration_index import get_calibration_index
+
 class CalibrationLogger:
     """Loggt SYNTEX Kalibrierungs-Prozesse"""
     
     def __init__(self, log_file: Optional[Path] = None):
         self.log_file = log_file or Path("/opt/syntx-config/generator-data/syntex_calibrations.jsonl")
         self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        self.index = get_calibration_index(self.log_file)
     
     def log_calibration(
         self,
@@ -25,7 +30,9 @@ class CalibrationLogger:
         model_params: Optional[Dict] = None,
         quality_score: Optional[Dict] = None,
         parsed_fields: Optional[Dict] = None,
-        gpt_user_prompt: Optional[str] = None  # 🔥 NEU!
+        gpt_user_prompt: Optional[str] = None,  # 🔥 NEU!
+        stream_metrics: Optional[Dict] = None,
+        job_uid: Optional[str] = None
     ) -> None:
         """Loggt eine SYNTEX-Kalibrierung mit allen Metriken"""
         log_entry = {
@@ -46,15 +53,19 @@ class CalibrationLogger:
             "gpt_user_prompt": gpt_user_prompt  # 🔥 NEU!
         }
         
-        with open(self.log_file, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
+        if stream_metrics:
+            log_entry["stream_metrics"] = stream_metrics
+        
+        # Exakter Join processed-Job ↔ Log-Eintrag (CalibrationIndex.find_job)
+        if job_uid:
+            log_entry["job_uid"] = job_uid
+        
+        # Append + Index-Record unter einem Lock
+        self.index.append_entry(log_entry)
     
     def get_last_calibrations(self, n: int = 10) -> list:
-        """Gibt die letzten N Kalibrierungen zurück"""
+        """Gibt die letzten N Kalibrierungen zurück (Seek über den Index)"""
         if not self.log_file.exists():
             return []
         
-        with open(self.log_file, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        return [json.loads(line) for line in lines[-n:]]
+        return self.index.tail_entries(n)
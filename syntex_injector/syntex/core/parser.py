@@ -19,7 +19,7 @@ Nicht Token-Ebene → Feld-Ebene
 """
 
 import re
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 from dataclasses import dataclass, field
 
 from ..utils.exceptions import ParseError, FieldMissingError
@@ -191,11 +191,29 @@ class SyntexParser:
     - Case-insensitive matching
     - Whitespace-tolerant
     - Greedy field extraction
+    
+    === PRÄZEDENZ ===
+    SIGMA > SYNTEX_SYSTEM > HUMAN - HUMAN ist der Fallback ohne Marker
     """
     
+    # Marker-Strings pro Format (case-sensitive, wie im Response-Text)
+    FORMAT_MARKERS: Dict[str, Tuple[str, ...]] = {
+        "SIGMA": ("Σ-DRIFTGRADIENT", "Σ-MECHANISMUSKNOTEN"),
+        "SYNTEX_SYSTEM": ("Driftkörperanalyse", "Strömungsverhältnisse", "Kalibrierung"),
+    }
+    FORMAT_PRECEDENCE = ("SIGMA", "SYNTEX_SYSTEM", "HUMAN")
+    
     def __init__(self):
         pass
     
+    @classmethod
+    def detect_format(cls, response: str) -> str:
+        """Format nach Präzedenz - erster Format-Eintrag dessen Marker vorkommt"""
+        for fmt, markers in cls.FORMAT_MARKERS.items():
+            if any(marker in response for marker in markers):
+                return fmt
+        return "HUMAN"
+    
     def parse(self, response: str) -> SyntexFields:
         """
         Parse SYNTX Response in beliebigem Format
@@ -215,13 +233,14 @@ class SyntexParser:
         fields = SyntexFields()
         
         # === FORMAT DETECTION & EXTRACTION ===
+        fmt = self.detect_format(response)
         
         # 1. SIGMA PROTOCOL
-        if "Σ-DRIFTGRADIENT" in response or "Σ-MECHANISMUSKNOTEN" in response:
+        if fmt == "SIGMA":
             self._parse_sigma(response, fields)
         
         # 2. SYNTEX_SYSTEM FORMAT
-        elif "Driftkörperanalyse" in response or "Strömungsverhältnisse" in response or "Kalibrierung" in response:
+        elif fmt == "SYNTEX_SYSTEM":
             self._parse_syntex_system(response, fields)
         
         # 3. HUMAN-READABLE FORMAT
@@ -316,3 +335,131 @@ class SyntexParser:
         if missing and strict:
             raise FieldMissingError(missing)
         return len(missing) == 0
+
+
+class StreamingSyntexParser:
+    """
+    Inkrementeller SYNTX Parser für Streaming Responses
+    
+    === STRATEGIE ===
+    1. feed(chunk) hängt Tokens an den Buffer
+    2. Nur der NEUE Teil (+ Overlap für zerschnittene Header) wird
+       nach Feld-Headern + Format-Markern durchsucht
+    3. Format = SyntexParser-Präzedenz auf dem bisherigen Buffer
+       (SIGMA > SYNTEX_SYSTEM > HUMAN) - kann sich also noch ändern,
+       z.B. "1. DRIFT:" in der Einleitung vor "### Driftkörperanalyse"
+    4. Ein Feld ist komplett sobald ein späterer Header erscheint
+    5. finish() → SyntexParser.parse(buffer) - Endergebnis identisch
+       zum nicht-streamenden Parsen
+    
+    === EARLY ABORT ===
+    abort_reason() liefert einen Grund wenn die Response klar falsch ist:
+    - Nach detect_chars Zeichen noch kein einziger Feld-Header
+    - Erkanntes Format hat höhere Präzedenz als expected_format - dann
+      kann kein späterer Text das Ergebnis von finish() mehr drehen
+    """
+    
+    # Feld-Header pro Format (in Response-Reihenfolge)
+    FIELD_HEADERS: Dict[str, List[Tuple[str, str]]] = {
+        "SIGMA": [
+            ("sigma_drift", r"1\.\s*Σ-DRIFTGRADIENT"),
+            ("sigma_mechanismus", r"2\.\s*Σ-MECHANISMUSKNOTEN"),
+            ("sigma_frequenz", r"3\.\s*Σ-FREQUENZFELD"),
+            ("sigma_dichte", r"4\.\s*Σ-DICHTELEVEL"),
+            ("sigma_strome", r"5\.\s*Σ-ZWEISTRÖME"),
+            ("sigma_extrakt", r"6\.\s*Σ-KERNEXTRAKT"),
+        ],
+        "SYNTEX_SYSTEM": [
+            ("driftkorper", r"###\s*Driftkörperanalyse"),
+            ("kalibrierung", r"###\s*Kalibrierung"),
+            ("stromung", r"###\s*Strömungsverhältnisse"),
+        ],
+        "HUMAN": [
+            ("drift", r"1\.\s*DRIFT\b"),
+            ("hintergrund_muster", r"2\.\s*HINTERGRUND[-\s]*MUSTER"),
+            ("druckfaktoren", r"3\.\s*DRUCKFAKTOREN"),
+            ("tiefe", r"4\.\s*TIEFE"),
+            ("wirkung", r"5\.\s*WIRKUNG"),
+            ("klartext", r"6\.\s*KLARTEXT"),
+        ],
+    }
+    
+    # Max. Header-Länge - so weit wird beim nächsten feed() zurück gescannt
+    OVERLAP = 64
+    
+    def __init__(self, expected_format: Optional[str] = None, detect_chars: int = 1500):
+        self.expected_format = expected_format
+        self.detect_chars = detect_chars
+        self.buffer = ""
+        self.format: Optional[str] = None
+        self.completed: List[str] = []
+        self._header_pos: Dict[str, int] = {}
+        self._markers: set = set()
+        self._scan_from = 0
+        self._patterns = {
+            fmt: [(name, re.compile(pattern, re.IGNORECASE)) for name, pattern in headers]
+            for fmt, headers in self.FIELD_HEADERS.items()
+        }
+    
+    def feed(self, chunk: str) -> List[str]:
+        """
+        Neue Tokens verarbeiten
+        
+        Returns:
+            Liste der Felder die durch diesen Chunk komplett wurden
+        """
+        if not chunk:
+            return []
+        
+        self.buffer += chunk
+        start = max(0, self._scan_from - self.OVERLAP)
+        window = self.buffer[start:]
+        self._scan_from = len(self.buffer)
+        
+        for fmt, patterns in self._patterns.items():
+            for name, pattern in patterns:
+                if name in self._header_pos:
+                    continue
+                match = pattern.search(window)
+                if match:
+                    self._header_pos[name] = start + match.start()
+        for fmt, markers in SyntexParser.FORMAT_MARKERS.items():
+            if fmt not in self._markers and any(marker in window for marker in markers):
+                self._markers.add(fmt)
+        
+        # Format erst ab dem ersten Feld-Header - dann Präzedenz wie SyntexParser.parse()
+        if not self._header_pos:
+            return []
+        fmt = next((f for f in SyntexParser.FORMAT_PRECEDENCE if f in self._markers), "HUMAN")
+        if fmt != self.format:
+            self.format = fmt
+            self.completed = []
+        
+        # Nur Header des erkannten Formats zählen
+        own = [n for n, _ in self.FIELD_HEADERS[self.format] if n in self._header_pos]
+        if not own:
+            return []
+        
+        # Feld komplett = ein späterer Header existiert
+        newly = []
+        last_pos = max(self._header_pos[n] for n in own)
+        for name in own:
+            if name not in self.completed and self._header_pos[name] < last_pos:
+                self.completed.append(name)
+                newly.append(name)
+        return newly
+    
+    def abort_reason(self) -> Optional[str]:
+        """Grund für Early Abort - None = weiter streamen"""
+        if self.format is None and len(self.buffer) >= self.detect_chars:
+            return f"No SYNTX field header after {len(self.buffer)} chars"
+        if self.expected_format and self.format and self.format != self.expected_format:
+            precedence = SyntexParser.FORMAT_PRECEDENCE
+            if self.expected_format in precedence and \
+                    precedence.index(self.format) < precedence.index(self.expected_format):
+                return f"Wrong format: {self.format} (expected {self.expected_format})"
+        return None
+    
+    def finish(self) -> SyntexFields:
+        """Stream zu Ende - vollständiges Parsing wie SyntexParser.parse()"""
+        return SyntexParser().parse(self.buffer)